@@ -0,0 +1,89 @@
+import json
+import math
+import os
+import threading
+
+
+class AdaptiveTimeouts:
+
+    def __init__(self, path=None, safetyFactor=3.0, floor=2000, cap=30000, minimumSamples=5, keptSamples=200):
+        self.path = path
+        self.safetyFactor = safetyFactor
+        self.floor = floor
+        self.cap = cap
+        self.minimumSamples = minimumSamples
+        self.keptSamples = keptSamples
+        self.lock = threading.Lock()
+        self.samples = self.savedSamples()
+        self.unsavedSamples = {}
+
+    def savedSamples(self):
+        if self.path is None or not os.path.exists(self.path):
+            return {}
+        samplesFile = open(self.path)
+        try:
+            return json.load(samplesFile)
+        finally:
+            samplesFile.close()
+
+    def keyFor(self, step, location):
+        return step + " " + str(location).split("#")[0].split("?")[0]
+
+    def samplesFor(self, key):
+        self.lock.acquire()
+        try:
+            return sorted(self.samples.get(key, []))
+        finally:
+            self.lock.release()
+
+    def timeoutFor(self, key):
+        samples = self.samplesFor(key)
+        if len(samples) < self.minimumSamples:
+            return self.cap
+        p99 = samples[int(math.ceil(len(samples) * 0.99)) - 1]
+        return int(min(self.cap, max(self.floor, p99 * self.safetyFactor)))
+
+    def keeps(self, samplesByKey, key, durations):
+        samples = samplesByKey.setdefault(key, [])
+        samples.extend(durations)
+        del samples[:-self.keptSamples]
+
+    def record(self, key, duration):
+        self.lock.acquire()
+        try:
+            self.keeps(self.samples, key, [int(duration)])
+            self.unsavedSamples.setdefault(key, []).append(int(duration))
+        finally:
+            self.lock.release()
+
+    def merge(self, samplesByKey):
+        for key, durations in samplesByKey.items():
+            for duration in durations:
+                self.record(key, duration)
+
+    def takeUnsavedSamples(self):
+        self.lock.acquire()
+        try:
+            unsavedSamples = self.unsavedSamples
+            self.unsavedSamples = {}
+            return unsavedSamples
+        finally:
+            self.lock.release()
+
+    def save(self):
+        if self.path is None:
+            return
+        self.lock.acquire()
+        try:
+            samples = self.savedSamples()
+            for key, durations in self.unsavedSamples.items():
+                self.keeps(samples, key, durations)
+            samplesFile = open(self.path, "w")
+            try:
+                json.dump(samples, samplesFile, indent=1, sort_keys=True)
+            finally:
+                samplesFile.close()
+            self.samples = samples
+            self.unsavedSamples = {}
+        finally:
+            self.lock.release()
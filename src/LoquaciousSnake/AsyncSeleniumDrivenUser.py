@@ -0,0 +1,54 @@
+from LoquaciousSnake.SeleniumDrivenUser import SeleniumDrivenUser, UnknownMethodException
+import asyncio
+
+
+class AsyncSeleniumDrivenUser:
+
+    def __init__(self, seleniumExecutionContext):
+        self.seleniumExecutionContext = seleniumExecutionContext
+        self.user = SeleniumDrivenUser(seleniumExecutionContext)
+        self.pendingSteps = []
+
+    def recorderFor(self, name):
+        def record(*args, **kwargs):
+            self.pendingSteps.append((name, args, kwargs))
+            return self
+        return record
+
+    def performsSteps(self, steps):
+        self.seleniumExecutionContext.initialize()
+        result = self.user
+        for name, args, kwargs in steps:
+            result = getattr(self.user, name)(*args, **kwargs)
+        if result is self.user:
+            return self
+        return result
+
+    async def performs(self, function, *args):
+        loop = asyncio.get_event_loop()
+        self.seleniumExecutionContext.runsOn(loop)
+        return await loop.run_in_executor(None, function, *args)
+
+    async def performsPendingSteps(self):
+        pendingSteps = self.pendingSteps
+        self.pendingSteps = []
+        return await self.performs(self.performsSteps, pendingSteps)
+
+    def destroy(self):
+        return self.performs(self.seleniumExecutionContext.destroy)
+
+    def __await__(self):
+        return self.performsPendingSteps().__await__()
+
+    def __getattr__(self, name):
+        if name.startswith("__") or name == "user":
+            raise AttributeError(name)
+        if name in self.user.dispatchTable or hasattr(SeleniumDrivenUser, name):
+            return self.recorderFor(name)
+        raise UnknownMethodException("AsyncSeleniumDrivenUser does not support the " + name +  " method")
+
+    def __repr__(self):
+        return str(self)
+
+    def __str__(self):
+        return "AsyncSeleniumDrivenUser instance"
@@ -0,0 +1,15 @@
+from LoquaciousSnake.SharedSeleniumExecutionContext import SharedSeleniumExecutionContext
+
+
+class AsyncSeleniumExecutionContext(SharedSeleniumExecutionContext):
+
+    def __init__(self, host, port, browserStartCommand, url, backend="asyncio-rc"):
+        SharedSeleniumExecutionContext.__init__(self, host, port, browserStartCommand, url, backend=backend)
+
+    def runsOn(self, loop):
+        self.seleniumInstance.loop = loop
+
+    def companion(self):
+        companion = SharedSeleniumExecutionContext.companion(self)
+        companion.seleniumInstance.loop = self.seleniumInstance.loop
+        return companion
@@ -0,0 +1,207 @@
+from LoquaciousSnake.SeleniumRemoteControlClient import SeleniumRemoteControlClient,\
+    SeleniumRemoteControlException, StaleConnectionException, buildRequest, addHeader,\
+    closesConnection, parseStringArray, parseBoolean
+import asyncio
+
+
+class AsyncSeleniumRemoteControlClient:
+
+    path = SeleniumRemoteControlClient.path
+    pipelinableCommands = SeleniumRemoteControlClient.pipelinableCommands
+
+    def __init__(self, host, port, browserStartCommand, browserURL, timeout=None):
+        self.host = host
+        self.port = port
+        self.browserStartCommand = browserStartCommand
+        self.browserURL = browserURL
+        self.timeout = timeout
+        self.extensionJs = ""
+        self.sessionId = None
+        self.reader = None
+        self.writer = None
+        self.requestsOnConnection = 0
+        self.lock = None
+
+    async def connect(self):
+        self.disconnect()
+        connecting = asyncio.open_connection(self.host, self.port)
+        if self.timeout is not None:
+            connecting = asyncio.wait_for(connecting, self.timeout)
+        self.reader, self.writer = await connecting
+        self.requestsOnConnection = 0
+
+    def disconnect(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = None
+        self.writer = None
+
+    async def readResponse(self):
+        statusLine = await self.reader.readline()
+        if not statusLine:
+            raise StaleConnectionException("Connection closed by the Selenium RC server")
+        headers = {}
+        while True:
+            line = (await self.reader.readline()).decode("iso-8859-1").strip()
+            if not line:
+                break
+            addHeader(headers, line)
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            body = await self.readChunkedBody()
+        elif "content-length" in headers:
+            body = await self.reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await self.reader.read()
+            headers["connection"] = "close"
+
+        if closesConnection(statusLine, headers):
+            self.disconnect()
+        return body.decode("utf-8")
+
+    async def readChunkedBody(self):
+        chunks = []
+        while True:
+            size = int((await self.reader.readline()).split(b";")[0].strip(), 16)
+            if size == 0:
+                while (await self.reader.readline()).strip():
+                    pass
+                return b"".join(chunks)
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readline()
+
+    async def send(self, verb, args):
+        if self.lock is None:
+            self.lock = asyncio.Lock()
+        async with self.lock:
+            while True:
+                if self.reader is not None and self.reader.at_eof():
+                    self.disconnect()
+                isReusingConnection = self.writer is not None and self.requestsOnConnection > 0
+                isSent = False
+                try:
+                    if self.writer is None:
+                        await self.connect()
+                    self.writer.write(buildRequest(self.host, self.port, self.path, self.sessionId, verb, args))
+                    isSent = True
+                    self.requestsOnConnection += 1
+                    response = self.readResponse()
+                    if self.timeout is not None:
+                        response = asyncio.wait_for(response, self.timeout)
+                    return await response
+                except asyncio.TimeoutError:
+                    self.disconnect()
+                    raise
+                except (OSError, asyncio.IncompleteReadError, StaleConnectionException):
+                    self.disconnect()
+                    if not isReusingConnection or (isSent and verb not in self.pipelinableCommands):
+                        raise
+
+    async def do_command(self, verb, args):
+        data = await self.send(verb, args)
+        if not data.startswith("OK"):
+            raise SeleniumRemoteControlException(data)
+        return data
+
+    async def get_string(self, verb, args):
+        return (await self.do_command(verb, args))[3:]
+
+    async def get_string_array(self, verb, args):
+        return parseStringArray(await self.get_string(verb, args))
+
+    async def get_boolean(self, verb, args):
+        return parseBoolean(verb, await self.get_string(verb, args))
+
+    async def get_number(self, verb, args):
+        return await self.get_string(verb, args)
+
+    async def start(self):
+        self.sessionId = await self.get_string("getNewBrowserSession", [self.browserStartCommand, self.browserURL, self.extensionJs])
+
+    async def stop(self):
+        try:
+            await self.do_command("testComplete", [])
+        finally:
+            self.sessionId = None
+            self.disconnect()
+
+    async def open(self, url):
+        await self.do_command("open", [url])
+
+    async def click(self, locator):
+        await self.do_command("click", [locator])
+
+    async def check(self, locator):
+        await self.do_command("check", [locator])
+
+    async def uncheck(self, locator):
+        await self.do_command("uncheck", [locator])
+
+    async def type(self, locator, value):
+        await self.do_command("type", [locator, value])
+
+    async def select(self, selectLocator, optionLocator):
+        await self.do_command("select", [selectLocator, optionLocator])
+
+    async def drag_and_drop(self, locator, movementsString):
+        await self.do_command("dragAndDrop", [locator, movementsString])
+
+    async def drag_and_drop_to_object(self, locatorOfObjectToBeDragged, locatorOfDragDestinationObject):
+        await self.do_command("dragAndDropToObject", [locatorOfObjectToBeDragged, locatorOfDragDestinationObject])
+
+    async def wait_for_page_to_load(self, timeout):
+        await self.do_command("waitForPageToLoad", [timeout])
+
+    async def wait_for_condition(self, script, timeout):
+        await self.do_command("waitForCondition", [script, timeout])
+
+    async def delete_all_visible_cookies(self):
+        await self.do_command("deleteAllVisibleCookies", [])
+
+    async def get_cookie(self):
+        return await self.get_string("getCookie", [])
+
+    async def create_cookie(self, nameValuePair, optionsString):
+        await self.do_command("createCookie", [nameValuePair, optionsString])
+
+    async def get_eval(self, script):
+        return await self.get_string("getEval", [script])
+
+    async def is_element_present(self, locator):
+        return await self.get_boolean("isElementPresent", [locator])
+
+    async def is_visible(self, locator):
+        return await self.get_boolean("isVisible", [locator])
+
+    async def get_text(self, locator):
+        return await self.get_string("getText", [locator])
+
+    async def get_value(self, locator):
+        return await self.get_string("getValue", [locator])
+
+    async def is_checked(self, locator):
+        return await self.get_boolean("isChecked", [locator])
+
+    async def get_select_options(self, selectLocator):
+        return await self.get_string_array("getSelectOptions", [selectLocator])
+
+    async def get_selected_label(self, selectLocator):
+        return await self.get_string("getSelectedLabel", [selectLocator])
+
+    async def is_ordered(self, locator1, locator2):
+        return await self.get_boolean("isOrdered", [locator1, locator2])
+
+    async def get_location(self):
+        return await self.get_string("getLocation", [])
+
+    async def get_title(self):
+        return await self.get_string("getTitle", [])
+
+    async def get_html_source(self):
+        return await self.get_string("getHtmlSource", [])
+
+    async def get_attribute(self, attributeLocator):
+        return await self.get_string("getAttribute", [attributeLocator])
+
+    async def get_xpath_count(self, xpath):
+        return await self.get_number("getXpathCount", [xpath])
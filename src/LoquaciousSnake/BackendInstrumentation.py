@@ -0,0 +1,48 @@
+from LoquaciousSnake.BrowserBackend import protocolCommands
+
+commandsOnLocators = ["click", "check", "uncheck", "type", "select", "drag_and_drop", "is_element_present", "get_text",
+                      "get_value", "is_checked", "get_select_options", "get_selected_label", "is_ordered"]
+
+
+def timedCommand(instrumentation, name, command):
+    isOnLocator = name in commandsOnLocators
+    def performTimedCommand(*args):
+        locator = None
+        if isOnLocator and args:
+            locator = args[0]
+        return instrumentation.times(name, locator, command, *args)
+    return performTimedCommand
+
+
+def instrumentsBackend(backend, instrumentation):
+    uninstrumentsBackend(backend)
+    overriddenCommands = {}
+    timedCommands = {}
+    for name in protocolCommands:
+        command = getattr(backend, name, None)
+        if command is None:
+            continue
+        if name in backend.__dict__:
+            overriddenCommands[name] = backend.__dict__[name]
+        timedCommands[name] = timedCommand(instrumentation, name, command)
+    backend.__dict__.update(timedCommands)
+    backend.__dict__["_instrumentation"] = (instrumentation, timedCommands, overriddenCommands)
+
+
+def uninstrumentsBackend(backend):
+    if "_instrumentation" not in backend.__dict__:
+        return
+    instrumentation, timedCommands, overriddenCommands = backend.__dict__.pop("_instrumentation")
+    for name, command in timedCommands.items():
+        if backend.__dict__.get(name) is not command:
+            continue
+        if name in overriddenCommands:
+            backend.__dict__[name] = overriddenCommands[name]
+        else:
+            del backend.__dict__[name]
+
+
+def instrumentationOf(backend):
+    if "_instrumentation" not in backend.__dict__:
+        return None
+    return backend.__dict__["_instrumentation"][0]
@@ -0,0 +1,77 @@
+from LoquaciousSnake.BrowserBackend import BrowserBackendException, Capabilities, capabilityCommands, missingCommands
+from LoquaciousSnake.Cassette import CassetteRecorder, CassettePlayer
+from LoquaciousSnake.InMemoryBrowser import InMemoryBrowser
+from LoquaciousSnake.SeleniumRemoteControlClient import SeleniumRemoteControlClient
+
+
+class Backend:
+
+    def __init__(self, name, factory, sharesInstance, capabilities):
+        unknownCapabilities = [capability for capability in capabilities if capability not in capabilityCommands]
+        if unknownCapabilities:
+            raise BrowserBackendException("The " + name + " backend declares unknown capabilities: " + ", ".join(unknownCapabilities))
+        self.name = name
+        self.factory = factory
+        self.sharesInstance = sharesInstance
+        self.capabilities = frozenset(capabilities)
+
+    def supports(self, capability):
+        return capability in self.capabilities
+
+    def create(self, host, port, browserStartCommand, url):
+        instance = self.factory(host, port, browserStartCommand, url)
+        missing = missingCommands(instance, self.capabilities)
+        if missing:
+            raise BrowserBackendException("The " + self.name + " backend declares capabilities it does not provide, it lacks " + ", ".join(missing))
+        return instance
+
+
+class BackendRegistry:
+
+    defaultBackend = "selenium-rc"
+    backends = {}
+
+    @staticmethod
+    def register(name, factory, sharesInstance=True, capabilities=(Capabilities.SCRIPTS,)):
+        BackendRegistry.backends[name] = Backend(name, factory, sharesInstance, capabilities)
+
+    @staticmethod
+    def registerRecording(name, recordedBackendName, cassettePath=None):
+        recordedBackend = BackendRegistry.backendNamed(recordedBackendName)
+        def createRecorder(host, port, browserStartCommand, url):
+            return CassetteRecorder(recordedBackend.create(host, port, browserStartCommand, url), cassettePath)
+        BackendRegistry.register(name, createRecorder, recordedBackend.sharesInstance, recordedBackend.capabilities)
+
+    @staticmethod
+    def registerReplay(name, cassettePath=None, sharesInstance=True, capabilities=(Capabilities.SCRIPTS,)):
+        def createPlayer(host, port, browserStartCommand, url):
+            return CassettePlayer(cassettePath)
+        BackendRegistry.register(name, createPlayer, sharesInstance, capabilities)
+
+    @staticmethod
+    def unregister(name):
+        BackendRegistry.backends.pop(name, None)
+
+    @staticmethod
+    def backendNamed(name=None):
+        if name is None:
+            name = BackendRegistry.defaultBackend
+        if name not in BackendRegistry.backends:
+            raise BrowserBackendException("No backend is registered under the name " + name)
+        return BackendRegistry.backends[name]
+
+
+def createSeleniumRemoteControl(host, port, browserStartCommand, url):
+    from selenium.selenium import selenium
+    return selenium(host, port, browserStartCommand, url)
+
+def createEventLoopBackend(host, port, browserStartCommand, url):
+    from LoquaciousSnake.EventLoopBackend import EventLoopBackend
+    return EventLoopBackend(host, port, browserStartCommand, url)
+
+BackendRegistry.register("selenium-rc", createSeleniumRemoteControl, capabilities=(Capabilities.SCRIPTS, Capabilities.COOKIES))
+BackendRegistry.register("keep-alive-rc", SeleniumRemoteControlClient, capabilities=(Capabilities.SCRIPTS, Capabilities.PIPELINING, Capabilities.COOKIES))
+BackendRegistry.register("asyncio-rc", createEventLoopBackend, sharesInstance=False, capabilities=(Capabilities.SCRIPTS, Capabilities.COOKIES))
+BackendRegistry.register("in-memory", InMemoryBrowser, sharesInstance=False, capabilities=())
+BackendRegistry.registerRecording("recording-rc", "selenium-rc")
+BackendRegistry.registerReplay("replay")
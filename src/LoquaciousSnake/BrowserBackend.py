@@ -0,0 +1,28 @@
+class BrowserBackendException(Exception):
+    pass
+
+
+class Capabilities:
+    SCRIPTS = "scripts"
+    PIPELINING = "pipelining"
+    COOKIES = "cookies"
+
+
+coreCommands = ["start", "stop", "delete_all_visible_cookies", "open", "click", "check", "uncheck", "type", "select",
+                "drag_and_drop", "wait_for_page_to_load", "is_element_present", "get_text", "get_value", "is_checked",
+                "get_select_options", "get_selected_label", "is_ordered", "get_location", "get_html_source"]
+
+capabilityCommands = {Capabilities.SCRIPTS: ["get_eval", "wait_for_condition"],
+                      Capabilities.PIPELINING: ["are_elements_present"],
+                      Capabilities.COOKIES: ["get_cookie", "create_cookie"]}
+
+protocolCommands = coreCommands + [command for capability in sorted(capabilityCommands) for command in capabilityCommands[capability]]
+
+
+def missingCommands(instance, capabilities):
+    required = [command for capability in capabilities for command in capabilityCommands[capability]]
+    return [command for command in required if not callable(getattr(instance, command, None))]
+
+
+class BrowserBackend:
+    pass
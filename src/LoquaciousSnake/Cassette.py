@@ -0,0 +1,98 @@
+from LoquaciousSnake.BrowserBackend import BrowserBackend, BrowserBackendException, protocolCommands
+import json
+import os
+
+
+class CassetteDivergenceException(BrowserBackendException):
+    pass
+
+
+class ReplayedCommandException(BrowserBackendException):
+    pass
+
+
+def defaultCassettePath():
+    return os.environ.get("LOQUACIOUS_CASSETTE", "loquacious.cassette")
+
+
+timeoutArguments = {"wait_for_page_to_load": 0, "wait_for_condition": 1}
+
+
+def describeCommand(command, args):
+    return command + "(" + ", ".join([json.dumps(argument) for argument in args]) + ")"
+
+def comparedArguments(command, args):
+    args = json.loads(json.dumps(list(args)))
+    if command in timeoutArguments and len(args) > timeoutArguments[command]:
+        args[timeoutArguments[command]] = None
+    return args
+
+
+class CassetteRecorder(BrowserBackend):
+
+    def __init__(self, backend, cassettePath=None):
+        self.backend = backend
+        self.cassettePath = cassettePath or defaultCassettePath()
+        self.isRecording = False
+
+    def appends(self, entry):
+        cassetteFile = open(self.cassettePath, "a" if self.isRecording else "w")
+        self.isRecording = True
+        try:
+            cassetteFile.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        finally:
+            cassetteFile.close()
+
+    def records(self, command, args):
+        try:
+            result = getattr(self.backend, command)(*args)
+        except Exception as e:
+            self.appends({"c": command, "a": list(args), "e": str(e)})
+            raise
+        self.appends({"c": command, "a": list(args), "r": result})
+        return result
+
+
+class CassettePlayer(BrowserBackend):
+
+    def __init__(self, cassettePath=None):
+        self.cassettePath = cassettePath or defaultCassettePath()
+        cassetteFile = open(self.cassettePath)
+        try:
+            self.entries = [json.loads(line) for line in cassetteFile if line.strip()]
+        finally:
+            cassetteFile.close()
+        self.position = 0
+
+    def replays(self, command, args):
+        if self.position >= len(self.entries):
+            raise CassetteDivergenceException("Command " + str(self.position + 1) + " " + describeCommand(command, args)
+                                              + " goes beyond the end of the cassette " + self.cassettePath
+                                              + " (" + str(len(self.entries)) + " commands)")
+        entry = self.entries[self.position]
+        if entry["c"] != command or comparedArguments(entry["c"], entry["a"]) != comparedArguments(command, args):
+            raise CassetteDivergenceException("Command " + str(self.position + 1) + " of the cassette " + self.cassettePath
+                                              + " diverged: recorded " + describeCommand(entry["c"], entry["a"])
+                                              + " but got " + describeCommand(command, args))
+        self.position += 1
+        if "e" in entry:
+            raise ReplayedCommandException(entry["e"])
+        return entry["r"]
+
+    def isFinished(self):
+        return self.position == len(self.entries)
+
+
+def recordedCommand(command):
+    def performsRecordedCommand(self, *args):
+        return self.records(command, args)
+    return performsRecordedCommand
+
+def replayedCommand(command):
+    def performsReplayedCommand(self, *args):
+        return self.replays(command, args)
+    return performsReplayedCommand
+
+for command in protocolCommands:
+    setattr(CassetteRecorder, command, recordedCommand(command))
+    setattr(CassettePlayer, command, replayedCommand(command))
@@ -0,0 +1,8 @@
+class ChainState(object):
+
+    __slots__ = ("lastVisitedLocation", "optionBeingHandled", "itemToDrag")
+
+    def __init__(self):
+        self.lastVisitedLocation = None
+        self.optionBeingHandled = None
+        self.itemToDrag = None
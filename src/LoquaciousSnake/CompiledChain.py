@@ -0,0 +1,201 @@
+from LoquaciousSnake.helpers.JavascriptHelper import JavascriptHelper
+import re
+
+FAIL = JavascriptHelper.GetCompiledChainFailure()
+FAILED_STEP = re.compile(r"^fail:(\d+)$")
+
+
+class CompiledChainException(Exception):
+    pass
+
+
+def js(value):
+    return JavascriptHelper.ToJavascriptString(value)
+
+
+def present(locator):
+    return "if (!s.isElementPresent(" + js(locator) + ")) " + FAIL
+
+
+class CompiledChain:
+
+    segmentEndingSteps = ["clicks"]
+
+    def __init__(self, user):
+        self.user = user
+        self.seleniumExecutionContext = user.seleniumExecutionContext
+        self.steps = []
+
+    def recorderFor(self, name):
+        def record(*args, **kwargs):
+            self.steps.append((name, args, kwargs))
+            return self.user
+        return record
+
+    def performerAfterRecordedSteps(self, name):
+        def performAfterRecordedSteps(*args, **kwargs):
+            self.execute()
+            return self.user.dispatchTable[name](*args, **kwargs)
+        return performAfterRecordedSteps
+
+    def runsAsScripts(self):
+        context = self.seleniumExecutionContext
+        return context.supportsScripts() and context.locatorOptimizer is None and context.snapshot is None \
+               and context.autoWaitTimeout is None and context.instrumentation is None
+
+    def execute(self):
+        steps, self.steps = self.steps, []
+        state = self.currentState()
+        segment = []
+        for step in steps:
+            compiled = self.compile(step, state)
+            if compiled is None:
+                self.flush(segment, state)
+                segment = []
+                self.perform(step)
+                state = self.currentState()
+                continue
+
+            fragment, nextState = compiled
+            segment.append((step, fragment, state))
+            state = nextState
+            if step[0] in self.segmentEndingSteps:
+                self.flush(segment, state)
+                segment = []
+        self.flush(segment, state)
+
+    def flush(self, segment, finalState):
+        if not segment:
+            return
+        fragments = [fragment for step, fragment, state in segment]
+        if not "".join(fragments):
+            self.applyState(finalState)
+            return
+        script = JavascriptHelper.GetCompiledChainScript(fragments)
+        self.seleniumExecutionContext.initialize()
+        result = self.seleniumExecutionContext.seleniumInstance.get_eval(script)
+        self.seleniumExecutionContext.advancePageGeneration()
+        if result == "ok":
+            self.applyState(finalState)
+            return
+
+        failure = FAILED_STEP.match(str(result))
+        if failure is None or int(failure.group(1)) >= len(segment):
+            raise CompiledChainException("The compiled chain script replied " + repr(result) + " instead of ok or the index of a failed step")
+        failedIndex = int(failure.group(1))
+        step, fragment, stateBeforeFailure = segment[failedIndex]
+        self.applyState(stateBeforeFailure)
+        for step, fragment, state in segment[failedIndex:]:
+            self.perform(step)
+
+    def perform(self, step):
+        name, args, kwargs = step
+        return self.user.dispatchTable[name](*args, **kwargs)
+
+    def currentState(self):
+        chainState = self.user.chainState
+        return (chainState.lastVisitedLocation, chainState.optionBeingHandled, chainState.itemToDrag)
+
+    def applyState(self, state):
+        chainState = self.user.chainState
+        chainState.lastVisitedLocation, chainState.optionBeingHandled, chainState.itemToDrag = state
+
+    def compile(self, step, state):
+        name, args, kwargs = step
+        compiler = getattr(self, "compile" + name[0].upper() + name[1:], None)
+        if compiler is None or kwargs or not self.runsAsScripts():
+            return None
+        try:
+            return compiler(state, *args)
+        except TypeError:
+            return None
+
+    def compileAndThen(self, state):
+        return ("", state)
+
+    def compileClicks(self, state, locator):
+        return (present(locator) + " s.doClick(" + js(locator) + ");", state)
+
+    def compileChecks(self, state, locator):
+        return (present(locator) + " s.doCheck(" + js(locator) + ");", state)
+
+    def compileUnchecks(self, state, locator):
+        return (present(locator) + " s.doUncheck(" + js(locator) + ");", state)
+
+    def compileFillsOut(self, state, locator):
+        return ("", (locator, state[1], state[2]))
+
+    def compileWithThis(self, state, filling):
+        lastVisitedLocation, optionBeingHandled, itemToDrag = state
+        if lastVisitedLocation is None:
+            return None
+        return ("s.doType(" + js(lastVisitedLocation) + ", " + js(filling) + ");", (None, optionBeingHandled, itemToDrag))
+
+    def compileSelects(self, state, option):
+        return ("", (state[0], option, state[2]))
+
+    def compileComingFrom(self, state, locator):
+        lastVisitedLocation, option, itemToDrag = state
+        if option is None:
+            return None
+        fragment = present(locator) \
+                 + " var options = s.getSelectOptions(" + js(locator) + "); var found = false;" \
+                 + " for (var i = 0; i < options.length; i++) { if (options[i] == " + js(option) + ") { found = true; } }" \
+                 + " if (!found) " + FAIL \
+                 + " s.doSelect(" + js(locator) + ", " + js(option) + ");"
+        return (fragment, (None, option, itemToDrag))
+
+    def compileDrag(self, state, locator):
+        return (present(locator), (state[0], state[1], locator))
+
+    def compileAndDropsItOn(self, state, locator):
+        lastVisitedLocation, optionBeingHandled, itemToDrag = state
+        if itemToDrag is None:
+            return None
+        return (present(locator) + " s.doDragAndDrop(" + js(itemToDrag) + ", " + js(locator) + ");", (lastVisitedLocation, optionBeingHandled, None))
+
+    def compileShouldBeOnPage(self, state, page):
+        return ("if (s.getLocation() != " + js(page) + ") " + FAIL, state)
+
+    def compileShouldSee(self, state, locator):
+        return (present(locator), (locator, state[1], state[2]))
+
+    def compileShouldNotSee(self, state, locator):
+        return ("if (s.isElementPresent(" + js(locator) + ")) " + FAIL, state)
+
+    def compileFollowedBy(self, state, locator):
+        lastVisitedLocation, optionBeingHandled, itemToDrag = state
+        if lastVisitedLocation is None:
+            return None
+        return ("if (!s.isOrdered(" + js(lastVisitedLocation) + ", " + js(locator) + ")) " + FAIL, (locator, optionBeingHandled, itemToDrag))
+
+    def compileWithValue(self, state, expectedValue):
+        if state[0] is None:
+            return None
+        return ("if (s.getValue(" + js(state[0]) + ") != " + js(expectedValue) + ") " + FAIL, state)
+
+    def compileWithText(self, state, expectedText):
+        if state[0] is None:
+            return None
+        return ("if (s.getText(" + js(state[0]) + ") != " + js(expectedText) + ") " + FAIL, state)
+
+    def compileChecked(self, state):
+        if state[0] is None:
+            return None
+        return ("if (!s.isChecked(" + js(state[0]) + ")) " + FAIL, state)
+
+    def compileUnchecked(self, state):
+        if state[0] is None:
+            return None
+        return ("if (s.isChecked(" + js(state[0]) + ")) " + FAIL, state)
+
+    def compileWithOption(self, state, option):
+        if state[0] is None:
+            return None
+        return ("", (state[0], option, state[2]))
+
+    def compileSelected(self, state):
+        lastVisitedLocation, optionBeingHandled, itemToDrag = state
+        if lastVisitedLocation is None or optionBeingHandled is None:
+            return None
+        return ("if (s.getSelectedLabel(" + js(lastVisitedLocation) + ") != " + js(optionBeingHandled) + ") " + FAIL, state)
@@ -0,0 +1,50 @@
+from LoquaciousSnake.AsyncSeleniumRemoteControlClient import AsyncSeleniumRemoteControlClient
+from LoquaciousSnake.BrowserBackend import BrowserBackend, BrowserBackendException, protocolCommands
+import asyncio
+
+forwardedCommands = protocolCommands + ["drag_and_drop_to_object", "is_visible", "get_title", "get_attribute", "get_xpath_count"]
+
+
+class EventLoopBackend(BrowserBackend):
+
+    def __init__(self, host, port, browserStartCommand, browserURL, timeout=None):
+        self.host = host
+        self.port = port
+        self.browserStartCommand = browserStartCommand
+        self.browserURL = browserURL
+        self.client = AsyncSeleniumRemoteControlClient(host, port, browserStartCommand, browserURL, timeout)
+        self.loop = None
+
+    def isOnTheLoop(self):
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    def runs(self, coroutine):
+        if self.loop is None or self.loop.is_closed():
+            coroutine.close()
+            raise BrowserBackendException("The asyncio-rc backend sends its commands from an event loop, await the chain of an AsyncSeleniumDrivenUser")
+        if self.isOnTheLoop():
+            coroutine.close()
+            raise BrowserBackendException("The asyncio-rc backend cannot wait for a command from the thread of its event loop")
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def stop(self):
+        if self.loop is None or self.loop.is_closed():
+            self.client.sessionId = None
+            return
+        if self.isOnTheLoop():
+            self.loop.create_task(self.client.stop())
+            return
+        self.runs(self.client.stop())
+
+
+def forwardedCommand(command):
+    def performsForwardedCommand(self, *args):
+        return self.runs(getattr(self.client, command)(*args))
+    return performsForwardedCommand
+
+for command in forwardedCommands:
+    if hasattr(AsyncSeleniumRemoteControlClient, command) and command not in EventLoopBackend.__dict__:
+        setattr(EventLoopBackend, command, forwardedCommand(command))
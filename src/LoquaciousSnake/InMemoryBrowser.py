@@ -0,0 +1,384 @@
+from LoquaciousSnake.BrowserBackend import BrowserBackend
+from LoquaciousSnake.helpers.HtmlDocument import HtmlDocument
+from LoquaciousSnake.helpers.LocatorEngine import findElement, findElements, globToRegularExpression
+from LoquaciousSnake.helpers.SortKeys import sortKeys
+import codecs
+import re
+
+try:
+    from urlparse import urljoin, urlparse
+    from urllib import url2pathname
+except ImportError:
+    from urllib.parse import urljoin, urlparse
+    from urllib.request import url2pathname
+
+
+class InMemoryBrowserException(Exception):
+    pass
+
+
+class InMemoryBrowser(BrowserBackend):
+
+    blankPage = "about:blank"
+    hiddenStyle = re.compile(r"(display\s*:\s*none|visibility\s*:\s*hidden)", re.IGNORECASE)
+
+    def __init__(self, host, port, browserStartCommand, browserURL):
+        self.host = host
+        self.port = port
+        self.browserStartCommand = browserStartCommand
+        self.browserURL = browserURL
+        self.pages = {}
+        self.location = None
+        self.document = None
+        self.failedNavigation = None
+        self.rowElements = (None, {})
+
+    def servesPage(self, url, source):
+        self.pages[url] = source
+
+    def start(self):
+        self.load(self.blankPage)
+
+    def stop(self):
+        self.location = None
+        self.document = None
+        self.failedNavigation = None
+
+    def delete_all_visible_cookies(self):
+        pass
+
+    def sourceOf(self, url):
+        if url in self.pages:
+            return self.pages[url]
+        if url == self.blankPage:
+            return "<html><head></head><body></body></html>"
+        if url.startswith("file:"):
+            try:
+                pageFile = codecs.open(url2pathname(urlparse(url).path), "r", "utf-8")
+                try:
+                    return pageFile.read()
+                finally:
+                    pageFile.close()
+            except IOError:
+                return None
+        return None
+
+    def load(self, url):
+        source = self.sourceOf(url)
+        if source is None:
+            return False
+        self.location = url
+        self.document = HtmlDocument.parse(source)
+        self.failedNavigation = None
+        return True
+
+    def navigatesTo(self, url):
+        if self.location is not None:
+            url = urljoin(self.location, url)
+        if not self.load(url):
+            self.failedNavigation = url
+
+    def currentDocument(self):
+        if self.document is None:
+            raise InMemoryBrowserException("ERROR: No page has been opened")
+        return self.document
+
+    def elementFor(self, locator):
+        element = findElement(self.currentDocument(), locator)
+        if element is None:
+            raise InMemoryBrowserException("ERROR: Element " + locator + " not found")
+        return element
+
+    def isToggleButton(self, element):
+        return element.tag == "input" and (element.getAttribute("type") or "").lower() in ("checkbox", "radio")
+
+    def toggleButtonFor(self, locator):
+        element = self.elementFor(locator)
+        if not self.isToggleButton(element):
+            raise InMemoryBrowserException("ERROR: Element " + locator + " is not a toggle-button")
+        return element
+
+    def setChecked(self, element, checked):
+        if checked and (element.getAttribute("type") or "").lower() == "radio" and element.hasAttribute("name"):
+            for radio in self.currentDocument().elementsByTag("input"):
+                if radio.getAttribute("name") == element.getAttribute("name"):
+                    radio.attributes.pop("checked", None)
+        if checked:
+            element.attributes["checked"] = "checked"
+        else:
+            element.attributes.pop("checked", None)
+
+    def optionsOf(self, select):
+        return [element for element in select.descendants() if element.tag == "option"]
+
+    def selectFor(self, locator):
+        element = self.elementFor(locator)
+        if element.tag != "select":
+            raise InMemoryBrowserException("ERROR: Element " + locator + " is not a select")
+        return element
+
+    def selectedOptionsOf(self, select):
+        options = self.optionsOf(select)
+        selected = [option for option in options if option.hasAttribute("selected")]
+        if not selected and options and not select.hasAttribute("multiple"):
+            selected = options[:1]
+        return selected
+
+    def valueOfOption(self, option):
+        return option.getAttribute("value", option.text())
+
+    def optionMatching(self, select, optionLocator):
+        options = self.optionsOf(select)
+        if optionLocator.startswith("index="):
+            index = int(optionLocator[len("index="):])
+            if index < len(options):
+                return options[index]
+            return None
+        if optionLocator.startswith("value="):
+            pattern = globToRegularExpression(optionLocator[len("value="):])
+            matches = [option for option in options if pattern.match(self.valueOfOption(option))]
+        elif optionLocator.startswith("id="):
+            matches = [option for option in options if option.getAttribute("id") == optionLocator[len("id="):]]
+        else:
+            if optionLocator.startswith("label="):
+                optionLocator = optionLocator[len("label="):]
+            pattern = globToRegularExpression(optionLocator)
+            matches = [option for option in options if pattern.match(option.text())]
+        if not matches:
+            return None
+        return matches[0]
+
+    def isHidden(self, element):
+        while element is not None and element.tag != "#document":
+            if element.hasAttribute("hidden") or self.hiddenStyle.search(element.getAttribute("style", "") or ""):
+                return True
+            if element.tag == "input" and (element.getAttribute("type") or "").lower() == "hidden":
+                return True
+            element = element.parent
+        return False
+
+    def open(self, url):
+        self.navigatesTo(url)
+        if self.failedNavigation is not None:
+            raise InMemoryBrowserException("ERROR: Could not open " + self.failedNavigation)
+
+    def click(self, locator):
+        element = self.elementFor(locator)
+        if self.isToggleButton(element):
+            isRadio = (element.getAttribute("type") or "").lower() == "radio"
+            self.setChecked(element, isRadio or not element.hasAttribute("checked"))
+        elif element.tag == "option":
+            select = element.parent
+            while select is not None and select.tag != "select":
+                select = select.parent
+            if select is not None:
+                self.selectsOption(select, element)
+        else:
+            link = element
+            while link is not None and link.tag != "a":
+                link = link.parent
+            if link is not None:
+                href = link.getAttribute("href", "") or ""
+                if href and not href.startswith("#") and not href.lower().startswith("javascript:"):
+                    self.navigatesTo(href)
+
+    def check(self, locator):
+        self.setChecked(self.toggleButtonFor(locator), True)
+
+    def uncheck(self, locator):
+        self.setChecked(self.toggleButtonFor(locator), False)
+
+    def type(self, locator, value):
+        element = self.elementFor(locator)
+        if element.tag == "textarea":
+            element.children = [value]
+        else:
+            element.attributes["value"] = value
+
+    def selectsOption(self, select, option):
+        if not select.hasAttribute("multiple"):
+            for otherOption in self.optionsOf(select):
+                otherOption.attributes.pop("selected", None)
+        option.attributes["selected"] = "selected"
+
+    def select(self, selectLocator, optionLocator):
+        select = self.selectFor(selectLocator)
+        option = self.optionMatching(select, optionLocator)
+        if option is None:
+            raise InMemoryBrowserException("ERROR: Option with locator " + optionLocator + " not found")
+        self.selectsOption(select, option)
+
+    def drag_and_drop(self, locator, movementsString):
+        self.elementFor(locator)
+
+    def drag_and_drop_to_object(self, locatorOfObjectToBeDragged, locatorOfDragDestinationObject):
+        self.elementFor(locatorOfObjectToBeDragged)
+        self.elementFor(locatorOfDragDestinationObject)
+
+    def wait_for_page_to_load(self, timeout):
+        failedNavigation = self.failedNavigation
+        self.failedNavigation = None
+        if failedNavigation is not None:
+            raise InMemoryBrowserException("Timed out after " + str(timeout) + "ms loading " + failedNavigation)
+
+    def wait_for_condition(self, script, timeout):
+        pass
+
+    def get_eval(self, script):
+        raise InMemoryBrowserException("ERROR: The in-memory browser does not run scripts")
+
+    def is_element_present(self, locator):
+        return findElement(self.currentDocument(), locator) is not None
+
+    def is_visible(self, locator):
+        return not self.isHidden(self.elementFor(locator))
+
+    def get_text(self, locator):
+        return self.elementFor(locator).text()
+
+    def get_value(self, locator):
+        element = self.elementFor(locator)
+        if self.isToggleButton(element) and element.hasAttribute("checked"):
+            return "on"
+        if self.isToggleButton(element):
+            return "off"
+        if element.tag == "textarea":
+            return element.textContent()
+        if element.tag == "select":
+            selected = self.selectedOptionsOf(element)
+            if not selected:
+                return ""
+            return self.valueOfOption(selected[0])
+        return element.getAttribute("value", "") or ""
+
+    def is_checked(self, locator):
+        return self.toggleButtonFor(locator).hasAttribute("checked")
+
+    def get_select_options(self, selectLocator):
+        return [option.text() for option in self.optionsOf(self.selectFor(selectLocator))]
+
+    def get_selected_label(self, selectLocator):
+        selected = self.selectedOptionsOf(self.selectFor(selectLocator))
+        if not selected:
+            raise InMemoryBrowserException("ERROR: No option selected in " + selectLocator)
+        return selected[0].text()
+
+    def is_ordered(self, locator1, locator2):
+        element1 = self.elementFor(locator1)
+        element2 = self.elementFor(locator2)
+        if element1 is element2:
+            return False
+        return element1 in element2.previousElementSiblings()
+
+    def get_location(self):
+        return self.location
+
+    def get_title(self):
+        return self.currentDocument().title()
+
+    def get_html_source(self):
+        document = self.currentDocument()
+        htmlElements = document.elementsByTag("html")
+        if not htmlElements:
+            return document.toHtml()
+        return "".join([child.toHtml() for child in htmlElements[0].elementChildren()])
+
+    def get_attribute(self, attributeLocator):
+        separator = attributeLocator.rfind("@")
+        element = self.elementFor(attributeLocator[:separator])
+        name = attributeLocator[separator + 1:]
+        if not element.hasAttribute(name):
+            raise InMemoryBrowserException("ERROR: Could not find element attribute: " + attributeLocator)
+        return element.getAttribute(name)
+
+    def get_xpath_count(self, xpath):
+        return str(len(findElements(self.currentDocument(), xpath)))
+
+    def documentOrderOf(self, locators):
+        document = self.currentDocument()
+        elements = []
+        for index, locator in enumerate(locators):
+            element = findElement(document, locator)
+            if element is None:
+                return ["missing", index]
+            elements.append(element)
+        positions = dict([(id(element), position) for position, element in enumerate(document.root.descendants())])
+        for index in range(1, len(elements)):
+            if positions[id(elements[index - 1])] >= positions[id(elements[index])]:
+                return ["unordered", index]
+        return ["ok"]
+
+    def sortedOrderOf(self, locator, sortKey, descending):
+        elements = findElements(self.currentDocument(), locator)
+        if not elements:
+            return ["missing", 0]
+        texts = [element.text() for element in elements]
+        keys = []
+        for index, text in enumerate(texts):
+            keys.append(sortKeys[sortKey](text))
+            if keys[index] is None:
+                return ["unparsable", index, text]
+        for index in range(1, len(keys)):
+            if (descending and keys[index - 1] < keys[index]) or (not descending and keys[index - 1] > keys[index]):
+                return ["unsorted", index, texts[index - 1], texts[index]]
+        return ["ok"]
+
+    def itemsOf(self, element):
+        if element.tag == "table":
+            sections = element.elementChildren()
+            head = [row for section in sections if section.tag == "thead" for row in section.elementChildren() if row.tag == "tr"]
+            foot = [row for section in sections if section.tag == "tfoot" for row in section.elementChildren() if row.tag == "tr"]
+            body = []
+            for child in sections:
+                if child.tag == "tbody":
+                    body.extend([row for row in child.elementChildren() if row.tag == "tr"])
+                elif child.tag == "tr":
+                    body.append(child)
+            return head + body + foot
+        if element.tag == "select":
+            return [item for item in element.descendants() if item.tag == "option"]
+        return element.elementChildren()
+
+    def rowElementsOf(self, element):
+        document = self.currentDocument()
+        if self.rowElements[0] is not document:
+            self.rowElements = (document, {})
+        if id(element) not in self.rowElements[1]:
+            self.rowElements[1][id(element)] = self.itemsOf(element)
+        return self.rowElements[1][id(element)]
+
+    def cellsOf(self, element, item):
+        if element.tag == "table":
+            return [cell.text() for cell in item.elementChildren() if cell.tag in ("td", "th")]
+        if element.tag in ("ul", "ol", "select"):
+            return [item.text()]
+        return [cell.text() for cell in item.elementChildren()] or [item.text()]
+
+    def tableRowsOf(self, locator, start, count):
+        element = findElement(self.currentDocument(), locator)
+        if element is None:
+            return None
+        items = self.rowElementsOf(element)
+        end = len(items)
+        if count is not None:
+            end = min(end, start + count)
+        return {"total": len(items), "rows": [self.cellsOf(element, item) for item in items[start:end]]}
+
+    def tableDifferencesOf(self, locator, expectedRows, maxDifferences):
+        element = findElement(self.currentDocument(), locator)
+        if element is None:
+            return None
+        items = self.rowElementsOf(element)
+        differences = []
+        count = 0
+        for rowIndex, (item, expectedRow) in enumerate(zip(items, expectedRows)):
+            row = self.cellsOf(element, item)
+            for column in range(max(len(row), len(expectedRow))):
+                actual = None
+                if column < len(row):
+                    actual = row[column]
+                if column >= len(expectedRow) or actual != expectedRow[column]:
+                    count += 1
+                    if len(differences) < maxDifferences:
+                        differences.append([rowIndex, column, actual])
+        return {"total": len(items), "count": count, "differences": differences}
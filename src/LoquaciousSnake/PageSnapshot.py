@@ -0,0 +1,16 @@
+from LoquaciousSnake.InMemoryBrowser import InMemoryBrowser
+from LoquaciousSnake.helpers.HtmlDocument import HtmlDocument
+
+
+class PageSnapshot(InMemoryBrowser):
+
+    def __init__(self, source):
+        InMemoryBrowser.__init__(self, None, None, None, None)
+        self.document = HtmlDocument.parse(source)
+        self.reads = {}
+
+    def read(self, command, *args):
+        key = (command,) + args
+        if key not in self.reads:
+            self.reads[key] = getattr(self, command)(*args)
+        return self.reads[key]
@@ -0,0 +1,105 @@
+from LoquaciousSnake.SeleniumDrivenUserActions import SeleniumDrivenUserActionsException
+from LoquaciousSnake.helpers.Decorators import LocatorNotFoundException
+import threading
+
+try:
+    from Queue import Queue, Full, Empty
+except ImportError:
+    from queue import Queue, Full, Empty
+
+
+class PrefetchedPages:
+
+    pollingInterval = 0.05
+
+    def __init__(self, companion, url, locator, nextPageLocator, prefetch=1, maxPages=None, timeout=None, cookies=""):
+        self.companion = companion
+        self.url = url
+        self.cookies = cookies
+        self.locator = locator
+        self.nextPageLocator = nextPageLocator
+        self.maxPages = maxPages
+        self.timeout = timeout
+        self.pageTimeout = (timeout if timeout is not None else companion.seleniumExecutionContext.defaultTimeout) / 1000.0
+        self.pages = Queue(max(1, prefetch))
+        self.isCancelled = threading.Event()
+        self.isFinished = False
+        self.prefetcher = threading.Thread(target=self.prefetches)
+        self.prefetcher.daemon = True
+        self.prefetcher.start()
+
+    def prefetches(self):
+        try:
+            self.companion.goesTo(self.url)
+            if self.cookies:
+                self.companion.seleniumExecutionContext.addsCookies(self.cookies)
+                self.companion.goesTo(self.url)
+            numberOfPages = 0
+            while not self.isCancelled.is_set():
+                if not self.offers(("page", self.companion.reads(self.locator))):
+                    return
+                numberOfPages += 1
+                if self.maxPages is not None and numberOfPages >= self.maxPages:
+                    break
+                if self.companion.seleniumExecutionContext.isDisabled(self.nextPageLocator):
+                    break
+                try:
+                    self.companion.clicks(self.nextPageLocator)
+                except LocatorNotFoundException:
+                    break
+                self.companion.waitsForPageToLoad(self.timeout)
+            self.offers(("end", None))
+        except Exception as e:
+            self.offers(("error", e))
+        finally:
+            self.companion.seleniumExecutionContext.destroy()
+
+    def offers(self, item):
+        while not self.isCancelled.is_set():
+            try:
+                self.pages.put(item, True, self.pollingInterval)
+                return True
+            except Full:
+                pass
+        return False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.isFinished:
+            raise StopIteration
+        try:
+            kind, content = self.pages.get(True, self.pageTimeout)
+        except Empty:
+            self.cancels()
+            raise SeleniumDrivenUserActionsException("Timeout reached")
+        if kind == "page":
+            return content
+        self.close()
+        if kind == "error":
+            raise content
+        raise StopIteration
+
+    next = __next__
+
+    def cancels(self):
+        self.isFinished = True
+        self.isCancelled.set()
+        try:
+            while True:
+                self.pages.get_nowait()
+        except Empty:
+            pass
+
+    def close(self):
+        self.cancels()
+        if self.prefetcher is not threading.current_thread():
+            self.prefetcher.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exceptionType, exceptionValue, traceback):
+        self.close()
+        return False
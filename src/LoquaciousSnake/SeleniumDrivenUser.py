@@ -1,29 +1,63 @@
 from LoquaciousSnake.SeleniumDrivenUserActions import SeleniumDrivenUserActions
 from LoquaciousSnake.SeleniumDrivenUserExpectations import SeleniumDrivenUserExpectations
+from LoquaciousSnake.ChainState import ChainState
+from LoquaciousSnake.CompiledChain import CompiledChain
+from LoquaciousSnake.PrefetchedPages import PrefetchedPages
 
 
 class UnknownMethodException(Exception):
     pass
 
+def dispatchedNames(stepsClass):
+    return [name for name in dir(stepsClass) if not name.startswith("_") and callable(getattr(stepsClass, name))]
+
 class SeleniumDrivenUser:
     
     def __init__(self, seleniumExecutionContext):
-        self.actions = SeleniumDrivenUserActions(seleniumExecutionContext)
-        self.expectations = SeleniumDrivenUserExpectations(seleniumExecutionContext)
+        self.compiledChain = None
+        self.seleniumExecutionContext = seleniumExecutionContext
+        self.chainState = ChainState()
+        self.actions = SeleniumDrivenUserActions(seleniumExecutionContext, self.chainState)
+        self.expectations = SeleniumDrivenUserExpectations(seleniumExecutionContext, self.chainState)
 
         self.actions.chainingElement = self
         self.expectations.chainingElement = self
+
+        self.dispatchTable = {}
+        for name in dispatchedNames(SeleniumDrivenUserExpectations):
+            self.dispatchTable[name] = getattr(self.expectations, name)
+        for name in dispatchedNames(SeleniumDrivenUserActions):
+            self.dispatchTable[name] = getattr(self.actions, name)
+        self.__dict__.update(self.dispatchTable)
+
+    def compilesChain(self):
+        self.compiledChain = CompiledChain(self)
+        for name in self.dispatchTable:
+            if getattr(self.dispatchTable[name], "isChainable", False):
+                self.__dict__[name] = self.compiledChain.recorderFor(name)
+            else:
+                self.__dict__[name] = self.compiledChain.performerAfterRecordedSteps(name)
+        return self
+
+    def readsPages(self, locator, nextPageLocator, prefetch=1, maxPages=None, timeout=None):
+        self.seleniumExecutionContext.initialize()
+        url = self.seleniumExecutionContext.seleniumInstance.get_location()
+        cookies = self.seleniumExecutionContext.cookies()
+        companion = SeleniumDrivenUser(self.seleniumExecutionContext.companion())
+        return PrefetchedPages(companion, url, locator, nextPageLocator, prefetch, maxPages, timeout, cookies)
+
+    def executesChain(self):
+        compiledChain = self.compiledChain
+        self.compiledChain = None
+        self.__dict__.update(self.dispatchTable)
+        if compiledChain is not None:
+            compiledChain.execute()
+        return self
         
     def __getattr__(self, name):
-        if hasattr(self.actions, name):
-            return getattr(self.actions, name)
-            
-        elif hasattr(self.expectations, name):
-            return getattr(self.expectations, name)
-        try:
-            return getattr(self, name)
-        except Exception:
-            raise UnknownMethodException("SeleniumDrivenUser does not support the " + name +  " method")
+        if name.startswith("__"):
+            raise AttributeError(name)
+        raise UnknownMethodException("SeleniumDrivenUser does not support the " + name +  " method")
     
 
     def __repr__(self):
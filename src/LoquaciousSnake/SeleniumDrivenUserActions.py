@@ -1,6 +1,8 @@
 from LoquaciousSnake.helpers.Decorators import chainable,\
     requiresPresenceOfLocator, requiresAPreviouslySelectedOption,\
-    resetsLastVisitedLocator, requiresAPreviouslyVisitedLocator
+    resetsLastVisitedLocator, requiresAPreviouslyVisitedLocator, mutatesPage,\
+    fusesPresenceOfLocator, GuardedCommandResult, ensurePresenceOfLocator
+from LoquaciousSnake.ChainState import ChainState
 from LoquaciousSnake.helpers.JavascriptHelper import JavascriptHelper
 
 class SeleniumDrivenUserActionsException(Exception):
@@ -8,90 +10,133 @@ class SeleniumDrivenUserActionsException(Exception):
 
 class SeleniumDrivenUserActions:
     
-    def __init__(self, seleniumExecutionContext):
+    def __init__(self, seleniumExecutionContext, chainState=None):
         self.seleniumExecutionContext = seleniumExecutionContext
+        self.chainState = chainState if chainState is not None else ChainState()
         self.chainingElement = self
     
     def getSeleniumInstance(self):
         return self.seleniumExecutionContext.seleniumInstance
     
     @chainable
+    @mutatesPage
     def goesTo(self, url):        
-        self.getSeleniumInstance().open(url)
+        self.seleniumExecutionContext.opens(url)
+        self.seleniumExecutionContext.pageLoaded()
         
     @chainable
     def andThen(self):
         return self.chainingElement
     
     @chainable
-    @requiresPresenceOfLocator
+    @mutatesPage
+    @fusesPresenceOfLocator
     def clicks(self, locator):
-        self.getSeleniumInstance().click(locator)
+        return self.seleniumExecutionContext.performsGuardedCommand(locator, "click", locator)
     
     @chainable
-    @requiresPresenceOfLocator 
+    @mutatesPage
+    @fusesPresenceOfLocator
     def checks(self, locator):
-        self.getSeleniumInstance().check(locator)
+        return self.seleniumExecutionContext.performsGuardedCommand(locator, "check", locator)
     
     @chainable
-    @requiresPresenceOfLocator 
+    @mutatesPage
+    @fusesPresenceOfLocator
     def unchecks(self, locator):
-        self.getSeleniumInstance().uncheck(locator)
+        return self.seleniumExecutionContext.performsGuardedCommand(locator, "uncheck", locator)
     
     @chainable
     def fillsOut(self, locator):
-        self.seleniumExecutionContext.setLastVisitedLocation(locator)
+        self.chainState.lastVisitedLocation = locator
     
     @chainable
+    @mutatesPage
     @requiresAPreviouslyVisitedLocator
     @resetsLastVisitedLocator
     def withThis(self, filling):
-        self.getSeleniumInstance().type(self.seleniumExecutionContext.lastVisitedLocation, filling)
+        self.getSeleniumInstance().type(self.seleniumExecutionContext.locatorFor(self.chainState.lastVisitedLocation), filling)
+    
+    @chainable
+    @mutatesPage
+    def fillsOutForm(self, fields):
+        if hasattr(fields, "items"):
+            fields = list(fields.items())
+        problems = self.seleniumExecutionContext.fillsForm(fields)
+        missingLocators = [locator for result, locator in problems if result == GuardedCommandResult.LOCATOR_MISSING]
+        ensurePresenceOfLocator(not missingLocators, ", ".join(missingLocators))
+        missingOptions = [locator for result, locator in problems if result == GuardedCommandResult.OPTION_MISSING]
+        if missingOptions:
+            raise SeleniumDrivenUserActionsException("The requested options could not be found in " + ", ".join(missingOptions))
+    
+    @chainable
+    def takesSnapshot(self):
+        self.seleniumExecutionContext.takesSnapshot()
     
     @chainable
     def selects(self, option):
-        self.seleniumExecutionContext.setOptionBeingHandled(option)
+        self.chainState.optionBeingHandled = option
     
     @chainable
-    @requiresPresenceOfLocator 
+    @mutatesPage
+    @fusesPresenceOfLocator
     @resetsLastVisitedLocator
     def comingFrom(self, locator):
-        option = self.seleniumExecutionContext.optionBeingHandled
-        if option not in self.getSeleniumInstance().get_select_options(locator):
+        option = self.chainState.optionBeingHandled
+        result = self.seleniumExecutionContext.performsGuardedCommand(locator, "select", locator, option)
+        if result == GuardedCommandResult.OPTION_MISSING:
             raise SeleniumDrivenUserActionsException(option + " option could not be found in " + locator )
-        
-        self.getSeleniumInstance().select(locator, option)
+        return result
+
+    def reads(self, locator, chunkSize=None):
+        self.seleniumExecutionContext.initialize()
+        self.seleniumExecutionContext.startsStep()
+        table = self.seleniumExecutionContext.tableRowsOf(locator, 0, chunkSize)
+        ensurePresenceOfLocator(table is not None, locator)
+        if chunkSize is None:
+            return table["rows"]
+        return self.seleniumExecutionContext.streamedTableRows(locator, chunkSize, table)
 
     @chainable
-    def waitsForPageToLoad(self, timeout=30000):
+    @mutatesPage
+    def waitsForPageToLoad(self, timeout=None):
         try:
-            self.getSeleniumInstance().wait_for_page_to_load(timeout)
+            self.seleniumExecutionContext.waitsWithTimeout("waitsForPageToLoad", timeout, self.getSeleniumInstance().wait_for_page_to_load)
         except:
             raise SeleniumDrivenUserActionsException("Timeout reached")
+        self.seleniumExecutionContext.pageLoaded()
     
     @chainable
     @requiresPresenceOfLocator
     def drag(self, locator):
-        self.seleniumExecutionContext.setItemToDrag(locator)
+        self.chainState.itemToDrag = locator
     
     @chainable
-    @requiresPresenceOfLocator
+    @mutatesPage
+    @fusesPresenceOfLocator
     def andDropsItOn(self, locator):
-        if self.seleniumExecutionContext.itemToDrag is None:
+        if self.chainState.itemToDrag is None:
             raise SeleniumDrivenUserActionsException("Nothing to drag")
-        self.getSeleniumInstance().drag_and_drop(self.seleniumExecutionContext.itemToDrag, locator)
-        self.seleniumExecutionContext.setItemToDrag(None)
+        result = self.seleniumExecutionContext.performsGuardedCommand(locator, "drag_and_drop", self.chainState.itemToDrag, locator)
+        if result == GuardedCommandResult.OK:
+            self.chainState.itemToDrag = None
+        return result
     
     @chainable
-    def waitsForAjax(self, library="jQuery", timeout=30000):
+    @mutatesPage
+    def waitsForAjax(self, library="jQuery", timeout=None, idleTime=500):
         waitForAjaxCondition = {"jQuery":JavascriptHelper.GetjQueryWaitForAjaxCondition,
-                                "Prototype":JavascriptHelper.GetPrototypeWaitForAjaxCondition
+                                "Prototype":JavascriptHelper.GetPrototypeWaitForAjaxCondition,
+                                "Network":lambda: JavascriptHelper.GetNetworkIdleCondition(idleTime)
                                }
      
         try :  
-            condition = waitForAjaxCondition[library]()
-            self.getSeleniumInstance().wait_for_condition(condition,timeout)
+            conditionOf = waitForAjaxCondition[library]
         except KeyError:
             raise SeleniumDrivenUserActionsException("Specified library : " + library +" is not supported")
+        self.seleniumExecutionContext.requiresScripts("waitsForAjax")
+        condition = conditionOf()
+        self.seleniumExecutionContext.waitsWithTimeout("waitsForAjax " + library, timeout,
+                                                       lambda timeout: self.getSeleniumInstance().wait_for_condition(condition, timeout))
     
     
\ No newline at end of file
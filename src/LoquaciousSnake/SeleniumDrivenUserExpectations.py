@@ -1,15 +1,22 @@
 from LoquaciousSnake.helpers.Decorators import chainable, requiresPresenceOfLocator, requiresAPreviouslyVisitedLocator,\
-    requiresAPreviouslySelectedOption
+    requiresAPreviouslySelectedOption, autoWaitsFor, ensurePresenceOfLocator
+from LoquaciousSnake.ChainState import ChainState
+from LoquaciousSnake.helpers.SortKeys import sortKeys
 
 class SeleniumDrivenUserExpectationsException(Exception):
     pass
 
+def describeCell(text):
+    if text is None:
+        return "no cell"
+    return "\"" + text + "\""
+
 
 class SeleniumDrivenUserExpectations:
       
-    def __init__(self, seleniumExecutionContext):
+    def __init__(self, seleniumExecutionContext, chainState=None):
         self.seleniumExecutionContext = seleniumExecutionContext
-        self.seleniumExecutionContext.initialize()
+        self.chainState = chainState if chainState is not None else ChainState()
         self.chainingElement = self
         
     def getSeleniumInstance(self):        
@@ -22,61 +29,128 @@ class SeleniumDrivenUserExpectations:
             raise SeleniumDrivenUserExpectationsException("Expected page " + page + "did not match current location " + currentLocation)
     
     @chainable
+    @autoWaitsFor("is_element_present", lambda state, locator: (locator, True))
     @requiresPresenceOfLocator
     def shouldSee(self, locator):        
-        self.seleniumExecutionContext.setLastVisitedLocation(locator)
+        self.chainState.lastVisitedLocation = locator
     
     @chainable
     @requiresAPreviouslyVisitedLocator
     def followedBy(self,locator):
-        if not self.getSeleniumInstance().is_ordered(self.seleniumExecutionContext.lastVisitedLocation, locator):
-            raise SeleniumDrivenUserExpectationsException("Expected this locator : " + locator + " to follow this locator : " + self.seleniumExecutionContext.lastVisitedLocation + " but it did not")
-        self.seleniumExecutionContext.setLastVisitedLocation(locator)
+        if not self.seleniumExecutionContext.isOrdered(self.chainState.lastVisitedLocation, locator):
+            raise SeleniumDrivenUserExpectationsException("Expected this locator : " + locator + " to follow this locator : " + self.chainState.lastVisitedLocation + " but it did not")
+        self.chainState.lastVisitedLocation = locator
         
     @chainable
+    def shouldSeeInOrder(self, locators):
+        locators = list(locators)
+        if not locators:
+            return
+        order = self.seleniumExecutionContext.documentOrderOf(locators)
+        if order[0] == "missing":
+            ensurePresenceOfLocator(False, locators[order[1]])
+        if order[0] == "unordered":
+            raise SeleniumDrivenUserExpectationsException("Expected this locator : " + locators[order[1]] + " to follow this locator : " + locators[order[1] - 1] + " but it did not")
+        self.chainState.lastVisitedLocation = locators[-1]
+
+    @chainable
+    def shouldSeeSorted(self, locator, by="text", descending=False):
+        if by not in sortKeys:
+            raise SeleniumDrivenUserExpectationsException("Elements can only be sorted by " + ", ".join(sorted(sortKeys)) + ", not by " + by)
+        order = self.seleniumExecutionContext.sortedOrderOf(locator, by, descending)
+        if order[0] == "missing":
+            ensurePresenceOfLocator(False, locator)
+        if order[0] == "unparsable":
+            raise SeleniumDrivenUserExpectationsException("Item " + str(order[1] + 1) + " matching " + locator + " : " + order[2] + " is not a " + by)
+        if order[0] == "unsorted":
+            direction = " in descending order"
+            if not descending:
+                direction = ""
+            raise SeleniumDrivenUserExpectationsException("Items matching " + locator + " are not sorted by " + by + direction + " : item " + str(order[1]) + " (" + order[2] + ") comes before item " + str(order[1] + 1) + " (" + order[3] + ")")
+
+    @chainable
+    def shouldSeeTable(self, locator, expectedRows):
+        expectedRows = [list(row) for row in expectedRows]
+        table = self.seleniumExecutionContext.tableDifferencesOf(locator, expectedRows)
+        ensurePresenceOfLocator(table is not None, locator)
+        problems = []
+        for row, column, actual in table["differences"]:
+            expected = None
+            if column < len(expectedRows[row]):
+                expected = expectedRows[row][column]
+            problems.append("row " + str(row + 1) + " column " + str(column + 1) + " expected " + describeCell(expected) + " but found " + describeCell(actual))
+        if table["count"] > len(table["differences"]):
+            problems.append(str(table["count"] - len(table["differences"])) + " more cells differ")
+        if table["total"] != len(expectedRows):
+            problems.append(str(len(expectedRows)) + " rows were expected but " + str(table["total"]) + " were found")
+        if problems:
+            raise SeleniumDrivenUserExpectationsException("Table " + locator + " did not match the expected rows : " + ", ".join(problems))
+        self.chainState.lastVisitedLocation = locator
+
+    @chainable
+    @autoWaitsFor("is_element_present", lambda state, locator: (locator, False))
     def shouldNotSee(self, locator):
-        if self.getSeleniumInstance().is_element_present(locator):
+        if self.seleniumExecutionContext.isElementPresent(locator):
             raise SeleniumDrivenUserExpectationsException(locator + " was found on the current page.")
     
     @chainable
+    def shouldSeeAll(self, locators):
+        locators = list(locators)
+        missing = [locator for locator, isPresent in zip(locators, self.seleniumExecutionContext.arePresent(locators)) if not isPresent]
+        if missing:
+            raise SeleniumDrivenUserExpectationsException(", ".join(missing) + " could not be found on the current page.")
+    
+    @chainable
+    def shouldNotSeeAny(self, locators):
+        locators = list(locators)
+        found = [locator for locator, isPresent in zip(locators, self.seleniumExecutionContext.arePresent(locators)) if isPresent]
+        if found:
+            raise SeleniumDrivenUserExpectationsException(", ".join(found) + " was found on the current page.")
+    
+    @chainable
+    @autoWaitsFor("get_value", lambda state, expectedValue: (state.lastVisitedLocation, expectedValue))
     @requiresAPreviouslyVisitedLocator
     def withValue(self, expectedValue): 
-        currentValue = self.getSeleniumInstance().get_value(self.seleniumExecutionContext.lastVisitedLocation)
+        currentValue = self.seleniumExecutionContext.getValue(self.chainState.lastVisitedLocation)
         if expectedValue != currentValue:
             raise SeleniumDrivenUserExpectationsException("Expected value :" + expectedValue + " did not match current value :" + currentValue)
     
     @chainable
+    @autoWaitsFor("get_text", lambda state, expectedText: (state.lastVisitedLocation, expectedText))
     @requiresAPreviouslyVisitedLocator
     def withText(self, expectedText):
-        currentText = self.getSeleniumInstance().get_text((self.seleniumExecutionContext.lastVisitedLocation))
+        currentText = self.seleniumExecutionContext.getText(self.chainState.lastVisitedLocation)
         if expectedText != currentText:
             raise SeleniumDrivenUserExpectationsException("Expected text : " + expectedText + " did not match current text : " + currentText)
     
     @chainable
+    @autoWaitsFor("is_checked", lambda state: (state.lastVisitedLocation, True))
     @requiresAPreviouslyVisitedLocator
     def checked(self):
-        location = self.seleniumExecutionContext.lastVisitedLocation
-        if not self.getSeleniumInstance().is_checked(location):
+        location = self.chainState.lastVisitedLocation
+        if not self.seleniumExecutionContext.isChecked(location):
             raise SeleniumDrivenUserExpectationsException(location + " is not checked.")
     
     @chainable
+    @autoWaitsFor("is_checked", lambda state: (state.lastVisitedLocation, False))
     @requiresAPreviouslyVisitedLocator
     def unchecked(self):
-        location = self.seleniumExecutionContext.lastVisitedLocation
-        if self.getSeleniumInstance().is_checked(location):
+        location = self.chainState.lastVisitedLocation
+        if self.seleniumExecutionContext.isChecked(location):
             raise SeleniumDrivenUserExpectationsException(location + " is checked.")
     
     @chainable
     @requiresAPreviouslyVisitedLocator
     def withOption(self, option):
-        self.seleniumExecutionContext.optionBeingHandled = option
+        self.chainState.optionBeingHandled = option
     
     @chainable
+    @autoWaitsFor("get_selected_label", lambda state: (state.lastVisitedLocation, state.optionBeingHandled))
     @requiresAPreviouslyVisitedLocator
     @requiresAPreviouslySelectedOption
     def selected(self):
-        optionExpectedToBeSelected = self.seleniumExecutionContext.optionBeingHandled
-        currentlySelectedOption = self.getSeleniumInstance().get_selected_label(self.seleniumExecutionContext.lastVisitedLocation)
+        optionExpectedToBeSelected = self.chainState.optionBeingHandled
+        currentlySelectedOption = self.seleniumExecutionContext.getSelectedLabel(self.chainState.lastVisitedLocation)
         if not  currentlySelectedOption == optionExpectedToBeSelected:
             raise SeleniumDrivenUserExpectationsException("Currently selected option : " + currentlySelectedOption + " did not match expected option :  " + optionExpectedToBeSelected)
             
\ No newline at end of file
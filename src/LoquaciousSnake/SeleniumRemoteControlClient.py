@@ -0,0 +1,311 @@
+from LoquaciousSnake.BrowserBackend import BrowserBackend
+import select
+import socket
+
+try:
+    from urllib import quote_plus
+except ImportError:
+    from urllib.parse import quote_plus
+
+try:
+    textType = unicode
+except NameError:
+    textType = str
+
+
+class SeleniumRemoteControlException(Exception):
+    pass
+
+
+class StaleConnectionException(Exception):
+    pass
+
+
+def encodeArgument(value):
+    if isinstance(value, bytes):
+        value = value.decode("utf-8")
+    elif not isinstance(value, textType):
+        value = textType(value)
+    return quote_plus(value.encode("utf-8"))
+
+
+def buildRequest(host, port, path, sessionId, verb, args):
+    body = "cmd=" + encodeArgument(verb)
+    for index in range(len(args)):
+        body += "&" + str(index + 1) + "=" + encodeArgument(args[index])
+    if sessionId is not None:
+        body += "&sessionId=" + encodeArgument(sessionId)
+    return ("POST " + path + " HTTP/1.1\r\n"
+            + "Host: " + str(host) + ":" + str(port) + "\r\n"
+            + "Content-Type: application/x-www-form-urlencoded; charset=utf-8\r\n"
+            + "Content-Length: " + str(len(body)) + "\r\n"
+            + "Connection: keep-alive\r\n\r\n"
+            + body).encode("ascii")
+
+
+def addHeader(headers, line):
+    name, value = line.split(":", 1)
+    headers[name.strip().lower()] = value.strip()
+
+
+def closesConnection(statusLine, headers):
+    return headers.get("connection", "").lower() == "close" or statusLine.startswith(b"HTTP/1.0")
+
+
+def parseStringArray(csv):
+    tokens = []
+    token = []
+    escaped = False
+    for letter in csv:
+        if escaped:
+            token.append(letter)
+            escaped = False
+        elif letter == "\\":
+            escaped = True
+        elif letter == ",":
+            tokens.append("".join(token))
+            token = []
+        else:
+            token.append(letter)
+    tokens.append("".join(token))
+    return tokens
+
+
+def parseBoolean(verb, value):
+    if value == "true":
+        return True
+    if value == "false":
+        return False
+    raise ValueError("result of " + verb + " is neither 'true' nor 'false': " + value)
+
+
+class SeleniumRemoteControlClient(BrowserBackend):
+
+    path = "/selenium-server/driver/"
+    pipelinableCommands = ["isElementPresent", "getText", "getValue", "isChecked", "getSelectOptions",
+                           "getSelectedLabel", "isOrdered", "getLocation", "getTitle", "getHtmlSource",
+                           "getAttribute", "getXpathCount", "isVisible"]
+
+    def __init__(self, host, port, browserStartCommand, browserURL, timeout=None):
+        self.host = host
+        self.port = port
+        self.browserStartCommand = browserStartCommand
+        self.browserURL = browserURL
+        self.timeout = timeout
+        self.extensionJs = ""
+        self.sessionId = None
+        self.connection = None
+        self.responses = None
+        self.requestsOnConnection = 0
+
+    def connect(self):
+        self.disconnect()
+        if self.timeout is None:
+            self.connection = socket.create_connection((self.host, self.port))
+        else:
+            self.connection = socket.create_connection((self.host, self.port), self.timeout)
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.responses = self.connection.makefile("rb")
+        self.requestsOnConnection = 0
+
+    def disconnect(self):
+        if self.connection is not None:
+            try:
+                self.responses.close()
+                self.connection.close()
+            except socket.error:
+                pass
+        self.connection = None
+        self.responses = None
+
+    def isClosedByTheServer(self):
+        try:
+            return bool(select.select([self.connection], [], [], 0)[0])
+        except (socket.error, select.error, ValueError):
+            return True
+
+    def requestFor(self, verb, args):
+        return buildRequest(self.host, self.port, self.path, self.sessionId, verb, args)
+
+    def readResponse(self):
+        statusLine = self.responses.readline()
+        if not statusLine:
+            raise StaleConnectionException("Connection closed by the Selenium RC server")
+        headers = {}
+        while True:
+            line = self.responses.readline().decode("iso-8859-1").strip()
+            if not line:
+                break
+            addHeader(headers, line)
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            body = self.readChunkedBody()
+        elif "content-length" in headers:
+            body = self.responses.read(int(headers["content-length"]))
+        else:
+            body = self.responses.read()
+            headers["connection"] = "close"
+
+        if closesConnection(statusLine, headers):
+            self.disconnect()
+        return body.decode("utf-8")
+
+    def readChunkedBody(self):
+        chunks = []
+        while True:
+            size = int(self.responses.readline().split(b";")[0].strip(), 16)
+            if size == 0:
+                while self.responses.readline().strip():
+                    pass
+                return b"".join(chunks)
+            chunks.append(self.responses.read(size))
+            self.responses.readline()
+
+    def sends(self, commands):
+        responses = []
+        while len(responses) < len(commands):
+            pending = commands[len(responses):]
+            answeredBefore = len(responses)
+            if self.connection is not None and self.isClosedByTheServer():
+                self.disconnect()
+            isReusingConnection = self.connection is not None and self.requestsOnConnection > 0
+            isSent = False
+            try:
+                if self.connection is None:
+                    self.connect()
+                self.connection.sendall(b"".join([self.requestFor(verb, args) for verb, args in pending]))
+                isSent = True
+                self.requestsOnConnection += len(pending)
+                for command in pending:
+                    if self.connection is None:
+                        break
+                    responses.append(self.readResponse())
+            except (socket.error, StaleConnectionException):
+                self.disconnect()
+                if not isReusingConnection and len(responses) == answeredBefore:
+                    raise
+                if isSent and not self.canBeSentAgain(commands[len(responses):]):
+                    raise
+        return responses
+
+    def canBeSentAgain(self, commands):
+        return not [verb for verb, args in commands if verb not in self.pipelinableCommands]
+
+    def checked(self, verb, data):
+        if not data.startswith("OK"):
+            raise SeleniumRemoteControlException(data)
+        return data
+
+    def do_command(self, verb, args):
+        return self.checked(verb, self.sends([(verb, args)])[0])
+
+    def pipelines(self, commands):
+        if len(commands) < 2 or [verb for verb, args in commands if verb not in self.pipelinableCommands]:
+            return [self.do_command(verb, args) for verb, args in commands]
+        return [self.checked(verb, data) for (verb, args), data in zip(commands, self.sends(commands))]
+
+    def get_string(self, verb, args):
+        return self.do_command(verb, args)[3:]
+
+    def get_string_array(self, verb, args):
+        return parseStringArray(self.get_string(verb, args))
+
+    def get_boolean(self, verb, args):
+        return parseBoolean(verb, self.get_string(verb, args))
+
+    def get_number(self, verb, args):
+        return self.get_string(verb, args)
+
+    def start(self):
+        self.sessionId = self.get_string("getNewBrowserSession", [self.browserStartCommand, self.browserURL, self.extensionJs])
+
+    def stop(self):
+        try:
+            self.do_command("testComplete", [])
+        finally:
+            self.sessionId = None
+            self.disconnect()
+
+    def open(self, url):
+        self.do_command("open", [url])
+
+    def click(self, locator):
+        self.do_command("click", [locator])
+
+    def check(self, locator):
+        self.do_command("check", [locator])
+
+    def uncheck(self, locator):
+        self.do_command("uncheck", [locator])
+
+    def type(self, locator, value):
+        self.do_command("type", [locator, value])
+
+    def select(self, selectLocator, optionLocator):
+        self.do_command("select", [selectLocator, optionLocator])
+
+    def drag_and_drop(self, locator, movementsString):
+        self.do_command("dragAndDrop", [locator, movementsString])
+
+    def drag_and_drop_to_object(self, locatorOfObjectToBeDragged, locatorOfDragDestinationObject):
+        self.do_command("dragAndDropToObject", [locatorOfObjectToBeDragged, locatorOfDragDestinationObject])
+
+    def wait_for_page_to_load(self, timeout):
+        self.do_command("waitForPageToLoad", [timeout])
+
+    def wait_for_condition(self, script, timeout):
+        self.do_command("waitForCondition", [script, timeout])
+
+    def delete_all_visible_cookies(self):
+        self.do_command("deleteAllVisibleCookies", [])
+
+    def get_cookie(self):
+        return self.get_string("getCookie", [])
+
+    def create_cookie(self, nameValuePair, optionsString):
+        self.do_command("createCookie", [nameValuePair, optionsString])
+
+    def get_eval(self, script):
+        return self.get_string("getEval", [script])
+
+    def is_element_present(self, locator):
+        return self.get_boolean("isElementPresent", [locator])
+
+    def are_elements_present(self, locators):
+        return [parseBoolean("isElementPresent", response[3:]) for response in self.pipelines([("isElementPresent", [locator]) for locator in locators])]
+
+    def is_visible(self, locator):
+        return self.get_boolean("isVisible", [locator])
+
+    def get_text(self, locator):
+        return self.get_string("getText", [locator])
+
+    def get_value(self, locator):
+        return self.get_string("getValue", [locator])
+
+    def is_checked(self, locator):
+        return self.get_boolean("isChecked", [locator])
+
+    def get_select_options(self, selectLocator):
+        return self.get_string_array("getSelectOptions", [selectLocator])
+
+    def get_selected_label(self, selectLocator):
+        return self.get_string("getSelectedLabel", [selectLocator])
+
+    def is_ordered(self, locator1, locator2):
+        return self.get_boolean("isOrdered", [locator1, locator2])
+
+    def get_location(self):
+        return self.get_string("getLocation", [])
+
+    def get_title(self):
+        return self.get_string("getTitle", [])
+
+    def get_html_source(self):
+        return self.get_string("getHtmlSource", [])
+
+    def get_attribute(self, attributeLocator):
+        return self.get_string("getAttribute", [attributeLocator])
+
+    def get_xpath_count(self, xpath):
+        return self.get_number("getXpathCount", [xpath])
@@ -0,0 +1,154 @@
+from LoquaciousSnake.BackendRegistry import BackendRegistry
+import threading
+import time
+
+
+class SeleniumSessionPoolException(Exception):
+    pass
+
+
+class SeleniumSession:
+
+    def __init__(self, seleniumInstance):
+        self.seleniumInstance = seleniumInstance
+        self.uses = 0
+        self.lastCheckIn = time.time()
+
+    def idleTime(self):
+        return time.time() - self.lastCheckIn
+
+
+class SeleniumSessionPool:
+
+    def __init__(self, host, port, browserStartCommand, url, size=1, maxIdleSeconds=None, maxUsesPerSession=None, checkOutTimeout=None, backend=None):
+        self.host = host
+        self.port = port
+        self.browserStartCommand = browserStartCommand
+        self.url = url
+        self.size = size
+        self.maxIdleSeconds = maxIdleSeconds
+        self.maxUsesPerSession = maxUsesPerSession
+        self.checkOutTimeout = checkOutTimeout
+        self.backend = BackendRegistry.backendNamed(backend)
+        self.idleSessions = []
+        self.checkedOutSessions = {}
+        self.sessionsBeingStarted = 0
+        self.isShutDown = False
+        self.lock = threading.Condition()
+
+    def sessionCount(self):
+        return len(self.idleSessions) + len(self.checkedOutSessions) + self.sessionsBeingStarted
+
+    def warmUp(self):
+        while self.reservesSessionSlot():
+            self.startReservedSession(checkedOut=False)
+
+    def reservesSessionSlot(self):
+        with self.lock:
+            if self.isShutDown or self.sessionCount() >= self.size:
+                return False
+            self.sessionsBeingStarted += 1
+            return True
+
+    def startReservedSession(self, checkedOut):
+        session = None
+        try:
+            session = self.startSession()
+        finally:
+            with self.lock:
+                self.sessionsBeingStarted -= 1
+                if session is not None and checkedOut:
+                    self.checkedOutSessions[id(session.seleniumInstance)] = session
+                elif session is not None:
+                    self.idleSessions.append(session)
+                self.lock.notify()
+        return session
+
+    def checkOut(self):
+        retiredSessions = []
+        try:
+            session = self.takeIdleSessionOrReserveSlot(retiredSessions)
+        finally:
+            self.retire(retiredSessions)
+
+        if session is None:
+            session = self.startReservedSession(checkedOut=True)
+        return session.seleniumInstance
+
+    def takeIdleSessionOrReserveSlot(self, retiredSessions):
+        deadline = None
+        if self.checkOutTimeout is not None:
+            deadline = time.time() + self.checkOutTimeout
+
+        with self.lock:
+            while True:
+                if self.isShutDown:
+                    raise SeleniumSessionPoolException("Session pool has been shut down")
+                while self.idleSessions and self.hasBeenIdleForTooLong(self.idleSessions[0]):
+                    retiredSessions.append(self.idleSessions.pop(0))
+                if self.idleSessions:
+                    session = self.idleSessions.pop()
+                    self.checkedOutSessions[id(session.seleniumInstance)] = session
+                    return session
+                if self.sessionCount() < self.size:
+                    self.sessionsBeingStarted += 1
+                    return None
+
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise SeleniumSessionPoolException("No session became available within " + str(self.checkOutTimeout) + " seconds")
+                self.lock.wait(remaining)
+
+    def checkIn(self, seleniumInstance):
+        with self.lock:
+            session = self.checkedOutSessions.pop(id(seleniumInstance), None)
+        if session is None:
+            raise SeleniumSessionPoolException("This selenium instance was not checked out of this pool")
+
+        session.uses += 1
+        if self.isShutDown or self.hasBeenUsedTooManyTimes(session) or not self.resetSession(session):
+            self.retire([session])
+            with self.lock:
+                self.lock.notify()
+            return
+
+        session.lastCheckIn = time.time()
+        with self.lock:
+            self.idleSessions.append(session)
+            self.lock.notify()
+
+    def shutdown(self):
+        with self.lock:
+            self.isShutDown = True
+            retiredSessions = self.idleSessions
+            self.idleSessions = []
+            self.lock.notifyAll()
+        self.retire(retiredSessions)
+
+    def startSession(self):
+        seleniumInstance = self.backend.create(self.host, self.port, self.browserStartCommand, self.url)
+        seleniumInstance.start()
+        return SeleniumSession(seleniumInstance)
+
+    def resetSession(self, session):
+        try:
+            session.seleniumInstance.delete_all_visible_cookies()
+            session.seleniumInstance.open("about:blank")
+            return True
+        except Exception:
+            return False
+
+    def retire(self, sessions):
+        for session in sessions:
+            try:
+                session.seleniumInstance.stop()
+            except Exception:
+                pass
+
+    def hasBeenIdleForTooLong(self, session):
+        return self.maxIdleSeconds is not None and session.idleTime() >= self.maxIdleSeconds
+
+    def hasBeenUsedTooManyTimes(self, session):
+        return self.maxUsesPerSession is not None and session.uses >= self.maxUsesPerSession
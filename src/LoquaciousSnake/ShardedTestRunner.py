@@ -0,0 +1,182 @@
+from LoquaciousSnake.SharedSeleniumExecutionContext import SharedSeleniumExecutionContext
+from multiprocessing import Pool
+import heapq
+import json
+import os
+import sys
+import time
+import traceback
+import unittest
+
+
+class TestDurations:
+
+    defaultDuration = 1.0
+
+    def __init__(self, path):
+        self.path = path
+        self.durations = {}
+        if path is not None and os.path.exists(path):
+            durationsFile = open(path)
+            try:
+                self.durations = json.load(durationsFile)
+            finally:
+                durationsFile.close()
+        self.unknownDuration = self.defaultDuration
+        if self.durations:
+            self.unknownDuration = sum(self.durations.values()) / len(self.durations)
+
+    def durationOf(self, testId):
+        return self.durations.get(testId, self.unknownDuration)
+
+    def record(self, testId, duration):
+        self.durations[testId] = duration
+
+    def save(self):
+        if self.path is None:
+            return
+        durationsFile = open(self.path, "w")
+        try:
+            json.dump(self.durations, durationsFile, indent=1, sort_keys=True)
+        finally:
+            durationsFile.close()
+
+
+class TestOutcome:
+
+    def __init__(self, testId, status, details, duration, waits=None):
+        self.testId = testId
+        self.status = status
+        self.details = details
+        self.duration = duration
+        self.waits = waits or {}
+
+
+class ShardedTestResult:
+
+    def __init__(self, outcomes, timeTaken):
+        self.outcomes = outcomes
+        self.timeTaken = timeTaken
+        self.testsRun = len(outcomes)
+        self.failures = [(outcome.testId, outcome.details) for outcome in outcomes if outcome.status == "FAIL"]
+        self.errors = [(outcome.testId, outcome.details) for outcome in outcomes if outcome.status == "ERROR"]
+
+    def wasSuccessful(self):
+        return not self.failures and not self.errors
+
+
+def collectTestIds(suite):
+    testIds = []
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            testIds.extend(collectTestIds(test))
+        else:
+            testIds.append(test.id())
+    return testIds
+
+
+def shard(testIds, durations, numberOfShards):
+    shards = [[] for index in range(numberOfShards)]
+    loads = [(0.0, index) for index in range(numberOfShards)]
+    longestFirst = sorted(testIds, key=durations.durationOf, reverse=True)
+    for testId in longestFirst:
+        load, index = heapq.heappop(loads)
+        shards[index].append(testId)
+        heapq.heappush(loads, (load + durations.durationOf(testId), index))
+    return [testsOfShard for testsOfShard in shards if testsOfShard]
+
+
+def takeWaits():
+    if SharedSeleniumExecutionContext.defaultAdaptiveTimeouts is None:
+        return {}
+    return SharedSeleniumExecutionContext.defaultAdaptiveTimeouts.takeUnsavedSamples()
+
+
+def runShard(testIds):
+    SharedSeleniumExecutionContext.forgetSharedInstance()
+    takeWaits()
+    loader = unittest.TestLoader()
+    outcomes = [runTest(loader, testId) for testId in testIds]
+    try:
+        SharedSeleniumExecutionContext.resetAll()
+    except Exception:
+        sys.stderr.write("The shared selenium instance of the shard could not be stopped:\n" + traceback.format_exc())
+    return outcomes
+
+
+def runTest(loader, testId):
+    result = unittest.TestResult()
+    start = time.time()
+    try:
+        loader.loadTestsFromName(testId).run(result)
+    except Exception:
+        result.errors.append((testId, traceback.format_exc()))
+    duration = time.time() - start
+
+    if result.errors:
+        return TestOutcome(testId, "ERROR", result.errors[0][1], duration, takeWaits())
+    elif result.failures:
+        return TestOutcome(testId, "FAIL", result.failures[0][1], duration, takeWaits())
+    return TestOutcome(testId, "ok", "", duration, takeWaits())
+
+
+class ShardedTestRunner:
+
+    separator1 = "=" * 70
+    separator2 = "-" * 70
+
+    def __init__(self, processes, durationsPath=None, stream=None, verbosity=1):
+        self.processes = processes
+        self.durations = TestDurations(durationsPath)
+        self.stream = stream or sys.stderr
+        self.verbosity = verbosity
+
+    def run(self, suite):
+        start = time.time()
+        testIds = collectTestIds(suite)
+        shards = shard(testIds, self.durations, self.processes)
+
+        outcomesById = {}
+        if shards:
+            pool = Pool(len(shards))
+            try:
+                for outcomesOfShard in pool.map(runShard, shards, 1):
+                    for outcome in outcomesOfShard:
+                        outcomesById[outcome.testId] = outcome
+            finally:
+                pool.close()
+                pool.join()
+
+        outcomes = [outcomesById[testId] for testId in testIds]
+        for outcome in outcomes:
+            self.durations.record(outcome.testId, outcome.duration)
+            if SharedSeleniumExecutionContext.defaultAdaptiveTimeouts is not None:
+                SharedSeleniumExecutionContext.defaultAdaptiveTimeouts.merge(outcome.waits)
+        self.durations.save()
+
+        result = ShardedTestResult(outcomes, time.time() - start)
+        self.report(result, len(shards))
+        return result
+
+    def report(self, result, numberOfShards):
+        for outcome in result.outcomes:
+            if self.verbosity > 1:
+                self.stream.write(outcome.testId + " ... " + outcome.status + "\n")
+            elif self.verbosity == 1:
+                self.stream.write({"ok": ".", "FAIL": "F", "ERROR": "E"}[outcome.status])
+        if self.verbosity == 1:
+            self.stream.write("\n")
+
+        for status, failures in (("ERROR", result.errors), ("FAIL", result.failures)):
+            for testId, details in failures:
+                self.stream.write(self.separator1 + "\n")
+                self.stream.write(status + ": " + testId + "\n")
+                self.stream.write(self.separator2 + "\n")
+                self.stream.write(details + "\n")
+
+        self.stream.write(self.separator2 + "\n")
+        self.stream.write("Ran %d tests in %.3fs on %d processes\n\n" % (result.testsRun, result.timeTaken, numberOfShards))
+        if result.wasSuccessful():
+            self.stream.write("OK\n")
+        else:
+            self.stream.write("FAILED (failures=%d, errors=%d)\n" % (len(result.failures), len(result.errors)))
@@ -1,83 +1,522 @@
-from selenium import selenium
+from LoquaciousSnake.BackendRegistry import BackendRegistry
+from LoquaciousSnake.BrowserBackend import BrowserBackendException, Capabilities
+from LoquaciousSnake.BackendInstrumentation import instrumentsBackend, uninstrumentsBackend
+from LoquaciousSnake.PageSnapshot import PageSnapshot
+from LoquaciousSnake.helpers.JavascriptHelper import JavascriptHelper
+from LoquaciousSnake.helpers.Decorators import GuardedCommandResult, ensurePresenceOfLocator
+from LoquaciousSnake.helpers.Instrumentation import Instrumentation
+from LoquaciousSnake.helpers.LocatorEngine import LocatorSyntaxException
+from LoquaciousSnake.helpers.LocatorOptimizer import LocatorOptimizer
+import json
+import threading
+import time
 
-class SharedSeleniumExecutionContext:
+
+disablingAttributes = [("disabled", lambda value: True),
+                       ("aria-disabled", lambda value: value == "true"),
+                       ("class", lambda value: "disabled" in value.split())]
+
+
+def locksReadCache(functionToExecute):
+    def executeWhileHoldingTheLock(self, *args, **kwargs):
+        self.lock.acquire()
+        try:
+            return functionToExecute(self, *args, **kwargs)
+        finally:
+            self.lock.release()
+    return executeWhileHoldingTheLock
+
+class SharedSeleniumExecutionContext(object):
     
     host =None
     port =None
     browserStartCommand =None
     url = None
     seleniumInstance=None
+    backendName=None
+    defaultInstrumentation=None
+    defaultAdaptiveTimeouts=None
+    defaultTimeout=30000
+    guardedCommandLocatorArguments = {"click": 1, "check": 1, "uncheck": 1, "select": 1, "drag_and_drop": 2}
     isInitialized=False
-    lastVisitedLocation=None
-    optionBeingHandled=None
-    itemToDrag=None
+    sharedInstanceLock = threading.RLock()
     
-    def __init__(self, host, port, browserStartCommand, url):
-        if SharedSeleniumExecutionContext.seleniumInstance == None:
-            SharedSeleniumExecutionContext.seleniumInstance = selenium(host, port, browserStartCommand, url)
-        self.seleniumInstance = SharedSeleniumExecutionContext.seleniumInstance
-        self.isInitialized = SharedSeleniumExecutionContext.isInitialized
+    def __init__(self, host, port, browserStartCommand, url, sessionPool=None, backend=None, private=False):
+        if backend is None and sessionPool is not None:
+            backend = sessionPool.backend.name
+        self.backend = BackendRegistry.backendNamed(backend)
+        self.sessionPool = sessionPool
+        self.sharesSeleniumInstance = sessionPool is None and self.backend.sharesInstance and not private
+        if sessionPool is not None:
+            self.seleniumInstance = None
+            self.isInitialized = False
+        elif not self.sharesSeleniumInstance:
+            self.seleniumInstance = self.backend.create(host, port, browserStartCommand, url)
+            self.isInitialized = False
+        else:
+            SharedSeleniumExecutionContext.sharedInstanceLock.acquire()
+            try:
+                if SharedSeleniumExecutionContext.seleniumInstance == None:
+                    SharedSeleniumExecutionContext.seleniumInstance = self.backend.create(host, port, browserStartCommand, url)
+                    SharedSeleniumExecutionContext.backendName = self.backend.name
+                elif SharedSeleniumExecutionContext.backendName != self.backend.name:
+                    raise BrowserBackendException("The shared instance already runs on the " + str(SharedSeleniumExecutionContext.backendName) + " backend, call resetAll before switching to " + self.backend.name)
+                self.seleniumInstance = SharedSeleniumExecutionContext.seleniumInstance
+                self.isInitialized = SharedSeleniumExecutionContext.isInitialized
+            finally:
+                SharedSeleniumExecutionContext.sharedInstanceLock.release()
         self.setBrowserStartCommand(browserStartCommand)
         self.setPort(port)
         self.setURL(url)
         self.setHost(host)
-        self.setLastVisitedLocation()
-        self.setOptionBeingHandled()
-        self.setItemToDrag()
-        
+        self.lock = threading.RLock()
+        self.pageGeneration = 0
+        self.location = None
+        self.openedLocation = None
+        self.readCache = {}
+        self.cachesReads = False
+        self.tracksDomMutations = False
+        self.domMutationMarker = None
+        self.domMutationsValidated = False
+        self.snapshot = None
+        self.primedReads = {}
+        self.autoWaitTimeout = None
+        self.tracksNetwork = False
+        self.adaptiveTimeouts = SharedSeleniumExecutionContext.defaultAdaptiveTimeouts
+        self.locatorOptimizer = None
+        self.instrumentation = None
+        if SharedSeleniumExecutionContext.defaultInstrumentation is not None:
+            self.enableInstrumentation(SharedSeleniumExecutionContext.defaultInstrumentation)
+
+    @staticmethod
+    def fromSessionPool(sessionPool):
+        return SharedSeleniumExecutionContext(sessionPool.host, sessionPool.port, sessionPool.browserStartCommand, sessionPool.url, sessionPool)
+
+    def companion(self):
+        if self.sessionPool is not None:
+            companion = SharedSeleniumExecutionContext.fromSessionPool(self.sessionPool)
+        else:
+            companion = SharedSeleniumExecutionContext(self.host, self.port, self.browserStartCommand, self.url, backend=self.backend.name, private=True)
+        if self.locatorOptimizer is not None:
+            companion.enableLocatorOptimization(self.locatorOptimizer.strict)
+        companion.adaptiveTimeouts = self.adaptiveTimeouts
+        return companion
+
+    def cookies(self):
+        if not self.supports(Capabilities.COOKIES):
+            return ""
+        return self.seleniumInstance.get_cookie()
+
+    def addsCookies(self, cookies):
+        for cookie in cookies.split(";"):
+            if cookie.strip():
+                self.seleniumInstance.create_cookie(cookie.strip(), "path=/")
+
+    def isDisabled(self, locator):
+        locator = self.locatorFor(locator)
+        if self.supportsScripts():
+            return self.seleniumInstance.get_eval(JavascriptHelper.GetIsDisabledScript(locator)) == "true"
+        for name, disables in disablingAttributes:
+            try:
+                value = self.seleniumInstance.get_attribute(locator + "@" + name)
+            except Exception:
+                continue
+            if disables(value):
+                return True
+        return False
+
+    def supports(self, capability):
+        return self.backend.supports(capability)
+
+    def supportsScripts(self):
+        return self.supports(Capabilities.SCRIPTS)
+
+    def requiresScripts(self, feature):
+        if not self.supportsScripts():
+            raise BrowserBackendException(feature + " needs a backend that runs scripts, which the " + self.backend.name + " backend does not")
+
     def setPort(self, port):
         self.port = port
-        SharedSeleniumExecutionContext.port = port
-        SharedSeleniumExecutionContext.seleniumInstance.port = port
+        if self.seleniumInstance is not None:
+            self.seleniumInstance.port = port
         
     def setHost(self, host):
         self.host = host
-        SharedSeleniumExecutionContext.host= host
-        SharedSeleniumExecutionContext.seleniumInstance.host = host
+        if self.seleniumInstance is not None:
+            self.seleniumInstance.host = host
         
     def setBrowserStartCommand(self, browserStartCommand):
         self.browserStartCommand = browserStartCommand
-        SharedSeleniumExecutionContext.__browserStartCommand = browserStartCommand
-        SharedSeleniumExecutionContext.seleniumInstance.browserStartCommand = browserStartCommand
+        if self.seleniumInstance is not None:
+            self.seleniumInstance.browserStartCommand = browserStartCommand
     
     def setURL(self, url):
         self.url = url
-        SharedSeleniumExecutionContext.url = url
-        SharedSeleniumExecutionContext.seleniumInstance.browserURL = url
-        
-    def setLastVisitedLocation(self, location=None):
-        self.lastVisitedLocation = location
-        SharedSeleniumExecutionContext.lastVisitedLocation = location
-    
-    def setOptionBeingHandled(self, option=None):
-        self.optionBeingHandled = option
-        SharedSeleniumExecutionContext.optionBeingHandled = option
-    
-    def setItemToDrag(self, item=None):
-        self.itemToDrag = item
-        SharedSeleniumExecutionContext.itemToDrag = item
+        if self.seleniumInstance is not None:
+            self.seleniumInstance.browserURL = url
         
+    def enableReadCache(self, trackDomMutations=False):
+        if trackDomMutations:
+            self.requiresScripts("Tracking DOM mutations")
+        self.cachesReads = True
+        self.tracksDomMutations = trackDomMutations
+        self.advancePageGeneration()
+
+    def disableReadCache(self):
+        self.cachesReads = False
+        self.tracksDomMutations = False
+        self.advancePageGeneration()
+
+    def enableAutoWait(self, timeout=10000):
+        self.requiresScripts("Auto-wait")
+        self.autoWaitTimeout = timeout
+
+    def disableAutoWait(self):
+        self.autoWaitTimeout = None
+
+    def enableNetworkTracking(self):
+        self.requiresScripts("Network tracking")
+        self.tracksNetwork = True
+        if self.isInitialized or (self.sharesSeleniumInstance and SharedSeleniumExecutionContext.isInitialized):
+            self.pageLoaded()
+
+    def disableNetworkTracking(self):
+        self.tracksNetwork = False
+
+    def enableAdaptiveTimeouts(self, adaptiveTimeouts):
+        self.adaptiveTimeouts = adaptiveTimeouts
+
+    def disableAdaptiveTimeouts(self):
+        self.adaptiveTimeouts = None
+
+    def waitsWithTimeout(self, step, timeout, wait):
+        if self.adaptiveTimeouts is None:
+            if timeout is None:
+                timeout = self.defaultTimeout
+            wait(timeout)
+            return
+        key = self.adaptiveTimeouts.keyFor(step, self.currentLocation())
+        if timeout is None:
+            timeout = self.adaptiveTimeouts.timeoutFor(key)
+        start = time.time()
+        wait(timeout)
+        self.adaptiveTimeouts.record(key, (time.time() - start) * 1000)
+
+    def opens(self, url):
+        self.seleniumInstance.open(url)
+        self.openedLocation = url
+
+    @locksReadCache
+    def currentLocation(self):
+        if self.location is None or self.location[0] != self.pageGeneration:
+            self.location = (self.pageGeneration, self.seleniumInstance.get_location())
+        return self.location[1]
+
+    def pageLoaded(self):
+        if self.tracksNetwork:
+            self.seleniumInstance.get_eval(JavascriptHelper.GetNetworkTrackerScript() + " && 'tracked'")
+
+    def enableLocatorOptimization(self, strict=True):
+        self.locatorOptimizer = LocatorOptimizer(strict)
+
+    def disableLocatorOptimization(self):
+        self.locatorOptimizer = None
+
+    def locatorFor(self, locator):
+        if self.locatorOptimizer is None:
+            return locator
+        return self.locatorOptimizer.optimize(locator)
+
+    def enableInstrumentation(self, instrumentation=None):
+        self.instrumentation = instrumentation or Instrumentation()
+        self.instrumented(self.seleniumInstance)
+
+    def disableInstrumentation(self):
+        self.instrumentation = None
+        self.uninstrumented(self.seleniumInstance)
+
+    def instrumented(self, seleniumInstance):
+        if self.instrumentation is not None and seleniumInstance is not None:
+            instrumentsBackend(seleniumInstance, self.instrumentation)
+        return seleniumInstance
+
+    def uninstrumented(self, seleniumInstance):
+        if seleniumInstance is not None:
+            uninstrumentsBackend(seleniumInstance)
+        return seleniumInstance
+
+    @locksReadCache
+    def advancePageGeneration(self):
+        self.pageGeneration += 1
+        self.location = (self.pageGeneration, self.openedLocation) if self.openedLocation is not None else None
+        self.openedLocation = None
+        self.readCache = {}
+        self.domMutationMarker = None
+        self.domMutationsValidated = False
+        self.snapshot = None
+        self.primedReads = {}
+
+    @locksReadCache
+    def startsStep(self):
+        self.domMutationsValidated = False
+
+    def pageSnapshot(self):
+        if self.supportsScripts():
+            source = self.seleniumInstance.get_eval(JavascriptHelper.GetSnapshotScript())
+        else:
+            source = "<html>" + self.seleniumInstance.get_html_source() + "</html>"
+        return PageSnapshot(source)
+
+    def snapshotOrPageSnapshot(self):
+        if self.snapshot is not None:
+            return self.snapshot
+        return self.pageSnapshot()
+
+    @locksReadCache
+    def takesSnapshot(self):
+        self.snapshot = self.pageSnapshot()
+
+    @locksReadCache
+    def validateAgainstDomMutations(self):
+        if self.domMutationsValidated:
+            return
+        marker = self.seleniumInstance.get_eval(JavascriptHelper.GetDomMutationCounterScript())
+        if self.domMutationMarker is not None and marker != self.domMutationMarker:
+            self.advancePageGeneration()
+        self.domMutationMarker = marker
+        self.domMutationsValidated = True
+
+    def waitsForRead(self, command, locator, expectedResult):
+        if self.autoWaitTimeout is None or locator is None or expectedResult is None or self.snapshot is not None:
+            return False
+        locator = self.locatorFor(locator)
+        key = (self.pageGeneration, command, locator)
+        try:
+            self.seleniumInstance.wait_for_condition(JavascriptHelper.GetReadConditionScript(command, locator, expectedResult), self.autoWaitTimeout)
+        except Exception:
+            return False
+        self.primesRead(key, expectedResult)
+        return True
+
+    @locksReadCache
+    def primesRead(self, key, result):
+        if key[0] != self.pageGeneration:
+            return
+        self.primedReads[key] = result
+        if self.cachesReads:
+            self.readCache[key] = result
+
+    @locksReadCache
+    def cachedRead(self, command, *args):
+        if self.locatorOptimizer is not None:
+            args = tuple([self.locatorOptimizer.optimize(locator) for locator in args])
+        key = (self.pageGeneration, command) + args
+        if key in self.primedReads:
+            return self.primedReads.pop(key)
+        if self.snapshot is not None:
+            try:
+                return self.snapshot.read(command, *args)
+            except LocatorSyntaxException:
+                pass
+        if not self.cachesReads:
+            return getattr(self.seleniumInstance, command)(*args)
+        if self.tracksDomMutations:
+            self.validateAgainstDomMutations()
+            key = (self.pageGeneration, command) + args
+        if key not in self.readCache:
+            self.readCache[key] = getattr(self.seleniumInstance, command)(*args)
+        return self.readCache[key]
+
+    def isElementPresent(self, locator):
+        return self.cachedRead("is_element_present", locator)
+
+    @locksReadCache
+    def arePresent(self, locators):
+        pipelinesReads = self.supports(Capabilities.PIPELINING)
+        if not locators or self.snapshot is not None or not (pipelinesReads or self.supportsScripts()):
+            return [self.isElementPresent(locator) for locator in locators]
+        if self.tracksDomMutations:
+            self.validateAgainstDomMutations()
+        locators = [self.locatorFor(locator) for locator in locators]
+        if pipelinesReads:
+            presence = self.seleniumInstance.are_elements_present(locators)
+        else:
+            presence = [flag == "1" for flag in self.seleniumInstance.get_eval(JavascriptHelper.GetPresenceOfLocatorsScript(locators))]
+        if self.cachesReads:
+            for locator, isPresent in zip(locators, presence):
+                self.readCache[(self.pageGeneration, "is_element_present", locator)] = isPresent
+        return presence
+
+    def getText(self, locator):
+        return self.cachedRead("get_text", locator)
+
+    def getValue(self, locator):
+        return self.cachedRead("get_value", locator)
+
+    def isChecked(self, locator):
+        return self.cachedRead("is_checked", locator)
+
+    def getSelectOptions(self, locator):
+        return self.cachedRead("get_select_options", locator)
+
+    def getSelectedLabel(self, locator):
+        return self.cachedRead("get_selected_label", locator)
+
+    def isOrdered(self, locator1, locator2):
+        return self.cachedRead("is_ordered", locator1, locator2)
+
+    def documentOrderOf(self, locators):
+        locators = [self.locatorFor(locator) for locator in locators]
+        if self.snapshot is None and self.supportsScripts():
+            return json.loads(self.seleniumInstance.get_eval(JavascriptHelper.GetDocumentOrderScript(locators)))
+        return self.snapshotOrPageSnapshot().documentOrderOf(locators)
+
+    def sortedOrderOf(self, locator, sortKey, descending=False):
+        locator = self.locatorFor(locator)
+        if self.snapshot is None and self.supportsScripts():
+            return json.loads(self.seleniumInstance.get_eval(JavascriptHelper.GetSortedOrderScript(locator, sortKey, descending)))
+        return self.snapshotOrPageSnapshot().sortedOrderOf(locator, sortKey, descending)
+
+    def tableRowsOf(self, locator, start=0, count=None):
+        locator = self.locatorFor(locator)
+        if self.snapshot is None and self.supportsScripts():
+            return json.loads(self.seleniumInstance.get_eval(JavascriptHelper.GetTableRowsScript(locator, start, count)))
+        return self.snapshotOrPageSnapshot().tableRowsOf(locator, start, count)
+
+    def streamedTableRows(self, locator, chunkSize, table):
+        start = 0
+        while table["rows"]:
+            for row in table["rows"]:
+                yield row
+            start += len(table["rows"])
+            if start >= table["total"]:
+                return
+            table = self.tableRowsOf(locator, start, chunkSize)
+            ensurePresenceOfLocator(table is not None, locator)
+
+    def tableDifferencesOf(self, locator, expectedRows, maxDifferences=10):
+        locator = self.locatorFor(locator)
+        if self.snapshot is None and self.supportsScripts():
+            return json.loads(self.seleniumInstance.get_eval(JavascriptHelper.GetTableDifferencesScript(locator, expectedRows, maxDifferences)))
+        return self.snapshotOrPageSnapshot().tableDifferencesOf(locator, expectedRows, maxDifferences)
+
+    def performsGuardedCommand(self, locator, command, *commandArgs):
+        locatorArguments = self.guardedCommandLocatorArguments[command]
+        commandArgs = tuple([self.locatorFor(argument) for argument in commandArgs[:locatorArguments]]) + commandArgs[locatorArguments:]
+        if not self.supportsScripts():
+            if not self.isElementPresent(locator):
+                return GuardedCommandResult.LOCATOR_MISSING
+            if command == "select" and commandArgs[1] not in self.getSelectOptions(locator):
+                return GuardedCommandResult.OPTION_MISSING
+            getattr(self.seleniumInstance, command)(*commandArgs)
+            return GuardedCommandResult.OK
+
+        script = JavascriptHelper.GetGuardedCommandScript(self.locatorFor(locator), command, commandArgs)
+        result = self.seleniumInstance.get_eval(script)
+        if result == "uninstalled":
+            self.seleniumInstance.get_eval(JavascriptHelper.GetGuardedCommandHelperScript())
+            result = self.seleniumInstance.get_eval(script)
+        return result
+
+    def selectOptionsOrNone(self, locator):
+        try:
+            return self.getSelectOptions(locator)
+        except Exception:
+            return None
+
+    def fillsForm(self, fields):
+        if self.supportsScripts():
+            requestedLocators = dict([(self.locatorFor(locator), locator) for locator, value in fields])
+            result = self.seleniumInstance.get_eval(JavascriptHelper.GetFormFillingScript([(self.locatorFor(locator), value) for locator, value in fields]))
+            if result == GuardedCommandResult.OK:
+                return []
+            problems = [problem.split(":", 1) for problem in result.split("\n")]
+            return [(problem, requestedLocators[locator]) for problem, locator in problems]
+
+        problems = []
+        commands = []
+        for locator, value in fields:
+            if not self.isElementPresent(locator):
+                problems.append((GuardedCommandResult.LOCATOR_MISSING, locator))
+            elif value is True or value is False:
+                commands.append(("check" if value else "uncheck", locator))
+            else:
+                options = self.selectOptionsOrNone(locator)
+                if options is None:
+                    commands.append(("type", locator, value))
+                elif value in options:
+                    commands.append(("select", locator, value))
+                else:
+                    problems.append((GuardedCommandResult.OPTION_MISSING, locator))
+        if not problems:
+            for command in commands:
+                getattr(self.seleniumInstance, command[0])(self.locatorFor(command[1]), *command[2:])
+        return problems
+
     def initialize(self):         
-        if not SharedSeleniumExecutionContext.isInitialized and self.seleniumInstance:
-            self.seleniumInstance.start()
-            SharedSeleniumExecutionContext.isInitialized = True
+        if self.sessionPool is not None:
+            if self.seleniumInstance is None:
+                self.seleniumInstance = self.instrumented(self.sessionPool.checkOut())
+                self.isInitialized = True
+                self.advancePageGeneration()
+                self.pageLoaded()
+            return
+        if not self.sharesSeleniumInstance:
+            if not self.isInitialized:
+                self.seleniumInstance.start()
+                self.isInitialized = True
+                self.advancePageGeneration()
+                self.pageLoaded()
+            return
+        if SharedSeleniumExecutionContext.isInitialized:
+            return
+        SharedSeleniumExecutionContext.sharedInstanceLock.acquire()
+        try:
+            if not SharedSeleniumExecutionContext.isInitialized and self.seleniumInstance:
+                self.seleniumInstance.start()
+                SharedSeleniumExecutionContext.isInitialized = True
+                self.pageLoaded()
+        finally:
+            SharedSeleniumExecutionContext.sharedInstanceLock.release()
             
     def destroy(self):
+        if self.sessionPool is not None:
+            if self.seleniumInstance is not None:
+                seleniumInstance = self.seleniumInstance
+                self.seleniumInstance = None
+                self.isInitialized = False
+                self.advancePageGeneration()
+                self.sessionPool.checkIn(self.uninstrumented(seleniumInstance))
+            return
+        if not self.sharesSeleniumInstance:
+            if self.isInitialized:
+                self.isInitialized = False
+                self.advancePageGeneration()
+                self.seleniumInstance.stop()
+            return
         if SharedSeleniumExecutionContext.isInitialized:
             SharedSeleniumExecutionContext.resetAll()
     
     def __del__(self):  
-        if self.isInitialized:
+        if not self.sharesSeleniumInstance:
+            self.destroy()
+        elif self.isInitialized:
             self.seleniumInstance.stop()
             
     @staticmethod
     def resetAll():
-        if SharedSeleniumExecutionContext.isInitialized and SharedSeleniumExecutionContext.seleniumInstance:
-            SharedSeleniumExecutionContext.seleniumInstance.stop()
+        try:
+            if SharedSeleniumExecutionContext.isInitialized and SharedSeleniumExecutionContext.seleniumInstance:
+                SharedSeleniumExecutionContext.seleniumInstance.stop()
+        finally:
+            SharedSeleniumExecutionContext.forgetSharedInstance()
 
+    @staticmethod
+    def forgetSharedInstance():
         SharedSeleniumExecutionContext.host =None
         SharedSeleniumExecutionContext.port =None
         SharedSeleniumExecutionContext.browserStartCommand =None
         SharedSeleniumExecutionContext.url = None
         SharedSeleniumExecutionContext.seleniumInstance=None
+        SharedSeleniumExecutionContext.backendName=None
         SharedSeleniumExecutionContext.isInitialized=False
\ No newline at end of file
@@ -0,0 +1,127 @@
+from LoquaciousSnake.SharedSeleniumExecutionContext import SharedSeleniumExecutionContext
+from LoquaciousSnake.helpers.Instrumentation import Instrumentation
+import threading
+import time
+import unittest
+
+
+class TestTimeAttribution:
+
+    def __init__(self, testId):
+        self.testId = testId
+        self.wallTime = 0.0
+        self.numberOfCommands = 0
+        self.commandTime = 0.0
+        self.waitingTime = 0.0
+
+    def pythonTime(self):
+        return max(0.0, self.wallTime - self.commandTime - self.waitingTime)
+
+    def wireTime(self, roundTripLatency):
+        return min(self.commandTime, self.numberOfCommands * roundTripLatency)
+
+    def browserTime(self, roundTripLatency):
+        return self.commandTime - self.wireTime(roundTripLatency)
+
+
+class TimeAttributionProfiler:
+
+    blockingCommands = ["wait_for_page_to_load", "wait_for_condition"]
+    nestedCommands = ["checksPresenceOfLocator", "checksAPreviouslyVisitedLocator", "checksAPreviouslySelectedOption"]
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.instrumentation = Instrumentation(clock)
+        self.instrumentation.addHook(self.records)
+        self.attributions = []
+        self.currentAttribution = None
+        self.currentTestStart = None
+        self.roundTripLatency = None
+
+    def start(self):
+        SharedSeleniumExecutionContext.defaultInstrumentation = self.instrumentation
+
+    def stop(self):
+        SharedSeleniumExecutionContext.defaultInstrumentation = None
+
+    def startTest(self, testId):
+        self.currentAttribution = TestTimeAttribution(testId)
+        self.currentTestStart = self.clock()
+
+    def stopTest(self):
+        if self.currentAttribution is None:
+            return
+        self.currentAttribution.wallTime = self.clock() - self.currentTestStart
+        self.attributions.append(self.currentAttribution)
+        self.currentAttribution = None
+
+    def records(self, command, locator, latency, step):
+        if command in self.nestedCommands:
+            return
+        self.lock.acquire()
+        try:
+            attribution = self.currentAttribution
+            if attribution is None:
+                return
+            if command in self.blockingCommands:
+                attribution.waitingTime += latency
+                return
+            attribution.numberOfCommands += 1
+            attribution.commandTime += latency
+            if self.roundTripLatency is None or latency < self.roundTripLatency:
+                self.roundTripLatency = latency
+        finally:
+            self.lock.release()
+
+    def worstOffenders(self, limit=None):
+        worst = sorted(self.attributions, key=lambda attribution: attribution.wallTime, reverse=True)
+        if limit is not None:
+            worst = worst[:limit]
+        return worst
+
+    def report(self, limit=None):
+        roundTripLatency = self.roundTripLatency or 0.0
+        lines = ["%-90s %9s %9s %9s %9s %9s" % ("test (ms)", "wall", "python", "wire", "browser", "waiting")]
+        for attribution in self.worstOffenders(limit):
+            lines.append("%-90s %9.1f %9.1f %9.1f %9.1f %9.1f" % (attribution.testId, attribution.wallTime * 1000, attribution.pythonTime() * 1000,
+                                                                 attribution.wireTime(roundTripLatency) * 1000, attribution.browserTime(roundTripLatency) * 1000,
+                                                                 attribution.waitingTime * 1000))
+        lines.append("wire time is estimated from the fastest command of the run: %.3f ms per round trip" % (roundTripLatency * 1000))
+        return "\n".join(lines) + "\n"
+
+    def writeReport(self, path):
+        reportFile = open(path, "w")
+        try:
+            reportFile.write(self.report())
+        finally:
+            reportFile.close()
+
+
+class ProfilingTestRunner(unittest.TextTestRunner):
+
+    def __init__(self, profiler, *args, **kwargs):
+        unittest.TextTestRunner.__init__(self, *args, **kwargs)
+        self.profiler = profiler
+
+    def _makeResult(self):
+        result = unittest.TextTestRunner._makeResult(self)
+        profiler = self.profiler
+        startTest = result.startTest
+        stopTest = result.stopTest
+        def startProfiledTest(test):
+            startTest(test)
+            profiler.startTest(test.id())
+        def stopProfiledTest(test):
+            profiler.stopTest()
+            stopTest(test)
+        result.startTest = startProfiledTest
+        result.stopTest = stopProfiledTest
+        return result
+
+    def run(self, test):
+        self.profiler.start()
+        try:
+            return unittest.TextTestRunner.run(self, test)
+        finally:
+            self.profiler.stop()
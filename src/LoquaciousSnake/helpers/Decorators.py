@@ -1,55 +1,137 @@
+from functools import wraps
+
 class LocatorNotFoundException(Exception):
     pass
 
 class OptionNotFoundException(Exception):
     pass 
 
+class GuardedCommandResult:
+    OK = "ok"
+    LOCATOR_MISSING = "missing"
+    OPTION_MISSING = "noOption"
+
+def ensurePresenceOfLocator(isPresent, locator):
+    if not isPresent:
+        raise LocatorNotFoundException(locator + " could not be found on the current page.")
+
+def ensureAPreviouslyVisitedLocator(location):
+    if location is None:
+        raise LocatorNotFoundException( "No item was selected for this action to be done upon.")
+
+def ensureAPreviouslySelectedOption(option):
+    if option is None:
+        raise OptionNotFoundException( "No option was selected for this action to be done upon.")
+
+def instrumentsCheck(check):
+    @wraps(check)
+    def performCheck(self, *args):
+        instrumentation = self.seleniumExecutionContext.instrumentation
+        if instrumentation is None:
+            return check(self, *args)
+        locator = None
+        if args:
+            locator = args[0]
+        return instrumentation.times(check.__name__, locator, check, self, *args)
+    return performCheck
+
+@instrumentsCheck
+def checksPresenceOfLocator(self, locator):
+    ensurePresenceOfLocator(self.seleniumExecutionContext.isElementPresent(locator), locator)
+
+@instrumentsCheck
+def checksAPreviouslyVisitedLocator(self):
+    ensureAPreviouslyVisitedLocator(self.chainState.lastVisitedLocation)
+
+@instrumentsCheck
+def checksAPreviouslySelectedOption(self):
+    ensureAPreviouslySelectedOption(self.chainState.optionBeingHandled)
+
 def chainable(functionToExecute):
+    @wraps(functionToExecute)
     def chain(*args,**kwargs):
         self = args[0]
-        functionToExecute(*args,**kwargs)
+        self.seleniumExecutionContext.initialize()
+        self.seleniumExecutionContext.startsStep()
+        instrumentation = self.seleniumExecutionContext.instrumentation
+        if instrumentation is None:
+            functionToExecute(*args,**kwargs)
+        else:
+            instrumentation.performsStep(functionToExecute.__name__, functionToExecute, *args, **kwargs)
         return self.chainingElement
+    chain.isChainable = True
     return chain
 
 def requiresPresenceOfLocator(functionToExecute):
+    @wraps(functionToExecute)
     def validatePriorToExecution(*args,**kwargs):
         self = args[0]
-        locator = args[1]
-        if not self.getSeleniumInstance().is_element_present(locator):
-            raise LocatorNotFoundException(locator + " could not be found on the current page.")
+        checksPresenceOfLocator(self, args[1])
         return functionToExecute(*args,**kwargs)
         
     return validatePriorToExecution
     
+def fusesPresenceOfLocator(functionToExecute):
+    @wraps(functionToExecute)
+    def validateWhileExecuting(*args,**kwargs):
+        locator = args[1]
+        result = functionToExecute(*args,**kwargs)
+        ensurePresenceOfLocator(result != GuardedCommandResult.LOCATOR_MISSING, locator)
+        return result
+    return validateWhileExecuting
+
+def autoWaitsFor(command, expectedRead):
+    def decorate(functionToExecute):
+        @wraps(functionToExecute)
+        def waitPriorToExecution(*args,**kwargs):
+            self = args[0]
+            locator, expectedResult = expectedRead(self.chainState, *args[1:])
+            self.seleniumExecutionContext.waitsForRead(command, locator, expectedResult)
+            return functionToExecute(*args,**kwargs)
+        return waitPriorToExecution
+    return decorate
+
+def mutatesPage(functionToExecute):
+    @wraps(functionToExecute)
+    def decorateFunctionWithPageGenerationAdvance(*args,**kwargs):
+        self = args[0]
+        try:
+            return functionToExecute(*args,**kwargs)
+        finally:
+            self.seleniumExecutionContext.advancePageGeneration()
+    return decorateFunctionWithPageGenerationAdvance
+
 def requiresAPreviouslyVisitedLocator(functionToExecute):
+    @wraps(functionToExecute)
     def validatePriorToExecution(*args,**kwargs):
         self = args[0]
-        if self.seleniumExecutionContext.lastVisitedLocation is None:
-            raise LocatorNotFoundException( "No item was selected for this action to be done upon.")
+        checksAPreviouslyVisitedLocator(self)
         return functionToExecute(*args,**kwargs)
     return validatePriorToExecution
 
 def requiresAPreviouslySelectedOption(functionToExecute):
+    @wraps(functionToExecute)
     def validatePriorToExecution(*args,**kwargs):
         self = args[0]
-        if self.seleniumExecutionContext.optionBeingHandled is None:
-            raise OptionNotFoundException( "No option was selected for this action to be done upon.")
+        checksAPreviouslySelectedOption(self)
         return functionToExecute(*args,**kwargs)
     return validatePriorToExecution
 
 
 def resetsOptionBeingHandled(functionToExecute):
+    @wraps(functionToExecute)
     def decorateFunctionWithOptionReset(*args,**kwargs):
         self = args[0]       
         returnValueFromFunctionToExecute = functionToExecute(*args,**kwargs)
-        self.seleniumExecutionContext.setOptionBeingHandled(None)
+        self.chainState.optionBeingHandled = None
         return returnValueFromFunctionToExecute
     return decorateFunctionWithOptionReset
 
 def resetsLastVisitedLocator(functionToExecute):
+    @wraps(functionToExecute)
     def decorateFunctionWithLocatorReset(*args,**kwargs):
         self = args[0]       
         returnValueFromFunctionToExecute = functionToExecute(*args,**kwargs)
-        self.seleniumExecutionContext.setLastVisitedLocation(None)
+        self.chainState.lastVisitedLocation = None
         return returnValueFromFunctionToExecute
     return decorateFunctionWithLocatorReset   
\ No newline at end of file
@@ -0,0 +1,163 @@
+import re
+
+try:
+    from HTMLParser import HTMLParser
+except ImportError:
+    from html.parser import HTMLParser
+
+try:
+    from cgi import escape as escapeHtml
+except ImportError:
+    from html import escape as escapeHtml
+
+try:
+    from html import unescape as unescapeHtml
+except ImportError:
+    unescapeHtml = HTMLParser().unescape
+
+
+whitespace = re.compile(r"\s+")
+
+def normalizeSpace(text):
+    return whitespace.sub(" ", text).strip()
+
+
+class HtmlElement(object):
+
+    voidElements = ["area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source", "wbr"]
+
+    def __init__(self, tag, attributes=None, parent=None):
+        self.tag = tag
+        self.attributes = dict(attributes or {})
+        self.parent = parent
+        self.children = []
+
+    def elementChildren(self):
+        return [child for child in self.children if isinstance(child, HtmlElement)]
+
+    def descendants(self):
+        for child in self.elementChildren():
+            yield child
+            for descendant in child.descendants():
+                yield descendant
+
+    def getAttribute(self, name, default=None):
+        return self.attributes.get(name, default)
+
+    def hasAttribute(self, name):
+        return name in self.attributes
+
+    def classes(self):
+        return self.attributes.get("class", "").split()
+
+    def textContent(self):
+        texts = []
+        for child in self.children:
+            if isinstance(child, HtmlElement):
+                if child.tag not in ("script", "style"):
+                    texts.append(child.textContent())
+            else:
+                texts.append(child)
+        return "".join(texts)
+
+    def text(self):
+        return normalizeSpace(self.textContent())
+
+    def previousElementSiblings(self):
+        if self.parent is None:
+            return []
+        siblings = self.parent.elementChildren()
+        return siblings[:siblings.index(self)]
+
+    def toHtml(self):
+        if self.tag == "#document":
+            return "".join([child.toHtml() for child in self.elementChildren()])
+        html = "<" + self.tag
+        for name in sorted(self.attributes):
+            if self.attributes[name] is None:
+                html += " " + name
+            else:
+                html += " " + name + "=\"" + escapeHtml(self.attributes[name], True) + "\""
+        html += ">"
+        if self.tag in self.voidElements:
+            return html
+        for child in self.children:
+            if isinstance(child, HtmlElement):
+                html += child.toHtml()
+            elif self.tag in ("script", "style"):
+                html += child
+            else:
+                html += escapeHtml(child, False)
+        return html + "</" + self.tag + ">"
+
+    def __repr__(self):
+        return "<" + self.tag + " " + repr(self.attributes) + ">"
+
+
+class HtmlDocumentParser(HTMLParser):
+
+    impliedEndTags = {"li": ["li"], "option": ["option"], "p": ["p"], "tr": ["tr", "td", "th"], "td": ["td", "th"], "th": ["td", "th"]}
+
+    def __init__(self):
+        HTMLParser.__init__(self)
+        self.document = HtmlElement("#document")
+        self.openElements = [self.document]
+
+    def currentElement(self):
+        return self.openElements[-1]
+
+    def handle_starttag(self, tag, attrs):
+        for impliedEndTag in self.impliedEndTags.get(tag, []):
+            if self.currentElement().tag == impliedEndTag:
+                self.openElements.pop()
+        element = HtmlElement(tag, attrs, self.currentElement())
+        self.currentElement().children.append(element)
+        if tag not in HtmlElement.voidElements:
+            self.openElements.append(element)
+
+    def handle_startendtag(self, tag, attrs):
+        element = HtmlElement(tag, attrs, self.currentElement())
+        self.currentElement().children.append(element)
+
+    def handle_endtag(self, tag):
+        for index in range(len(self.openElements) - 1, 0, -1):
+            if self.openElements[index].tag == tag:
+                del self.openElements[index:]
+                return
+
+    def handle_data(self, data):
+        self.currentElement().children.append(data)
+
+    def handle_entityref(self, name):
+        self.handle_data(unescapeHtml("&" + name + ";"))
+
+    def handle_charref(self, name):
+        self.handle_data(unescapeHtml("&#" + name + ";"))
+
+
+class HtmlDocument(object):
+
+    def __init__(self, root):
+        self.root = root
+
+    @staticmethod
+    def parse(source):
+        parser = HtmlDocumentParser()
+        parser.feed(source)
+        parser.close()
+        return HtmlDocument(parser.document)
+
+    def elements(self):
+        return self.root.descendants()
+
+    def elementsByTag(self, tag):
+        return [element for element in self.elements() if element.tag == tag]
+
+    def title(self):
+        titles = self.elementsByTag("title")
+        if not titles:
+            return ""
+        return titles[0].text()
+
+    def toHtml(self):
+        return self.root.toHtml()
@@ -0,0 +1,126 @@
+import math
+import threading
+import time
+
+
+class LatencyHistogram(object):
+
+    smallestLatency = 0.000001
+    bucketRatio = 1.05
+    logOfBucketRatio = math.log(bucketRatio)
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def record(self, latency):
+        if latency <= self.smallestLatency:
+            bucket = 0
+        else:
+            bucket = int(math.log(latency / self.smallestLatency) / self.logOfBucketRatio) + 1
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += latency
+        self.maximum = max(self.maximum, latency)
+
+    def percentile(self, percent):
+        if self.count == 0:
+            return None
+        rank = max(1, int(math.ceil(percent / 100.0 * self.count)))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(self.smallestLatency * self.bucketRatio ** bucket, self.maximum)
+
+    def mean(self):
+        if self.count == 0:
+            return None
+        return self.total / self.count
+
+
+def histogramFor(histograms, name):
+    if name not in histograms:
+        histograms[name] = LatencyHistogram()
+    return histograms[name]
+
+
+class Instrumentation(object):
+
+    reportedPercentiles = (50, 95, 99)
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.steps = threading.local()
+        self.hooks = []
+        self.byCommand = {}
+        self.byLocator = {}
+        self.byStep = {}
+
+    def addHook(self, hook):
+        self.hooks.append(hook)
+
+    def removeHook(self, hook):
+        self.hooks.remove(hook)
+
+    def currentStep(self):
+        return getattr(self.steps, "name", None)
+
+    def performsStep(self, name, step, *args, **kwargs):
+        previousStep = self.currentStep()
+        self.steps.name = name
+        try:
+            return step(*args, **kwargs)
+        finally:
+            self.steps.name = previousStep
+
+    def times(self, command, locator, operation, *args):
+        start = self.clock()
+        try:
+            return operation(*args)
+        finally:
+            self.record(command, locator, self.clock() - start)
+
+    def record(self, command, locator, latency):
+        step = self.currentStep()
+        self.lock.acquire()
+        try:
+            histogramFor(self.byCommand, command).record(latency)
+            if locator is not None:
+                histogramFor(self.byLocator, locator).record(latency)
+            if step is not None:
+                histogramFor(self.byStep, step).record(latency)
+        finally:
+            self.lock.release()
+        for hook in self.hooks:
+            hook(command, locator, latency, step)
+
+    def percentiles(self, histograms):
+        self.lock.acquire()
+        try:
+            return dict([(name, tuple([histogram.percentile(percent) for percent in self.reportedPercentiles]))
+                         for name, histogram in histograms.items()])
+        finally:
+            self.lock.release()
+
+    def commandPercentiles(self):
+        return self.percentiles(self.byCommand)
+
+    def locatorPercentiles(self):
+        return self.percentiles(self.byLocator)
+
+    def stepPercentiles(self):
+        return self.percentiles(self.byStep)
+
+    def report(self):
+        lines = []
+        for title, histograms in (("command", self.byCommand), ("locator", self.byLocator), ("step", self.byStep)):
+            lines.append("%-50s %8s %10s %10s %10s" % (title, "count", "p50 ms", "p95 ms", "p99 ms"))
+            percentiles = self.percentiles(histograms)
+            for name in sorted(histograms):
+                lines.append("%-50s %8d %10.3f %10.3f %10.3f" % ((name, histograms[name].count) + tuple([latency * 1000 for latency in percentiles[name]])))
+            lines.append("")
+        return "\n".join(lines)
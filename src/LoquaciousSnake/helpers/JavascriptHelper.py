@@ -1,4 +1,14 @@
+from LoquaciousSnake.helpers.SortKeys import numberPattern, numberIgnoredCharacters, datePatterns, monthNames
+import json
+
+
 class JavascriptHelper:
+
+    ReadAccessors = {"is_element_present": "isElementPresent", "get_text": "getText", "get_value": "getValue",
+                     "is_checked": "isChecked", "get_selected_label": "getSelectedLabel"}
+
+    GuardedCoreCommands = {"click": "doClick", "check": "doCheck", "uncheck": "doUncheck",
+                           "select": "doSelect", "drag_and_drop": "doDragAndDrop"}
     
     @staticmethod
     def GetjQueryWaitForAjaxCondition():
@@ -7,3 +17,200 @@ class JavascriptHelper:
     @staticmethod
     def GetPrototypeWaitForAjaxCondition():
         return "selenium.browserbot.getCurrentWindow().Ajax.activeRequestCount == 0"
+
+    @staticmethod
+    def GetNetworkTrackerFunction():
+        return "function(w) { if (w.loquaciousNetwork) { return w.loquaciousNetwork; }" \
+             + " var network = { active: 0, lastActivity: new Date().getTime() }; w.loquaciousNetwork = network;" \
+             + " var touch = function() { network.lastActivity = new Date().getTime(); };" \
+             + " var starts = function() { network.active++; touch(); };" \
+             + " var ends = function() { network.active = Math.max(0, network.active - 1); touch(); };" \
+             + " if (w.XMLHttpRequest) { var send = w.XMLHttpRequest.prototype.send;" \
+             + " w.XMLHttpRequest.prototype.send = function() { var request = this; var done = false; starts();" \
+             + " var finish = function() { if (!done && request.readyState == 4) { done = true; ends(); } };" \
+             + " if (request.addEventListener) { request.addEventListener('readystatechange', finish, false); request.addEventListener('loadend', finish, false); }" \
+             + " try { return send.apply(request, arguments); } catch (e) { if (!done) { done = true; ends(); } throw e; } }; }" \
+             + " if (w.fetch) { var fetch = w.fetch;" \
+             + " w.fetch = function() { starts(); try { return fetch.apply(this, arguments).then(function(response) { ends(); return response; }, function(error) { ends(); throw error; }); }" \
+             + " catch (e) { ends(); throw e; } }; }" \
+             + " if (w.WebSocket) { var WebSocket = w.WebSocket; var socketSend = WebSocket.prototype.send;" \
+             + " WebSocket.prototype.send = function() { touch(); return socketSend.apply(this, arguments); };" \
+             + " w.WebSocket = function(url, protocols) { var socket = protocols === undefined ? new WebSocket(url) : new WebSocket(url, protocols);" \
+             + " socket.addEventListener('message', touch, false); return socket; };" \
+             + " w.WebSocket.prototype = WebSocket.prototype; w.WebSocket.CONNECTING = 0; w.WebSocket.OPEN = 1; w.WebSocket.CLOSING = 2; w.WebSocket.CLOSED = 3; }" \
+             + " return network; }"
+
+    @staticmethod
+    def GetNetworkTrackerScript():
+        return "(function() { var bot = selenium.browserbot; var track = " + JavascriptHelper.GetNetworkTrackerFunction() + ";" \
+             + " if (!bot.loquaciousTracksNetwork) { var modifyWindow = bot._modifyWindow;" \
+             + " bot._modifyWindow = function(win) { var result = modifyWindow.apply(this, arguments); try { track(win); } catch (e) { } return result; };" \
+             + " bot.loquaciousTracksNetwork = true; }" \
+             + " return track(bot.getCurrentWindow()); })()"
+
+    @staticmethod
+    def GetNetworkIdleCondition(idleTime):
+        return "(function() { var network = " + JavascriptHelper.GetNetworkTrackerScript() + ";" \
+             + " return network.active == 0 && new Date().getTime() - network.lastActivity >= " + str(int(idleTime)) + "; })()"
+
+    @staticmethod
+    def ToJavascriptString(value):
+        return json.dumps(value)
+
+    @staticmethod
+    def GetReadConditionScript(command, locator, expectedResult):
+        locator = JavascriptHelper.ToJavascriptString(locator)
+        expectedResult = JavascriptHelper.ToJavascriptString(expectedResult)
+        condition = "selenium.isElementPresent(" + locator + ")"
+        if command == "is_element_present":
+            condition += " == " + expectedResult
+        else:
+            condition += " && selenium." + JavascriptHelper.ReadAccessors[command] + "(" + locator + ") == " + expectedResult
+        return "(function() { try { return " + condition + "; } catch (e) { return false; } })()"
+
+    @staticmethod
+    def GetIsDisabledScript(locator):
+        return "(function() { try { var e = selenium.browserbot.findElement(" + JavascriptHelper.ToJavascriptString(locator) + ");" \
+             + " return e.disabled === true || e.getAttribute('aria-disabled') == 'true' || (' ' + e.className + ' ').indexOf(' disabled ') >= 0; }" \
+             + " catch (e) { return false; } })()"
+
+    @staticmethod
+    def GetCompiledChainScript(fragments):
+        body = "".join(["step = " + str(index) + "; " + fragment + " " for index, fragment in enumerate(fragments)])
+        return "(function() { var s = selenium; var step = 0; try { " + body + "} catch (e) { return 'fail:' + step; } return 'ok'; })()"
+
+    @staticmethod
+    def GetCompiledChainFailure():
+        return "return 'fail:' + step;"
+
+    @staticmethod
+    def GetDomMutationCounterScript():
+        return "(function() { var w = selenium.browserbot.getCurrentWindow(); var d = w.document;" \
+             + " if (!w.loquaciousDomMutations) {" \
+             + " var counter = { page: new Date().getTime() + '-' + Math.random(), count: 0 };" \
+             + " var increment = function() { counter.count++; };" \
+             + " if (w.MutationObserver) { new w.MutationObserver(increment).observe(d, { childList: true, subtree: true, attributes: true, characterData: true }); }" \
+             + " else if (d.addEventListener) { d.addEventListener('DOMSubtreeModified', increment, false); }" \
+             + " if (d.addEventListener) { d.addEventListener('change', increment, true); d.addEventListener('input', increment, true); }" \
+             + " w.loquaciousDomMutations = counter; }" \
+             + " return w.loquaciousDomMutations.page + ':' + w.loquaciousDomMutations.count; })()"
+
+    @staticmethod
+    def GetGuardedCommandScript(locator, command, commandArgs):
+        call = "selenium.loquaciousGuarded(" + JavascriptHelper.ToJavascriptString(locator) + ", " \
+             + JavascriptHelper.ToJavascriptString(JavascriptHelper.GuardedCoreCommands[command]) + ", " \
+             + JavascriptHelper.ToJavascriptString(list(commandArgs)) + ")"
+        return "typeof selenium.loquaciousGuarded == 'function' ? " + call + " : 'uninstalled'"
+
+    @staticmethod
+    def GetGuardedCommandHelperScript():
+        return "selenium.loquaciousGuarded = function(locator, command, commandArgs) {" \
+             + " if (!this.isElementPresent(locator)) { return 'missing'; }" \
+             + " if (command == 'doSelect') { var options = this.getSelectOptions(locator); var found = false;" \
+             + " for (var i = 0; i < options.length; i++) { if (options[i] == commandArgs[1]) { found = true; } }" \
+             + " if (!found) { return 'noOption'; } }" \
+             + " this[command].apply(this, commandArgs); return 'ok'; }; 'installed'"
+
+    @staticmethod
+    def GetFormFillingScript(fields):
+        return "(function() { var s = selenium; var fields = " + JavascriptHelper.ToJavascriptString([list(field) for field in fields]) + ";" \
+             + " var elements = []; var problems = [];" \
+             + " for (var i = 0; i < fields.length; i++) { var element = s.browserbot.findElementOrNull(fields[i][0]); elements.push(element);" \
+             + " if (element == null) { problems.push('missing:' + fields[i][0]); }" \
+             + " else if (typeof fields[i][1] != 'boolean' && element.tagName.toLowerCase() == 'select') {" \
+             + " var options = s.getSelectOptions(fields[i][0]); var found = false;" \
+             + " for (var j = 0; j < options.length; j++) { if (options[j] == fields[i][1]) { found = true; } }" \
+             + " if (!found) { problems.push('noOption:' + fields[i][0]); } } }" \
+             + " if (problems.length > 0) { return problems.join('\\n'); }" \
+             + " for (var i = 0; i < fields.length; i++) { var locator = fields[i][0]; var value = fields[i][1]; var element = elements[i];" \
+             + " if (value === true) { s.doCheck(locator); }" \
+             + " else if (value === false) { s.doUncheck(locator); }" \
+             + " else if (element.tagName.toLowerCase() == 'select') { s.doSelect(locator, value); }" \
+             + " else { s.doType(locator, value); var d = element.ownerDocument;" \
+             + " if (d.createEvent) { var e = d.createEvent('HTMLEvents'); e.initEvent('input', true, false); element.dispatchEvent(e); } } }" \
+             + " return 'ok'; })()"
+
+    @staticmethod
+    def GetPresenceOfLocatorsScript(locators):
+        return "(function() { var s = selenium; var locators = " + JavascriptHelper.ToJavascriptString(list(locators)) + ";" \
+             + " var presence = ''; for (var i = 0; i < locators.length; i++) { presence += s.isElementPresent(locators[i]) ? '1' : '0'; }" \
+             + " return presence; })()"
+
+    @staticmethod
+    def GetDocumentOrderScript(locators):
+        return "(function() { var s = selenium; var locators = " + JavascriptHelper.ToJavascriptString(list(locators)) + ";" \
+             + " var elements = []; for (var i = 0; i < locators.length; i++) { elements.push(s.browserbot.findElementOrNull(locators[i]));" \
+             + " if (elements[i] == null) { return JSON.stringify(['missing', i]); } }" \
+             + " for (var i = 1; i < elements.length; i++) { if (!(elements[i - 1].compareDocumentPosition(elements[i]) & 4)) { return JSON.stringify(['unordered', i]); } }" \
+             + " return JSON.stringify(['ok']); })()"
+
+    @staticmethod
+    def GetSortKeysObject():
+        js = JavascriptHelper.ToJavascriptString
+        return "{ text: function(text) { return text; }," \
+             + " number: function(text) { var match = new RegExp(" + js(numberPattern) + ").exec(text.replace(new RegExp(" + js(numberIgnoredCharacters) + ", 'g'), ''));" \
+             + " return match == null ? NaN : parseFloat(match[1]); }," \
+             + " date: function(text) { var patterns = " + js(datePatterns) + "; var months = " + js(monthNames) + ";" \
+             + " for (var i = 0; i < patterns.length; i++) { var match = new RegExp(patterns[i][0]).exec(text); if (match == null) { continue; }" \
+             + " var date = { y: 0, m: 0, d: 0, H: 0, M: 0, S: 0 };" \
+             + " for (var j = 0; j < patterns[i][1].length; j++) { var field = patterns[i][1].charAt(j); var value = match[j + 1]; if (!value) { continue; }" \
+             + " if (field == 'b') { var month = months.indexOf(value.substring(0, 3).toLowerCase()); if (month < 0) { return NaN; } date.m = month + 1; }" \
+             + " else { date[field] = parseInt(value, 10); } }" \
+             + " if (date.m < 1 || date.m > 12 || date.d < 1 || date.d > 31 || date.H > 23 || date.M > 59 || date.S > 59) { return NaN; }" \
+             + " return ((((date.y * 100 + date.m) * 100 + date.d) * 100 + date.H) * 100 + date.M) * 100 + date.S; }" \
+             + " return NaN; } }"
+
+    @staticmethod
+    def GetSortedOrderScript(locator, sortKey, descending):
+        return "(function() { var s = selenium; var d = s.browserbot.getCurrentWindow().document; var locator = " + JavascriptHelper.ToJavascriptString(locator) + ";" \
+             + " var elements = [];" \
+             + " if (locator.indexOf('css=') == 0) { var found = d.querySelectorAll(locator.substring(4)); for (var i = 0; i < found.length; i++) { elements.push(found[i]); } }" \
+             + " else if (locator.indexOf('xpath=') == 0 || locator.indexOf('/') == 0) { var found = d.evaluate(locator.indexOf('xpath=') == 0 ? locator.substring(6) : locator, d, null, 7, null);" \
+             + " for (var i = 0; i < found.snapshotLength; i++) { elements.push(found.snapshotItem(i)); } }" \
+             + " else { var element = s.browserbot.findElementOrNull(locator); if (element != null) { elements.push(element); } }" \
+             + " if (elements.length == 0) { return JSON.stringify(['missing', 0]); }" \
+             + " var keyOf = " + JavascriptHelper.GetSortKeysObject() + "[" + JavascriptHelper.ToJavascriptString(sortKey) + "];" \
+             + " var texts = []; var keys = [];" \
+             + " for (var i = 0; i < elements.length; i++) { texts.push((elements[i].textContent || elements[i].innerText || '').replace(/\\s+/g, ' ').replace(/^ | $/g, ''));" \
+             + " keys.push(keyOf(texts[i])); if (typeof keys[i] == 'number' && isNaN(keys[i])) { return JSON.stringify(['unparsable', i, texts[i]]); } }" \
+             + " for (var i = 1; i < keys.length; i++) { if (" + ("keys[i - 1] < keys[i]" if descending else "keys[i - 1] > keys[i]") + ") {" \
+             + " return JSON.stringify(['unsorted', i, texts[i - 1], texts[i]]); } }" \
+             + " return JSON.stringify(['ok']); })()"
+
+    @staticmethod
+    def GetTableRowsFunction():
+        return "function(element) { var text = function(node) { return (node.textContent || node.innerText || '').replace(/\\s+/g, ' ').replace(/^ | $/g, ''); };" \
+             + " var tag = element.tagName.toLowerCase();" \
+             + " var items = tag == 'table' ? element.rows : (tag == 'select' ? element.options : element.children);" \
+             + " return { length: items.length, row: function(i) { var item = items[i]; var cells = [];" \
+             + " var parts = tag == 'table' ? item.cells : (tag == 'ul' || tag == 'ol' || tag == 'select' || item.children.length == 0 ? [item] : item.children);" \
+             + " for (var j = 0; j < parts.length; j++) { cells.push(text(parts[j])); } return cells; } }; }"
+
+    @staticmethod
+    def GetTableRowsScript(locator, start, count):
+        return "(function() { var element = selenium.browserbot.findElementOrNull(" + JavascriptHelper.ToJavascriptString(locator) + ");" \
+             + " if (element == null) { return JSON.stringify(null); } var table = (" + JavascriptHelper.GetTableRowsFunction() + ")(element);" \
+             + " var end = " + ("table.length" if count is None else "Math.min(table.length, " + str(int(start + count)) + ")") + "; var rows = [];" \
+             + " for (var i = " + str(int(start)) + "; i < end; i++) { rows.push(table.row(i)); }" \
+             + " return JSON.stringify({ total: table.length, rows: rows }); })()"
+
+    @staticmethod
+    def GetTableDifferencesScript(locator, expectedRows, maxDifferences):
+        return "(function() { var element = selenium.browserbot.findElementOrNull(" + JavascriptHelper.ToJavascriptString(locator) + ");" \
+             + " if (element == null) { return JSON.stringify(null); } var table = (" + JavascriptHelper.GetTableRowsFunction() + ")(element);" \
+             + " var expected = " + JavascriptHelper.ToJavascriptString([list(row) for row in expectedRows]) + "; var differences = []; var count = 0;" \
+             + " for (var i = 0; i < Math.min(table.length, expected.length); i++) { var row = table.row(i);" \
+             + " for (var j = 0; j < Math.max(row.length, expected[i].length); j++) { var actual = j < row.length ? row[j] : null;" \
+             + " if (j >= expected[i].length || actual !== expected[i][j]) { count++; if (differences.length < " + str(int(maxDifferences)) + ") { differences.push([i, j, actual]); } } } }" \
+             + " return JSON.stringify({ total: table.length, count: count, differences: differences }); })()"
+
+    @staticmethod
+    def GetSnapshotScript():
+        return "(function() { var d = selenium.browserbot.getCurrentWindow().document; var copy = d.documentElement.cloneNode(true);" \
+             + " var from = d.documentElement.getElementsByTagName('*'); var to = copy.getElementsByTagName('*');" \
+             + " for (var i = 0; i < from.length; i++) { var tag = from[i].tagName.toLowerCase(); var type = (from[i].type || '').toLowerCase();" \
+             + " if (tag == 'input' && (type == 'checkbox' || type == 'radio')) { if (from[i].checked) { to[i].setAttribute('checked', 'checked'); } else { to[i].removeAttribute('checked'); } }" \
+             + " else if (tag == 'input') { to[i].setAttribute('value', from[i].value); }" \
+             + " else if (tag == 'textarea') { while (to[i].firstChild) { to[i].removeChild(to[i].firstChild); } to[i].appendChild(d.createTextNode(from[i].value)); }" \
+             + " else if (tag == 'option') { if (from[i].selected) { to[i].setAttribute('selected', 'selected'); } else { to[i].removeAttribute('selected'); } } }" \
+             + " var wrapper = d.createElement('div'); wrapper.appendChild(copy); return wrapper.innerHTML; })()"
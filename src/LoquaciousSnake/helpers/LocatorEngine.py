@@ -0,0 +1,338 @@
+from LoquaciousSnake.helpers.HtmlDocument import normalizeSpace
+import re
+
+
+class LocatorSyntaxException(Exception):
+    pass
+
+
+def globToRegularExpression(pattern):
+    return re.compile("^" + re.escape(pattern).replace("\\*", ".*").replace("\\?", ".") + "$", re.DOTALL)
+
+
+def splitOutsideOfBrackets(text, separators):
+    parts = []
+    current = ""
+    depth = 0
+    quote = None
+    index = 0
+    while index < len(text):
+        letter = text[index]
+        if quote is not None:
+            if letter == quote:
+                quote = None
+            current += letter
+        elif letter in "'\"":
+            quote = letter
+            current += letter
+        elif letter in "[(":
+            depth += 1
+            current += letter
+        elif letter in "])":
+            depth -= 1
+            current += letter
+        elif depth == 0 and text.startswith(separators, index):
+            separator = [candidate for candidate in separators if text.startswith(candidate, index)][0]
+            parts.append(current)
+            parts.append(separator)
+            current = ""
+            index += len(separator)
+            continue
+        else:
+            current += letter
+        index += 1
+    if quote is not None or depth != 0:
+        raise LocatorSyntaxException("Unbalanced brackets or quotes in " + text)
+    parts.append(current)
+    return parts
+
+
+def bracketedGroups(text):
+    groups = []
+    current = ""
+    depth = 0
+    quote = None
+    for letter in text:
+        if quote is not None:
+            if letter == quote:
+                quote = None
+        elif letter in "'\"":
+            quote = letter
+        elif letter == "[":
+            depth += 1
+            if depth == 1:
+                continue
+        elif letter == "]":
+            depth -= 1
+            if depth == 0:
+                groups.append(current)
+                current = ""
+                continue
+        elif depth == 0 and not letter.isspace():
+            raise LocatorSyntaxException("Unexpected " + letter + " outside of predicates in " + text)
+        if depth > 0:
+            current += letter
+    if quote is not None or depth != 0:
+        raise LocatorSyntaxException("Unbalanced brackets or quotes in " + text)
+    return groups
+
+
+class XPathStep(object):
+
+    def __init__(self, axis, nameTest, predicates):
+        self.axis = axis
+        self.nameTest = nameTest
+        self.predicates = predicates
+
+
+class XPath(object):
+
+    stepPattern = re.compile(r"^\s*([A-Za-z_][\w.-]*|\*)\s*((?:\[.*\])*)\s*$", re.DOTALL)
+    literal = r"""(?:'([^']*)'|"([^"]*)")"""
+    operand = r"(@[\w:.-]+|text\(\)|\.|normalize-space\(\s*\.?\s*\))"
+    comparisonPattern = re.compile(r"^\s*" + operand + r"\s*(!?=)\s*" + literal + r"\s*$", re.DOTALL)
+    functionPattern = re.compile(r"^\s*(contains|starts-with)\(\s*" + operand + r"\s*,\s*" + literal + r"\s*\)\s*$", re.DOTALL)
+    attributePattern = re.compile(r"^\s*@([\w:.-]+)\s*$")
+    positionPattern = re.compile(r"^\s*(\d+|last\(\))\s*$")
+    notPattern = re.compile(r"^\s*not\((.*)\)\s*$", re.DOTALL)
+
+    def __init__(self, expression):
+        self.expression = expression
+        self.steps = self.parse(expression)
+
+    def parse(self, expression):
+        expression = expression.strip()
+        if not expression.startswith("/"):
+            raise LocatorSyntaxException("Only absolute XPath expressions are supported: " + expression)
+        parts = splitOutsideOfBrackets(expression, ("//", "/"))
+        steps = []
+        for index in range(1, len(parts), 2):
+            axis = "descendant" if parts[index] == "//" else "child"
+            steps.append(self.parseStep(axis, parts[index + 1]))
+        return steps
+
+    def parseStep(self, axis, step):
+        match = self.stepPattern.match(step)
+        if match is None:
+            raise LocatorSyntaxException("Unsupported XPath step: " + step)
+        predicates = [self.parsePredicate(predicate) for predicate in bracketedGroups(match.group(2))]
+        return XPathStep(axis, match.group(1).lower(), predicates)
+
+    def parsePredicate(self, predicate):
+        alternatives = splitOutsideOfBrackets(predicate, (" or ",))
+        if len(alternatives) > 1:
+            conditions = [self.parsePredicate(alternative) for alternative in alternatives[::2]]
+            return lambda element, position, size: any([condition(element, position, size) for condition in conditions])
+        terms = splitOutsideOfBrackets(predicate, (" and ",))
+        if len(terms) > 1:
+            conditions = [self.parsePredicate(term) for term in terms[::2]]
+            return lambda element, position, size: all([condition(element, position, size) for condition in conditions])
+        return self.parseCondition(predicate)
+
+    def parseCondition(self, condition):
+        match = self.positionPattern.match(condition)
+        if match is not None:
+            if match.group(1) == "last()":
+                return lambda element, position, size: position == size
+            expectedPosition = int(match.group(1))
+            return lambda element, position, size: position == expectedPosition
+
+        match = self.notPattern.match(condition)
+        if match is not None:
+            negated = self.parsePredicate(match.group(1))
+            return lambda element, position, size: not negated(element, position, size)
+
+        match = self.attributePattern.match(condition)
+        if match is not None:
+            name = match.group(1)
+            return lambda element, position, size: element.hasAttribute(name)
+
+        match = self.comparisonPattern.match(condition)
+        if match is not None:
+            valueOf = self.operandReader(match.group(1))
+            expected = self.literalOf(match, 3)
+            if match.group(2) == "=":
+                return lambda element, position, size: valueOf(element) == expected
+            return lambda element, position, size: valueOf(element) is not None and valueOf(element) != expected
+
+        match = self.functionPattern.match(condition)
+        if match is not None:
+            valueOf = self.operandReader(match.group(2))
+            expected = self.literalOf(match, 3)
+            if match.group(1) == "contains":
+                return lambda element, position, size: valueOf(element) is not None and expected in valueOf(element)
+            return lambda element, position, size: valueOf(element) is not None and valueOf(element).startswith(expected)
+
+        raise LocatorSyntaxException("Unsupported XPath predicate: " + condition)
+
+    def operandReader(self, operand):
+        if operand.startswith("@"):
+            name = operand[1:]
+            return lambda element: element.getAttribute(name)
+        if operand.startswith("normalize-space"):
+            return lambda element: normalizeSpace(element.textContent())
+        if operand == "text()":
+            return lambda element: "".join([child for child in element.children if not hasattr(child, "tag")])
+        return lambda element: element.textContent()
+
+    def literalOf(self, match, group):
+        if match.group(group) is not None:
+            return match.group(group)
+        return match.group(group + 1)
+
+    def evaluate(self, root):
+        contextElements = [root]
+        for step in self.steps:
+            if step.axis == "descendant":
+                parents = []
+                for element in contextElements:
+                    parents.append(element)
+                    parents.extend(element.descendants())
+            else:
+                parents = contextElements
+            selected = []
+            for parent in parents:
+                candidates = [child for child in parent.elementChildren() if step.nameTest == "*" or child.tag == step.nameTest]
+                for predicate in step.predicates:
+                    size = len(candidates)
+                    candidates = [candidate for position, candidate in enumerate(candidates) if predicate(candidate, position + 1, size)]
+                selected.extend(candidates)
+            contextElements = selected
+        return inDocumentOrder(root, contextElements)
+
+
+class CssSelector(object):
+
+    compoundPattern = re.compile(r"""(?:(?P<tag>[A-Za-z][\w-]*|\*)?)(?P<rest>(?:\#[\w-]+|\.[\w-]+|\[[^\]]+\]|:[\w-]+(?:\(\d+\))?)*)$""")
+    simplePattern = re.compile(r"""\#([\w-]+)|\.([\w-]+)|\[\s*([\w:-]+)\s*(?:([~^$*|]?=)\s*(?:'([^']*)'|"([^"]*)"|([^\]\s]*))\s*)?\]|:([\w-]+)(?:\((\d+)\))?""")
+
+    def __init__(self, selector):
+        self.selector = selector
+        self.compounds = self.parse(selector)
+
+    def parse(self, selector):
+        tokens = re.split(r"\s*(>)\s*|\s+", selector.strip())
+        compounds = []
+        combinator = " "
+        for token in tokens:
+            if token is None or token == "":
+                continue
+            if token == ">":
+                combinator = ">"
+                continue
+            compounds.append((combinator, self.parseCompound(token)))
+            combinator = " "
+        if not compounds:
+            raise LocatorSyntaxException("Empty css selector")
+        return compounds
+
+    def parseCompound(self, compound):
+        match = self.compoundPattern.match(compound)
+        if match is None:
+            raise LocatorSyntaxException("Unsupported css selector: " + compound)
+        conditions = []
+        tag = match.group("tag")
+        if tag and tag != "*":
+            conditions.append(lambda element, tag=tag.lower(): element.tag == tag)
+        for simple in self.simplePattern.finditer(match.group("rest")):
+            conditions.append(self.conditionFor(simple))
+        return conditions
+
+    def conditionFor(self, simple):
+        identifier, className, attribute, operator, single, double, bare, pseudoClass, argument = simple.groups()
+        if identifier is not None:
+            return lambda element: element.getAttribute("id") == identifier
+        if className is not None:
+            return lambda element: className in element.classes()
+        if attribute is not None:
+            if operator is None:
+                return lambda element: element.hasAttribute(attribute)
+            expected = [value for value in (single, double, bare) if value is not None][0]
+            comparisons = {"=": lambda value: value == expected,
+                           "~=": lambda value: expected in value.split(),
+                           "^=": lambda value: value.startswith(expected),
+                           "$=": lambda value: value.endswith(expected),
+                           "*=": lambda value: expected in value,
+                           "|=": lambda value: value == expected or value.startswith(expected + "-")}
+            compare = comparisons[operator]
+            return lambda element: element.getAttribute(attribute) is not None and compare(element.getAttribute(attribute))
+        if pseudoClass == "first-child":
+            return lambda element: element.parent is not None and element.parent.elementChildren()[0] is element
+        if pseudoClass == "last-child":
+            return lambda element: element.parent is not None and element.parent.elementChildren()[-1] is element
+        if pseudoClass == "nth-child" and argument is not None:
+            return lambda element: element.parent is not None and len(element.previousElementSiblings()) + 1 == int(argument)
+        if pseudoClass == "checked":
+            return lambda element: element.hasAttribute("checked")
+        raise LocatorSyntaxException("Unsupported css pseudo-class: " + pseudoClass)
+
+    def matchesCompound(self, element, conditions):
+        return element.tag != "#document" and all([condition(element) for condition in conditions])
+
+    def matches(self, element, index=None):
+        if index is None:
+            index = len(self.compounds) - 1
+        combinator, conditions = self.compounds[index]
+        if not self.matchesCompound(element, conditions):
+            return False
+        if index == 0:
+            return True
+        ancestor = element.parent
+        while ancestor is not None:
+            if self.matches(ancestor, index - 1):
+                return True
+            if combinator == ">":
+                return False
+            ancestor = ancestor.parent
+        return False
+
+    def evaluate(self, root):
+        return [element for element in root.descendants() if self.matches(element)]
+
+
+compiledExpressions = {}
+
+def compiledExpression(kind, expression):
+    key = (kind, expression)
+    if key not in compiledExpressions:
+        compiledExpressions[key] = kind(expression)
+    return compiledExpressions[key]
+
+
+def inDocumentOrder(root, elements):
+    wanted = set([id(element) for element in elements])
+    return [element for element in root.descendants() if id(element) in wanted]
+
+
+def findElements(document, locator):
+    root = document.root
+    if locator.startswith("xpath="):
+        return compiledExpression(XPath, locator[len("xpath="):]).evaluate(root)
+    if locator.startswith("//") or locator.startswith("/"):
+        return compiledExpression(XPath, locator).evaluate(root)
+    if locator.startswith("css="):
+        return compiledExpression(CssSelector, locator[len("css="):]).evaluate(root)
+    if locator.startswith("id="):
+        identifier = locator[len("id="):]
+        return [element for element in root.descendants() if element.getAttribute("id") == identifier]
+    if locator.startswith("name="):
+        name = locator[len("name="):]
+        return [element for element in root.descendants() if element.getAttribute("name") == name]
+    if locator.startswith("link="):
+        pattern = globToRegularExpression(locator[len("link="):])
+        return [element for element in root.descendants() if element.tag == "a" and pattern.match(element.text())]
+    if locator.startswith("dom=") or locator.startswith("document."):
+        raise LocatorSyntaxException("DOM locators need a javascript engine: " + locator)
+    if locator.startswith("identifier="):
+        locator = locator[len("identifier="):]
+    byId = [element for element in root.descendants() if element.getAttribute("id") == locator]
+    if byId:
+        return byId
+    return [element for element in root.descendants() if element.getAttribute("name") == locator]
+
+
+def findElement(document, locator):
+    elements = findElements(document, locator)
+    if not elements:
+        return None
+    return elements[0]
@@ -0,0 +1,78 @@
+from LoquaciousSnake.helpers.LocatorEngine import LocatorSyntaxException, splitOutsideOfBrackets, bracketedGroups
+import re
+
+
+class LocatorOptimizer(object):
+
+    stepPattern = re.compile(r"^([A-Za-z][\w-]*|\*)((?:\[[^\]]*\])*)$")
+    attributePattern = re.compile(r"""^\s*@([A-Za-z][\w-]*)\s*=\s*(?:'([^']*)'|"([^"]*)")\s*$""")
+    identifierPattern = re.compile(r"^[A-Za-z][\w-]*$")
+
+    def __init__(self, strict=True):
+        self.strict = strict
+        self.optimizedLocators = {}
+
+    def optimize(self, locator):
+        if locator not in self.optimizedLocators:
+            self.optimizedLocators[locator] = self.rewrite(locator)
+        return self.optimizedLocators[locator]
+
+    def rewrite(self, locator):
+        expression = locator
+        if expression.startswith("xpath="):
+            expression = expression[len("xpath="):]
+        if not expression.startswith("//"):
+            return locator
+        try:
+            steps = self.parse(expression)
+        except LocatorSyntaxException:
+            return locator
+        if steps is None:
+            return locator
+
+        if len(steps) == 1:
+            combinator, tag, conditions = steps[0]
+            if len(conditions) == 1 and conditions[0][0] in ("id", "name") and self.identifierPattern.match(conditions[0][1]) \
+               and (tag == "*" or not self.strict):
+                return conditions[0][0] + "=" + conditions[0][1]
+
+        selectors = []
+        for combinator, tag, conditions in steps:
+            selector = self.cssFor(tag, conditions)
+            if selector is None:
+                return locator
+            if selectors and combinator:
+                selectors.append(combinator)
+            selectors.append(selector)
+        return "css=" + " ".join(selectors)
+
+    def parse(self, expression):
+        parts = splitOutsideOfBrackets(expression, ("//", "/"))
+        if parts[0].strip():
+            return None
+        steps = []
+        for index in range(1, len(parts), 2):
+            match = self.stepPattern.match(parts[index + 1].strip())
+            if match is None:
+                return None
+            conditions = []
+            for predicate in bracketedGroups(match.group(2)):
+                for term in splitOutsideOfBrackets(predicate, (" and ",))[::2]:
+                    condition = self.attributePattern.match(term)
+                    if condition is None:
+                        return None
+                    value = condition.group(2) if condition.group(2) is not None else condition.group(3)
+                    conditions.append((condition.group(1).lower(), value))
+            steps.append((">" if parts[index] == "/" else "", match.group(1).lower(), conditions))
+        return steps
+
+    def cssFor(self, tag, conditions):
+        selector = "" if tag == "*" and conditions else tag
+        for name, value in conditions:
+            if "\"" in value or "\\" in value:
+                return None
+            if name == "id" and self.identifierPattern.match(value):
+                selector += "#" + value
+            else:
+                selector += "[" + name + "=\"" + value + "\"]"
+        return selector
@@ -0,0 +1,44 @@
+import re
+
+numberIgnoredCharacters = r"[\s,]"
+numberPattern = r"^[^0-9.+-]*([+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?)[^0-9]*$"
+monthNames = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+datePatterns = [(r"^([0-9]{4})-([0-9]{1,2})-([0-9]{1,2})(?:[T ]([0-9]{1,2}):([0-9]{2})(?::([0-9]{2}))?)?$", "ymdHMS"),
+                (r"^([0-9]{4})/([0-9]{1,2})/([0-9]{1,2})$", "ymd"),
+                (r"^([0-9]{1,2})/([0-9]{1,2})/([0-9]{4})$", "mdy"),
+                (r"^([0-9]{1,2}) ([A-Za-z]+)\.? ([0-9]{4})$", "dby"),
+                (r"^([A-Za-z]+)\.? ([0-9]{1,2}),? ([0-9]{4})$", "bdy")]
+
+
+def textKey(text):
+    return text
+
+def numberKey(text):
+    match = re.match(numberPattern, re.sub(numberIgnoredCharacters, "", text, flags=re.UNICODE))
+    if match is None:
+        return None
+    return float(match.group(1))
+
+def dateKeyOf(fields, values):
+    date = {"y": 0, "m": 0, "d": 0, "H": 0, "M": 0, "S": 0}
+    for field, value in zip(fields, values):
+        if not value:
+            continue
+        if field == "b":
+            if value[:3].lower() not in monthNames:
+                return None
+            date["m"] = monthNames.index(value[:3].lower()) + 1
+        else:
+            date[field] = int(value)
+    if date["m"] < 1 or date["m"] > 12 or date["d"] < 1 or date["d"] > 31 or date["H"] > 23 or date["M"] > 59 or date["S"] > 59:
+        return None
+    return ((((date["y"] * 100 + date["m"]) * 100 + date["d"]) * 100 + date["H"]) * 100 + date["M"]) * 100 + date["S"]
+
+def dateKey(text):
+    for pattern, fields in datePatterns:
+        match = re.match(pattern, text)
+        if match is not None:
+            return dateKeyOf(fields, match.groups())
+    return None
+
+sortKeys = {"text": textKey, "number": numberKey, "date": dateKey}
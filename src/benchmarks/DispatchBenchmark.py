@@ -0,0 +1,62 @@
+from LoquaciousSnake.BackendRegistry import BackendRegistry
+from LoquaciousSnake.BrowserBackend import BrowserBackend
+from LoquaciousSnake.SharedSeleniumExecutionContext import SharedSeleniumExecutionContext
+from LoquaciousSnake.SeleniumDrivenUser import SeleniumDrivenUser, UnknownMethodException
+from optparse import OptionParser
+import time
+
+
+class NoOpBackend(BrowserBackend):
+
+    def __init__(self, host, port, browserStartCommand, url):
+        pass
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def open(self, url):
+        pass
+
+    def click(self, locator):
+        pass
+
+    def is_element_present(self, locator):
+        return True
+
+    def get_text(self, locator):
+        return "Text"
+
+
+def runsChain(user, numberOfSteps):
+    chain = user
+    for index in range(numberOfSteps // 4):
+        chain = chain.shouldSee("//span").withText("Text").andThen().clicks("//a")
+
+
+def raisesUnknownMethods(user, numberOfCalls):
+    for index in range(numberOfCalls):
+        try:
+            user.flies
+        except UnknownMethodException:
+            pass
+
+
+def measure(name, scenario, user, count):
+    start = time.time()
+    scenario(user, count)
+    elapsed = time.time() - start
+    print("%-25s %8d calls in %6.3fs %10.2f us/call" % (name, count, elapsed, elapsed * 1000000 / count))
+
+
+if __name__ == "__main__":
+    parser = OptionParser()
+    parser.add_option("-n", "--steps", dest="numberOfSteps", type="int", default=10000)
+    options, arguments = parser.parse_args()
+
+    BackendRegistry.register("no-op", NoOpBackend, sharesInstance=False, capabilities=())
+    user = SeleniumDrivenUser(SharedSeleniumExecutionContext("localhost", 4444, "*no-op", "http://localhost:6666", backend="no-op"))
+    measure("chained steps", runsChain, user, options.numberOfSteps)
+    measure("unknown methods", raisesUnknownMethods, user, options.numberOfSteps)
@@ -0,0 +1,46 @@
+from LoquaciousSnake.SharedSeleniumExecutionContext import SharedSeleniumExecutionContext
+from LoquaciousSnake.helpers.LocatorOptimizer import LocatorOptimizer
+from optparse import OptionParser
+import time
+
+
+def generatesPage(numberOfRows):
+    rows = ["<tr class='row'><td><input id='field%d' name='field%d' type='text'/></td><td><a href='#%d'>link %d</a></td></tr>" % (index, index, index, index)
+            for index in range(numberOfRows)]
+    return "<html><head><title>Large page</title></head><body><div id='content'><table>" + "".join(rows) + "</table></div></body></html>"
+
+
+def looksUp(executionContext, locators, count):
+    for index in range(count):
+        executionContext.isElementPresent(locators[index % len(locators)])
+
+
+def measure(name, executionContext, locators, count):
+    start = time.time()
+    looksUp(executionContext, locators, count)
+    elapsed = time.time() - start
+    print("%-35s %6d lookups in %6.3fs %10.2f us/lookup" % (name, count, elapsed, elapsed * 1000000 / count))
+
+
+if __name__ == "__main__":
+    parser = OptionParser()
+    parser.add_option("-r", "--rows", dest="numberOfRows", type="int", default=2000)
+    parser.add_option("-n", "--lookups", dest="numberOfLookups", type="int", default=60)
+    options, arguments = parser.parse_args()
+
+    url = "http://localhost:6666/large.html"
+    executionContext = SharedSeleniumExecutionContext("localhost", 4444, "*in-memory", url, backend="in-memory")
+    executionContext.seleniumInstance.servesPage(url, generatesPage(options.numberOfRows))
+    executionContext.initialize()
+    executionContext.seleniumInstance.open(url)
+
+    last = options.numberOfRows - 1
+    locators = ["//input[@id='field%d']" % last, "//*[@name='field%d']" % last, "//div[@id='content']//input[@name='field%d']" % last]
+    for strict in (True, False):
+        print("\n".join(["%s -> %s" % (locator, LocatorOptimizer(strict).optimize(locator)) for locator in locators]))
+
+    measure("xpath as written", executionContext, locators, options.numberOfLookups)
+    executionContext.enableLocatorOptimization()
+    measure("optimized", executionContext, locators, options.numberOfLookups)
+    executionContext.enableLocatorOptimization(strict=False)
+    measure("optimized, native strategies only", executionContext, locators, options.numberOfLookups)
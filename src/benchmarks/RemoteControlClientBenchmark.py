@@ -0,0 +1,64 @@
+from LoquaciousSnake.SeleniumRemoteControlClient import SeleniumRemoteControlClient
+from expectations.testWebsite.StandInRemoteControlServer import StandInRemoteControlServer
+from optparse import OptionParser
+import time
+
+try:
+    from httplib import HTTPConnection
+    from urllib import urlencode
+except ImportError:
+    from http.client import HTTPConnection
+    from urllib.parse import urlencode
+
+
+def connectionPerCommand(server, numberOfCommands):
+    for index in range(numberOfCommands):
+        connection = HTTPConnection("127.0.0.1", server.port)
+        try:
+            body = urlencode({"cmd": "isElementPresent", "1": "//a[@id='link']", "sessionId": "standInSession"})
+            connection.request("POST", SeleniumRemoteControlClient.path, body,
+                               {"Content-Type": "application/x-www-form-urlencoded; charset=utf-8"})
+            connection.getresponse().read()
+        finally:
+            connection.close()
+
+
+def keepAlive(server, numberOfCommands):
+    client = SeleniumRemoteControlClient("127.0.0.1", server.port, "*firefox", "http://localhost:6666")
+    client.start()
+    try:
+        for index in range(numberOfCommands):
+            client.is_element_present("//a[@id='link']")
+    finally:
+        client.disconnect()
+
+
+def pipelined(server, numberOfCommands, batchSize=20):
+    client = SeleniumRemoteControlClient("127.0.0.1", server.port, "*firefox", "http://localhost:6666")
+    client.start()
+    try:
+        for index in range(0, numberOfCommands, batchSize):
+            client.pipelines([("isElementPresent", ["//a[@id='link']"])] * min(batchSize, numberOfCommands - index))
+    finally:
+        client.disconnect()
+
+
+def measure(name, scenario, numberOfCommands):
+    server = StandInRemoteControlServer().startsInBackground()
+    try:
+        start = time.time()
+        scenario(server, numberOfCommands)
+        elapsed = time.time() - start
+    finally:
+        server.stops()
+    print("%-25s %8d commands in %6.3fs %10.0f commands/s" % (name, numberOfCommands, elapsed, numberOfCommands / elapsed))
+
+
+if __name__ == "__main__":
+    parser = OptionParser()
+    parser.add_option("-n", "--commands", dest="numberOfCommands", type="int", default=2000)
+    options, arguments = parser.parse_args()
+
+    measure("connection per command", connectionPerCommand, options.numberOfCommands)
+    measure("keep-alive", keepAlive, options.numberOfCommands)
+    measure("keep-alive + pipelining", pipelined, options.numberOfCommands)
@@ -0,0 +1,101 @@
+from LoquaciousSnake.AdaptiveTimeouts import AdaptiveTimeouts
+from LoquaciousSnake.SharedSeleniumExecutionContext import SharedSeleniumExecutionContext
+from LoquaciousSnake.SeleniumDrivenUserActions import SeleniumDrivenUserActions
+try:
+    from mock import Mock
+except ImportError:
+    from unittest.mock import Mock
+import os
+import tempfile
+import unittest
+
+
+class AdaptiveTimeoutsExpectations(unittest.TestCase):
+
+    def setUp(self):
+        self.testFileName = "file://" + os.path.dirname(os.path.abspath(__file__)) + "/testWebsite/seleniumTestPage.html"
+        historyFile, self.historyPath = tempfile.mkstemp(suffix=".json")
+        os.close(historyFile)
+        os.remove(self.historyPath)
+        self.timeouts = AdaptiveTimeouts(self.historyPath, safetyFactor=2.0, floor=1000, cap=20000, minimumSamples=3, keptSamples=100)
+
+    def tearDown(self):
+        if os.path.exists(self.historyPath):
+            os.remove(self.historyPath)
+
+    def records(self, key, durations):
+        for duration in durations:
+            self.timeouts.record(key, duration)
+
+    def AdaptiveTimeoutsShouldUseTheCapUntilEnoughWaitsWereRecorded(self):
+        self.records("waitsForPageToLoad http://slow", [100, 120])
+        self.assertEquals(20000, self.timeouts.timeoutFor("waitsForPageToLoad http://slow"))
+        self.assertEquals(20000, self.timeouts.timeoutFor("waitsForPageToLoad http://unknown"))
+
+    def AdaptiveTimeoutsShouldMultiplyTheP99OfTheRecordedWaitsWithinTheFloorAndTheCap(self):
+        self.records("load a", range(1, 101))
+        self.records("load b", [3000, 3500, 4000])
+        self.records("load c", [9000, 15000, 12000])
+        self.assertEquals(1000, self.timeouts.timeoutFor("load a"))
+        self.assertEquals(8000, self.timeouts.timeoutFor("load b"))
+        self.assertEquals(20000, self.timeouts.timeoutFor("load c"))
+
+    def AdaptiveTimeoutsShouldKeepTheLatestWaitsBetweenRuns(self):
+        self.records("load a", range(1, 151))
+        self.timeouts.save()
+
+        nextRun = AdaptiveTimeouts(self.historyPath, safetyFactor=100.0, floor=1000, cap=20000, minimumSamples=3, keptSamples=100)
+        self.assertEquals(list(range(51, 151)), nextRun.samplesFor("load a"))
+        self.assertEquals(14900, nextRun.timeoutFor("load a"))
+
+    def AdaptiveTimeoutsShouldKeepTheWaitsOfRunsThatSaveOneAfterTheOther(self):
+        otherRun = AdaptiveTimeouts(self.historyPath, keptSamples=100)
+        self.records("load a", [100, 200])
+        otherRun.record("load a", 300)
+        otherRun.record("load b", 400)
+        otherRun.save()
+        self.timeouts.save()
+
+        nextRun = AdaptiveTimeouts(self.historyPath)
+        self.assertEquals([100, 200, 300], nextRun.samplesFor("load a"))
+        self.assertEquals([400], nextRun.samplesFor("load b"))
+
+    def AdaptiveTimeoutsShouldDeriveTheTimeoutOfAWaitFromTheHistoryOfThePageItStartsOn(self):
+        executionContext = SharedSeleniumExecutionContext('localhost', 4444, '*firefox', 'http://localhost:6666', backend="in-memory")
+        executionContext.enableAdaptiveTimeouts(self.timeouts)
+        action = SeleniumDrivenUserActions(executionContext)
+        action.goesTo(self.testFileName)
+        self.records(self.timeouts.keyFor("waitsForPageToLoad", self.testFileName), [2000, 2500, 3000])
+        executionContext.seleniumInstance.wait_for_page_to_load = Mock()
+
+        action.waitsForPageToLoad()
+
+        executionContext.seleniumInstance.wait_for_page_to_load.assert_called_with(6000)
+        self.assertEquals(4, len(self.timeouts.samplesFor(self.timeouts.keyFor("waitsForPageToLoad", self.testFileName))))
+        executionContext.destroy()
+
+    def AdaptiveTimeoutsShouldKeyTheWaitsOfAPageWithoutItsQueryString(self):
+        self.assertEquals(self.timeouts.keyFor("waitsForPageToLoad", "http://shop/items"), self.timeouts.keyFor("waitsForPageToLoad", "http://shop/items?page=2&sort=price#top"))
+
+    def AdaptiveTimeoutsShouldNotAskTheBrowserForTheLocationOfAPageTheChainOpened(self):
+        executionContext = SharedSeleniumExecutionContext('localhost', 4444, '*firefox', 'http://localhost:6666', backend="in-memory")
+        executionContext.enableAdaptiveTimeouts(self.timeouts)
+        action = SeleniumDrivenUserActions(executionContext)
+        action.goesTo(self.testFileName)
+        executionContext.seleniumInstance.get_location = Mock(return_value=self.testFileName)
+        executionContext.seleniumInstance.wait_for_page_to_load = Mock()
+
+        action.waitsForPageToLoad().waitsForPageToLoad()
+
+        self.assertEquals(1, executionContext.seleniumInstance.get_location.call_count)
+        self.assertEquals(2, len(self.timeouts.samplesFor(self.timeouts.keyFor("waitsForPageToLoad", self.testFileName))))
+        executionContext.destroy()
+
+    def AdaptiveTimeoutsShouldLetTheErrorsOfAWaitForAjaxThrough(self):
+        executionContext = SharedSeleniumExecutionContext('localhost', 4444, '*firefox', 'http://localhost:6666', backend="in-memory")
+        executionContext.supportsScripts = Mock(return_value=True)
+        executionContext.waitsWithTimeout = Mock(side_effect=KeyError("waitsForAjax Network"))
+        action = SeleniumDrivenUserActions(executionContext)
+
+        self.assertRaises(KeyError, action.waitsForAjax, "Network")
+        executionContext.destroy()
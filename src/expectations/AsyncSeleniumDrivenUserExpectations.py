@@ -0,0 +1,153 @@
+from LoquaciousSnake.AsyncSeleniumExecutionContext import AsyncSeleniumExecutionContext
+from LoquaciousSnake.AsyncSeleniumRemoteControlClient import AsyncSeleniumRemoteControlClient
+from LoquaciousSnake.SeleniumRemoteControlClient import StaleConnectionException
+from LoquaciousSnake.AsyncSeleniumDrivenUser import AsyncSeleniumDrivenUser
+from LoquaciousSnake.SeleniumDrivenUser import SeleniumDrivenUser, UnknownMethodException
+from LoquaciousSnake.SeleniumDrivenUserExpectations import SeleniumDrivenUserExpectationsException
+from LoquaciousSnake.SeleniumDrivenUserActions import SeleniumDrivenUserActionsException
+from LoquaciousSnake.helpers.Decorators import LocatorNotFoundException, OptionNotFoundException
+from expectations.testWebsite.StandInRemoteControlServer import StandInRemoteControlServer
+from expectations.testWebsite.Locators import Locators
+import asyncio
+import unittest
+
+
+class AsyncSeleniumDrivenUserExpectations(unittest.TestCase):
+
+    def setUp(self):
+        self.server = StandInRemoteControlServer().startsInBackground()
+        self.server.responses["getEval"] = "OK,ok"
+        self.url = "http://localhost:6666"
+        self.users = []
+
+    def tearDown(self):
+        self.server.stops()
+
+    def createUser(self):
+        user = AsyncSeleniumDrivenUser(AsyncSeleniumExecutionContext("127.0.0.1", self.server.port, "*firefox", self.url))
+        self.users.append(user)
+        return user
+
+    def runsScenario(self, scenario):
+        async def scenarioThenDestroy():
+            try:
+                await scenario()
+            finally:
+                await asyncio.gather(*[user.destroy() for user in self.users])
+        asyncio.run(scenarioThenDestroy())
+
+    def commandsSentAfterTheSessionStarted(self):
+        return [verb for verb, args in self.server.commands if verb != "getNewBrowserSession"]
+
+    def AsyncSeleniumDrivenUserShouldNotSendAnyCommandUntilTheChainIsAwaited(self):
+        user = self.createUser()
+        user.goesTo(self.url).shouldSee(Locators.SPAN)
+        self.assertEqual([], self.server.commands)
+
+    def AsyncSeleniumDrivenUserShouldPerformTheStepsOfAnAwaitedChainInOrder(self):
+        async def scenario():
+            await self.createUser().goesTo(self.url).shouldSee(Locators.SPAN).withText(Locators.SPAN)\
+                                   .andThen().clicks(Locators.GOOGLE_LINK)
+        self.runsScenario(scenario)
+        self.assertEqual(["open", "isElementPresent", "getText", "getEval", "testComplete"], self.commandsSentAfterTheSessionStarted())
+
+    def AsyncSeleniumDrivenUserShouldStartItsSessionOnlyOnce(self):
+        async def scenario():
+            user = self.createUser()
+            await user.goesTo(self.url)
+            await user.shouldSee(Locators.SPAN)
+        self.runsScenario(scenario)
+        self.assertEqual(1, [verb for verb, args in self.server.commands].count("getNewBrowserSession"))
+
+    def AsyncSeleniumDrivenUserShouldRaiseLocatorNotFoundExceptionWhenALocatorIsMissing(self):
+        self.server.responses["getEval"] = "OK,missing"
+        async def scenario():
+            await self.createUser().clicks("unknown locator")
+        self.assertRaises(LocatorNotFoundException, self.runsScenario, scenario)
+
+    def AsyncSeleniumDrivenUserShouldRaiseLocatorNotFoundExceptionWhenNoLocatorWasPreviouslyVisited(self):
+        async def scenario():
+            await self.createUser().withText("Text")
+        self.assertRaises(LocatorNotFoundException, self.runsScenario, scenario)
+
+    def AsyncSeleniumDrivenUserShouldRaiseOptionNotFoundExceptionWhenNoOptionWasPreviouslySelected(self):
+        async def scenario():
+            await self.createUser().shouldSee(Locators.SELECT).selected()
+        self.assertRaises(OptionNotFoundException, self.runsScenario, scenario)
+
+    def AsyncSeleniumDrivenUserShouldRaiseActionExceptionWhenTheOptionIsNotInTheSelect(self):
+        self.server.responses["getEval"] = "OK,noOption"
+        async def scenario():
+            await self.createUser().selects(Locators.OPTION3).comingFrom(Locators.SELECT)
+        self.assertRaises(SeleniumDrivenUserActionsException, self.runsScenario, scenario)
+
+    def AsyncSeleniumDrivenUserShouldNotPerformTheStepsFollowingAFailure(self):
+        async def scenario():
+            await self.createUser().shouldSee(Locators.SPAN).withText("Text that is not there").clicks(Locators.GOOGLE_LINK)
+        self.assertRaises(SeleniumDrivenUserExpectationsException, self.runsScenario, scenario)
+        self.assertFalse("getEval" in self.commandsSentAfterTheSessionStarted())
+
+    def AsyncSeleniumDrivenUserShouldRaiseUnknownMethodExceptionForUnsupportedSteps(self):
+        self.assertRaises(UnknownMethodException, getattr, self.createUser(), "flies")
+
+    def AsyncSeleniumDrivenUserShouldOfferEveryStepOfTheSeleniumDrivenUser(self):
+        user = self.createUser()
+        for name in user.user.dispatchTable:
+            self.assertTrue(getattr(user, name)() is user)
+        self.assertTrue(user.compilesChain() is user)
+
+    def AsyncSeleniumDrivenUserShouldReturnWhatTheLastStepReads(self):
+        async def scenario():
+            return await self.createUser().goesTo(self.url).reads(Locators.SPAN)
+        self.server.responses["getEval"] = "OK,{\"rows\": [[\"item\"]], \"total\": 1}"
+        self.assertEqual([["item"]], asyncio.run(scenario()))
+
+    def AsyncSeleniumDrivenUserShouldNotSendACommandThatChangesThePageAgainWhenItsResponseIsLost(self):
+        async def scenario():
+            client = AsyncSeleniumRemoteControlClient("127.0.0.1", self.server.port, "*firefox", self.url)
+            await client.start()
+            self.server.unansweredCommands = 1
+            try:
+                await client.click(Locators.GOOGLE_LINK)
+            finally:
+                client.disconnect()
+        self.assertRaises(StaleConnectionException, self.runsScenario, scenario)
+        self.assertEqual(["click"], self.commandsSentAfterTheSessionStarted())
+
+    def AsyncSeleniumDrivenUserShouldSendAReadOnlyCommandAgainWhenItsResponseIsLost(self):
+        async def scenario():
+            client = AsyncSeleniumRemoteControlClient("127.0.0.1", self.server.port, "*firefox", self.url)
+            await client.start()
+            self.server.unansweredCommands = 1
+            try:
+                return await client.get_text(Locators.SPAN)
+            finally:
+                client.disconnect()
+        self.assertEqual(Locators.SPAN, asyncio.run(scenario()))
+        self.assertEqual(["getText", "getText"], self.commandsSentAfterTheSessionStarted())
+
+    def AsyncSeleniumDrivenUserShouldNotSendACommandAgainWhenItTimesOut(self):
+        self.server.delays["getText"] = 0.5
+        async def scenario():
+            client = AsyncSeleniumRemoteControlClient("127.0.0.1", self.server.port, "*firefox", self.url, timeout=0.1)
+            await client.start()
+            try:
+                await client.get_text(Locators.SPAN)
+            finally:
+                client.disconnect()
+        self.assertRaises(asyncio.TimeoutError, self.runsScenario, scenario)
+        self.assertEqual(["getText"], self.commandsSentAfterTheSessionStarted())
+
+    def AsyncSeleniumDrivenUserShouldDriveManySessionsFromOneEventLoop(self):
+        numberOfUsers = 50
+        async def scenario():
+            users = [self.createUser() for index in range(numberOfUsers)]
+            await asyncio.gather(*[user.goesTo(self.url).shouldSee(Locators.SPAN).withText(Locators.SPAN) for user in users])
+        self.runsScenario(scenario)
+        self.assertEqual(numberOfUsers, self.server.connections)
+        self.assertEqual(numberOfUsers * 5, len(self.server.commands))
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(AsyncSeleniumDrivenUserExpectations, prefix="AsyncSeleniumDrivenUser")
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,94 @@
+from LoquaciousSnake.BackendRegistry import BackendRegistry
+from LoquaciousSnake.BrowserBackend import BrowserBackend, BrowserBackendException, Capabilities
+from LoquaciousSnake.InMemoryBrowser import InMemoryBrowser
+from LoquaciousSnake.SharedSeleniumExecutionContext import SharedSeleniumExecutionContext
+from LoquaciousSnake.SeleniumDrivenUser import SeleniumDrivenUser
+from expectations.testWebsite.Locators import Locators
+import os
+import unittest
+
+
+class RecordingBackend(BrowserBackend):
+
+    def __init__(self, host, port, browserStartCommand, url):
+        self.commands = []
+
+    def start(self):
+        self.commands.append("start")
+
+    def stop(self):
+        self.commands.append("stop")
+
+    def open(self, url):
+        self.commands.append("open " + url)
+
+
+class BackendRegistryExpectations(unittest.TestCase):
+
+    def setUp(self):
+        self.testFileName = "file://" + os.path.dirname(os.path.abspath(__file__)) + "/testWebsite/seleniumTestPage.html"
+        self.host    = 'localhost'
+        self.port    = 4444
+        self.browserStartCommand = '*firefox'
+        self.url     = 'http://localhost:6666'
+        BackendRegistry.register("recording", RecordingBackend, sharesInstance=False, capabilities=())
+
+    def tearDown(self):
+        BackendRegistry.unregister("recording")
+        BackendRegistry.unregister("recording-with-scripts")
+        SharedSeleniumExecutionContext.resetAll()
+
+    def BackendRegistryShouldLetAContextRunOnARegisteredBackend(self):
+        executionContext = SharedSeleniumExecutionContext(self.host, self.port, self.browserStartCommand, self.url, backend="recording")
+        SeleniumDrivenUser(executionContext).goesTo(self.testFileName)
+        self.assertEquals(["start", "open " + self.testFileName], executionContext.seleniumInstance.commands)
+
+    def BackendRegistryShouldOnlyStartTheBackendOnTheFirstCommand(self):
+        executionContext = SharedSeleniumExecutionContext(self.host, self.port, self.browserStartCommand, self.url, backend="recording")
+        bob = SeleniumDrivenUser(executionContext)
+        self.assertEquals([], executionContext.seleniumInstance.commands)
+        bob.goesTo(self.testFileName).goesTo(self.testFileName)
+        self.assertEquals(["start", "open " + self.testFileName, "open " + self.testFileName], executionContext.seleniumInstance.commands)
+
+    def BackendRegistryShouldRaiseAnExceptionForABackendThatWasNotRegistered(self):
+        self.assertRaises(BrowserBackendException, SharedSeleniumExecutionContext, self.host, self.port, self.browserStartCommand, self.url, backend="teleport")
+
+    def BackendRegistryShouldRefuseABackendThatLacksTheCommandsOfACapabilityItDeclares(self):
+        BackendRegistry.register("recording-with-scripts", RecordingBackend, sharesInstance=False, capabilities=(Capabilities.SCRIPTS,))
+        try:
+            SharedSeleniumExecutionContext(self.host, self.port, self.browserStartCommand, self.url, backend="recording-with-scripts")
+            self.fail("A backend without get_eval should not be accepted as running scripts")
+        except BrowserBackendException as e:
+            self.assertTrue("get_eval" in str(e) and "wait_for_condition" in str(e))
+
+    def BackendRegistryShouldRefuseABackendThatDeclaresAnUnknownCapability(self):
+        self.assertRaises(BrowserBackendException, BackendRegistry.register, "recording-with-scripts", RecordingBackend, False, ("teleportation",))
+
+    def BackendRegistryShouldRefuseToEnableAScriptBasedFeatureOnABackendWithoutScripts(self):
+        executionContext = SharedSeleniumExecutionContext(self.host, self.port, self.browserStartCommand, self.url, backend="in-memory")
+        self.assertRaises(BrowserBackendException, executionContext.enableNetworkTracking)
+        self.assertRaises(BrowserBackendException, executionContext.enableAutoWait)
+        self.assertRaises(BrowserBackendException, executionContext.enableReadCache, True)
+        self.assertFalse(executionContext.tracksNetwork or executionContext.autoWaitTimeout or executionContext.cachesReads)
+
+    def BackendRegistryShouldRefuseToSwitchTheBackendOfTheSharedInstance(self):
+        SharedSeleniumExecutionContext.resetAll()
+        SharedSeleniumExecutionContext(self.host, self.port, self.browserStartCommand, self.url, backend="keep-alive-rc")
+        self.assertRaises(BrowserBackendException, SharedSeleniumExecutionContext, self.host, self.port, self.browserStartCommand, self.url)
+
+    def BackendRegistryShouldReportWhetherABackendRunsScripts(self):
+        self.assertTrue(BackendRegistry.backendNamed().supports(Capabilities.SCRIPTS))
+        self.assertFalse(BackendRegistry.backendNamed("in-memory").supports(Capabilities.SCRIPTS))
+
+    def BackendRegistryShouldRunCompiledChainsStepByStepOnBackendsWithoutScripts(self):
+        executionContext = SharedSeleniumExecutionContext(self.host, self.port, self.browserStartCommand, self.url, backend="in-memory")
+        user = SeleniumDrivenUser(executionContext)
+        user.goesTo(self.testFileName).compilesChain().checks(Locators.CHECKBOX)\
+            .shouldSee(Locators.CHECKBOX).checked().executesChain()
+        self.assertTrue(isinstance(executionContext.seleniumInstance, InMemoryBrowser))
+        self.assertTrue(executionContext.seleniumInstance.is_checked(Locators.CHECKBOX))
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(BackendRegistryExpectations, prefix="BackendRegistry")
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,94 @@
+from LoquaciousSnake.BackendRegistry import BackendRegistry
+from LoquaciousSnake.Cassette import CassetteRecorder, CassettePlayer, CassetteDivergenceException, ReplayedCommandException
+from LoquaciousSnake.InMemoryBrowser import InMemoryBrowser
+from LoquaciousSnake.SharedSeleniumExecutionContext import SharedSeleniumExecutionContext
+from LoquaciousSnake.SeleniumDrivenUser import SeleniumDrivenUser
+from expectations.testWebsite.Locators import Locators
+import os
+import tempfile
+import unittest
+
+
+class CassetteExpectations(unittest.TestCase):
+
+    def setUp(self):
+        self.testFileName = "file://" + os.path.dirname(os.path.abspath(__file__)) + "/testWebsite/seleniumTestPage.html"
+        self.host    = 'localhost'
+        self.port    = 4444
+        self.browserStartCommand = '*firefox'
+        self.url     = 'http://localhost:6666'
+        cassetteFile, self.cassettePath = tempfile.mkstemp(suffix=".cassette")
+        os.close(cassetteFile)
+        BackendRegistry.registerRecording("recording-in-memory", "in-memory", self.cassettePath)
+        BackendRegistry.registerReplay("replay-in-memory", self.cassettePath, sharesInstance=False, capabilities=())
+
+    def tearDown(self):
+        BackendRegistry.unregister("recording-in-memory")
+        BackendRegistry.unregister("replay-in-memory")
+        os.remove(self.cassettePath)
+
+    def userOn(self, backend):
+        return SeleniumDrivenUser(SharedSeleniumExecutionContext(self.host, self.port, self.browserStartCommand, self.url, backend=backend))
+
+    def walksThroughTheTestPage(self, bob):
+        bob.goesTo(self.testFileName).checks(Locators.CHECKBOX).selects(Locators.OPTION3).comingFrom(Locators.SELECT)
+        bob.shouldSee(Locators.SPAN).withText("Text").shouldSee(Locators.CHECKBOX).checked()
+        bob.shouldSee(Locators.SELECT).withOption(Locators.OPTION3).selected()
+        bob.seleniumExecutionContext.destroy()
+
+    def CassetteShouldReplayARecordedChainWithoutABrowser(self):
+        self.walksThroughTheTestPage(self.userOn("recording-in-memory"))
+
+        bob = self.userOn("replay-in-memory")
+        self.walksThroughTheTestPage(bob)
+        self.assertTrue(bob.seleniumExecutionContext.seleniumInstance.isFinished())
+
+    def CassetteShouldReportWhereTheReplayedCommandsDivergedFromTheRecording(self):
+        self.walksThroughTheTestPage(self.userOn("recording-in-memory"))
+
+        player = CassettePlayer(self.cassettePath)
+        player.start()
+        player.open(self.testFileName)
+        try:
+            player.click(Locators.SPAN)
+            self.fail("clicking a locator that was not recorded should have diverged")
+        except CassetteDivergenceException as e:
+            self.assertTrue(str(e).startswith("Command 3 of the cassette " + self.cassettePath + " diverged: recorded is_element_present("))
+            self.assertTrue(str(e).endswith(" but got click(\"" + Locators.SPAN + "\")"))
+
+    def CassetteShouldKeepThePreviousRecordingUntilTheFirstCommandIsRecorded(self):
+        self.walksThroughTheTestPage(self.userOn("recording-in-memory"))
+        recording = open(self.cassettePath).read()
+
+        CassetteRecorder(InMemoryBrowser(self.host, self.port, self.browserStartCommand, self.url), self.cassettePath)
+        self.assertEquals(recording, open(self.cassettePath).read())
+
+        recorder = CassetteRecorder(InMemoryBrowser(self.host, self.port, self.browserStartCommand, self.url), self.cassettePath)
+        recorder.start()
+        recorder.open(self.testFileName)
+        self.assertEquals(2, len(open(self.cassettePath).readlines()))
+
+    def CassetteShouldIgnoreTheTimeoutsOfWaitsWhenReplaying(self):
+        recorder = CassetteRecorder(InMemoryBrowser(self.host, self.port, self.browserStartCommand, self.url), self.cassettePath)
+        recorder.start()
+        recorder.open(self.testFileName)
+        recorder.wait_for_page_to_load(1000)
+        recorder.wait_for_condition("true", 2000)
+
+        player = CassettePlayer(self.cassettePath)
+        player.start()
+        player.open(self.testFileName)
+        player.wait_for_page_to_load(4500)
+        self.assertRaises(CassetteDivergenceException, player.wait_for_condition, "false", 2000)
+
+    def CassetteShouldReplayTheErrorsItRecorded(self):
+        recorder = CassetteRecorder(InMemoryBrowser(self.host, self.port, self.browserStartCommand, self.url), self.cassettePath)
+        recorder.start()
+        recorder.open(self.testFileName)
+        self.assertRaises(Exception, recorder.select, Locators.SELECT, "Option 4")
+
+        player = CassettePlayer(self.cassettePath)
+        player.start()
+        player.open(self.testFileName)
+        self.assertRaises(ReplayedCommandException, player.select, Locators.SELECT, "Option 4")
+        self.assertRaises(CassetteDivergenceException, player.stop)
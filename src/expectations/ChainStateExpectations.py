@@ -0,0 +1,139 @@
+from LoquaciousSnake.ChainState import ChainState
+from LoquaciousSnake.BackendRegistry import BackendRegistry
+from LoquaciousSnake.SharedSeleniumExecutionContext import SharedSeleniumExecutionContext
+from LoquaciousSnake.SeleniumDrivenUser import SeleniumDrivenUser
+import threading
+import time
+import unittest
+
+
+class FakeBrowser(object):
+
+    def __init__(self):
+        self.values = {}
+        self.selectedLabels = {}
+
+    def is_element_present(self, locator):
+        time.sleep(0)
+        return True
+
+    def get_text(self, locator):
+        time.sleep(0)
+        return "text of " + locator
+
+    def type(self, locator, value):
+        time.sleep(0)
+        self.values[locator] = value
+
+    def get_value(self, locator):
+        time.sleep(0)
+        return self.values.get(locator, "")
+
+    def get_select_options(self, locator):
+        return ["option of " + locator]
+
+    def select(self, locator, option):
+        time.sleep(0)
+        self.selectedLabels[locator] = option
+
+    def get_selected_label(self, locator):
+        return self.selectedLabels.get(locator)
+
+
+class FakeBrowserPool(object):
+
+    host = "localhost"
+    port = 4444
+    browserStartCommand = "*fake"
+    url = "http://localhost:6666"
+    backend = BackendRegistry.backendNamed("in-memory")
+
+    def checkOut(self):
+        return FakeBrowser()
+
+    def checkIn(self, seleniumInstance):
+        pass
+
+
+class ChainStateExpectations(unittest.TestCase):
+
+    numberOfUsers = 40
+    numberOfChains = 50
+
+    def setUp(self):
+        self.errors = []
+        self.startSignal = threading.Event()
+
+    def runUsers(self, contextForUser):
+        threads = []
+        for userNumber in range(self.numberOfUsers):
+            thread = threading.Thread(target=self.runChainsOf, args=(userNumber, contextForUser(userNumber)))
+            threads.append(thread)
+            thread.start()
+        self.startSignal.set()
+        for thread in threads:
+            thread.join()
+
+    def runChainsOf(self, userNumber, executionContext):
+        try:
+            user = SeleniumDrivenUser(executionContext)
+            self.startSignal.wait()
+            for chainNumber in range(self.numberOfChains):
+                span = "//span[@id='user%d']" % userNumber
+                field = "//input[@id='user%d']" % userNumber
+                select = "//select[@id='user%d']" % userNumber
+                filling = "user %d chain %d" % (userNumber, chainNumber)
+
+                user.shouldSee(span).withText("text of " + span)\
+                    .fillsOut(field).withThis(filling)\
+                    .shouldSee(field).withValue(filling)\
+                    .selects("option of " + select).comingFrom(select)\
+                    .shouldSee(select).withOption("option of " + select).selected()
+                if user.chainState.lastVisitedLocation != select:
+                    raise AssertionError("user %d sees %s as last visited location" % (userNumber, user.chainState.lastVisitedLocation))
+        except Exception as e:
+            self.errors.append(e)
+
+    def ChainStateShouldOnlyHoldTheChainingState(self):
+        try:
+            ChainState().unexpectedAttribute = "value"
+            self.fail("ChainState should not accept attributes other than the chaining state")
+        except AttributeError:
+            pass
+
+    def ChainStateShouldNotLeakBetweenUsersSharingAContextFromDifferentThreads(self):
+        executionContext = SharedSeleniumExecutionContext.fromSessionPool(FakeBrowserPool())
+        self.runUsers(lambda userNumber: executionContext)
+        self.assertEquals([], self.errors)
+
+    def ChainStateShouldNotLeakBetweenUsersSharingAContextAndItsReadCacheFromDifferentThreads(self):
+        executionContext = SharedSeleniumExecutionContext.fromSessionPool(FakeBrowserPool())
+        executionContext.enableReadCache()
+        self.runUsers(lambda userNumber: executionContext)
+        self.assertEquals([], self.errors)
+
+    def ChainStateShouldNotLeakBetweenUsersWithTheirOwnContextsInDifferentThreads(self):
+        pool = FakeBrowserPool()
+        self.runUsers(lambda userNumber: SharedSeleniumExecutionContext.fromSessionPool(pool))
+        self.assertEquals([], self.errors)
+
+    def ChainStateShouldNotLeakBetweenUsersSharingAContextInOneThread(self):
+        executionContext = SharedSeleniumExecutionContext.fromSessionPool(FakeBrowserPool())
+        alice = SeleniumDrivenUser(executionContext)
+        bob = SeleniumDrivenUser(executionContext)
+
+        alice.fillsOut("//input[@id='alice']")
+        bob.shouldSee("//select[@id='bob']").drag("//span[@id='bob']").selects("option of //select[@id='bob']")
+        alice.withThis("alice").shouldSee("//input[@id='alice']").withValue("alice")
+
+        self.assertEquals("//input[@id='alice']", alice.chainState.lastVisitedLocation)
+        self.assertEquals(None, alice.chainState.optionBeingHandled)
+        self.assertEquals(None, alice.chainState.itemToDrag)
+        self.assertEquals("//select[@id='bob']", bob.chainState.lastVisitedLocation)
+        self.assertEquals("option of //select[@id='bob']", bob.chainState.optionBeingHandled)
+        self.assertEquals("//span[@id='bob']", bob.chainState.itemToDrag)
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(ChainStateExpectations, prefix="ChainState")
+    unittest.TextTestRunner(verbosity=2).run(suite)
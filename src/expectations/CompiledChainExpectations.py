@@ -0,0 +1,150 @@
+from LoquaciousSnake.CompiledChain import CompiledChainException
+from LoquaciousSnake.SharedSeleniumExecutionContext import SharedSeleniumExecutionContext
+from LoquaciousSnake.SeleniumDrivenUser import SeleniumDrivenUser
+from LoquaciousSnake.SeleniumDrivenUserExpectations import SeleniumDrivenUserExpectationsException
+from LoquaciousSnake.helpers.Decorators import LocatorNotFoundException
+from expectations.testWebsite.Locators import Locators
+try:
+    from mock import Mock
+except ImportError:
+    from unittest.mock import Mock
+import os
+import unittest
+
+
+class CompiledChainExpectations(unittest.TestCase):
+
+    def setUp(self):
+        self.testFileName = "file://" + os.path.dirname(__file__) +  "/testWebsite/seleniumTestPage.html"
+        self.host    = 'localhost'
+        self.port    = 4444
+        self.browserStartCommand = '*firefox'
+        self.url     = 'http://localhost:6666'
+        self.seleniumExecutionContext = SharedSeleniumExecutionContext(self.host, self.port, self.browserStartCommand, self.url)
+        self.seleniumExecutionContext.initialize()
+        self.user = SeleniumDrivenUser(self.seleniumExecutionContext)
+        self.user.goesTo(self.testFileName)
+        self.seleniumInstance = self.seleniumExecutionContext.seleniumInstance
+        self.seleniumInstance.get_eval = Mock(wraps=self.seleniumInstance.get_eval)
+        self.seleniumInstance.is_element_present = Mock(wraps=self.seleniumInstance.is_element_present)
+
+    def tearDown(self):
+        del self.seleniumInstance.get_eval
+        del self.seleniumInstance.is_element_present
+
+    def __del__(self):
+        self.seleniumExecutionContext.destroy()
+
+    def CompiledChainShouldNotSendAnyCommandUntilTheChainIsExecuted(self):
+        self.user.compilesChain().shouldSee(Locators.SPAN).withText("Text")
+        self.assertFalse(self.seleniumInstance.get_eval.called)
+        self.user.executesChain()
+
+    def CompiledChainShouldSendASingleScriptForAChainThatDoesNotNavigate(self):
+        self.user.compilesChain().shouldSee(Locators.SPAN).withText("Text")\
+                 .andThen().shouldSee(Locators.CHECKBOX).unchecked()\
+                 .shouldNotSee("locator that does not exist").executesChain()
+        self.assertEquals(1, self.seleniumInstance.get_eval.call_count)
+        self.assertFalse(self.seleniumInstance.is_element_present.called)
+
+    def CompiledChainShouldLeaveTheLastVisitedLocationOfTheChainToTheUser(self):
+        self.user.compilesChain().shouldSee(Locators.LIST_ITEM1).followedBy(Locators.LIST_ITEM2).executesChain()
+        self.assertEquals(Locators.LIST_ITEM2, self.user.chainState.lastVisitedLocation)
+
+    def CompiledChainShouldPerformActionsInTheBrowser(self):
+        textToType = "This rocks!"
+        self.user.compilesChain().checks(Locators.CHECKBOX).fillsOut(Locators.INPUT_TEXT).withThis(textToType)\
+                 .selects(Locators.OPTION3).comingFrom(Locators.SELECT).executesChain()
+        self.assertTrue(self.seleniumInstance.is_checked(Locators.CHECKBOX))
+        self.assertEquals(textToType, self.seleniumInstance.get_value(Locators.INPUT_TEXT))
+        self.assertEquals(Locators.OPTION3, self.seleniumInstance.get_selected_label(Locators.SELECT))
+
+    def CompiledChainShouldRaiseLocatorNotFoundExceptionWhenACompiledStepTargetsAMissingLocator(self):
+        try:
+            self.user.compilesChain().shouldSee(Locators.SPAN).checks("unknown locator").executesChain()
+            self.fail("executesChain should raise exception when a locator of the chain does not exist")
+        except LocatorNotFoundException:
+            pass
+
+    def CompiledChainShouldRaiseExpectationExceptionWhenACompiledExpectationFails(self):
+        try:
+            self.user.compilesChain().shouldSee(Locators.SPAN).withText("Text that is not there").executesChain()
+            self.fail("executesChain should raise exception when an expectation of the chain fails")
+        except SeleniumDrivenUserExpectationsException:
+            pass
+
+    def CompiledChainShouldNotPerformTheStepsFollowingAFailure(self):
+        try:
+            self.user.compilesChain().shouldSee(Locators.SPAN).withText("Text that is not there")\
+                     .checks(Locators.CHECKBOX).executesChain()
+        except SeleniumDrivenUserExpectationsException:
+            pass
+        self.assertFalse(self.seleniumInstance.is_checked(Locators.CHECKBOX))
+
+    def CompiledChainShouldRunNavigationOutsideOfTheCompiledScript(self):
+        self.user.compilesChain().shouldSee(Locators.SPAN).goesTo(self.testFileName)\
+                 .shouldSee(Locators.CHECKBOX).executesChain()
+        self.assertEquals(2, self.seleniumInstance.get_eval.call_count)
+        self.assertEquals(self.testFileName, self.seleniumInstance.get_location())
+
+    def CompiledChainShouldRaiseTheUsualExceptionWhenAStepHasNoPreviouslyVisitedLocator(self):
+        try:
+            self.user.compilesChain().withText("Text").executesChain()
+            self.fail("withText should raise exception when no location was previously selected")
+        except LocatorNotFoundException:
+            pass
+
+
+class CompiledChainInMemoryExpectations(unittest.TestCase):
+
+    def setUp(self):
+        self.testFileName = "file://" + os.path.dirname(os.path.abspath(__file__)) +  "/testWebsite/seleniumTestPage.html"
+        self.seleniumExecutionContext = SharedSeleniumExecutionContext('localhost', 4444, '*firefox', 'http://localhost:6666', backend="in-memory")
+        self.user = SeleniumDrivenUser(self.seleniumExecutionContext)
+        self.user.goesTo(self.testFileName)
+        self.seleniumInstance = self.seleniumExecutionContext.seleniumInstance
+
+    def tearDown(self):
+        self.seleniumExecutionContext.destroy()
+
+    def runsScripts(self, reply):
+        self.seleniumExecutionContext.supportsScripts = Mock(return_value=True)
+        self.seleniumInstance.get_eval = Mock(return_value=reply)
+
+    def CompiledChainShouldOnlyRecordChainableSteps(self):
+        rows = self.user.compilesChain().checks(Locators.CHECKBOX).reads("//ul")
+        self.assertEquals([["item1"], ["item2"], ["item3"]], rows)
+        self.assertTrue(self.seleniumInstance.is_checked(Locators.CHECKBOX))
+        self.assertTrue(self.user.getSeleniumInstance() is self.seleniumInstance)
+        self.user.executesChain()
+
+    def CompiledChainShouldPerformTheStepsOneByOneWhenTheLocatorsAreOptimized(self):
+        self.runsScripts("ok")
+        self.seleniumExecutionContext.enableLocatorOptimization()
+        self.user.compilesChain().shouldSee(Locators.SPAN).withText("Text").executesChain()
+        self.assertFalse(self.seleniumInstance.get_eval.called)
+
+    def CompiledChainShouldPerformTheStepsOneByOneOnceASnapshotIsTaken(self):
+        self.user.takesSnapshot()
+        self.runsScripts("ok")
+        self.user.compilesChain().shouldSee(Locators.SPAN).withText("Text").executesChain()
+        self.assertFalse(self.seleniumInstance.get_eval.called)
+
+    def CompiledChainShouldPerformTheStepsFromTheOneThatFailedInTheScript(self):
+        self.runsScripts("fail:1")
+        self.assertRaises(SeleniumDrivenUserExpectationsException, self.user.compilesChain().shouldSee(Locators.SPAN).withText("Other text").executesChain)
+
+
+    def CompiledChainShouldNameAnUnexpectedReplyOfTheScript(self):
+        self.runsScripts("Permission denied")
+        try:
+            self.user.compilesChain().shouldSee(Locators.SPAN).withText("Text").executesChain()
+            self.fail("An unexpected reply of the compiled script should be reported")
+        except CompiledChainException as e:
+            self.assertTrue("Permission denied" in str(e))
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(CompiledChainExpectations, prefix="CompiledChain")
+    suite.addTests(unittest.makeSuite(CompiledChainInMemoryExpectations, prefix="CompiledChain"))
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -1,4 +1,4 @@
-from SharedSeleniumExecutionContextExpectations import SharedSeleniumExecutionContextExpectations
+from expectations.SharedSeleniumExecutionContextExpectations import SharedSeleniumExecutionContextExpectations
 
 from expectations.SeleniumDrivenUserActionsExpectations import \
     SeleniumDrivenUserActionsExpectations
@@ -6,13 +6,84 @@ from expectations.SeleniumDrivenUserExpectations import \
     SeleniumDriverUserExpectations
 from expectations.SeleniumDrivenUserExpectationsExpectations import \
     SeleniumDrivenUserExpectationsExpectations
+from expectations.CompiledChainExpectations import CompiledChainExpectations, CompiledChainInMemoryExpectations
+from expectations.SeleniumSessionPoolExpectations import SeleniumSessionPoolExpectations
+from expectations.ChainStateExpectations import ChainStateExpectations
+from expectations.ShardedTestRunnerExpectations import ShardedTestRunnerExpectations
+from expectations.SeleniumRemoteControlClientExpectations import SeleniumRemoteControlClientExpectations
+from expectations.InMemoryBrowserExpectations import InMemoryBrowserExpectations
+from expectations.BackendRegistryExpectations import BackendRegistryExpectations
+from expectations.LocatorOptimizerExpectations import LocatorOptimizerExpectations
+from expectations.InstrumentationExpectations import InstrumentationExpectations
+from expectations.TimeAttributionProfilerExpectations import TimeAttributionProfilerExpectations
+from expectations.CassetteExpectations import CassetteExpectations
+from expectations.AdaptiveTimeoutsExpectations import AdaptiveTimeoutsExpectations
+from expectations.PrefetchedPagesExpectations import PrefetchedPagesExpectations
+from expectations.SortKeysExpectations import SortKeysExpectations
+from expectations.NetworkTrackerExpectations import NetworkTrackerExpectations
+from LoquaciousSnake.AdaptiveTimeouts import AdaptiveTimeouts
+from LoquaciousSnake.SharedSeleniumExecutionContext import SharedSeleniumExecutionContext
+from LoquaciousSnake.ShardedTestRunner import ShardedTestRunner
+from LoquaciousSnake.TimeAttributionProfiler import TimeAttributionProfiler, ProfilingTestRunner
+from optparse import OptionParser
 import unittest
 
+try:
+    from expectations.AsyncSeleniumDrivenUserExpectations import AsyncSeleniumDrivenUserExpectations
+except SyntaxError:
+    class AsyncSeleniumDrivenUserExpectations(unittest.TestCase):
 
-if __name__ == '__main__':
+        @unittest.skip("the asyncio expectations need Python 3.7 or later")
+        def AsyncSeleniumDrivenUserShouldDriveSessionsFromAnEventLoop(self):
+            pass
+
+
+def buildSuite():
     suite = unittest.TestSuite()
     suite.addTests(unittest.makeSuite(SeleniumDrivenUserExpectationsExpectations,prefix="SeleniumDrivenUserExpectationsShould"))
     suite.addTests(unittest.makeSuite(SeleniumDrivenUserActionsExpectations,prefix="SeleniumDrivenUser"))
     suite.addTests(unittest.makeSuite(SeleniumDriverUserExpectations,prefix="SeleniumDrivenUser"))
     suite.addTests(unittest.makeSuite(SharedSeleniumExecutionContextExpectations,prefix="SharedSeleniumExecutionContext"))
-    unittest.TextTestRunner(verbosity=2).run(suite) 
\ No newline at end of file
+    suite.addTests(unittest.makeSuite(CompiledChainExpectations,prefix="CompiledChain"))
+    suite.addTests(unittest.makeSuite(CompiledChainInMemoryExpectations,prefix="CompiledChain"))
+    suite.addTests(unittest.makeSuite(SeleniumSessionPoolExpectations,prefix="SeleniumSessionPool"))
+    suite.addTests(unittest.makeSuite(ChainStateExpectations,prefix="ChainState"))
+    suite.addTests(unittest.makeSuite(ShardedTestRunnerExpectations,prefix="ShardedTestRunner"))
+    suite.addTests(unittest.makeSuite(SeleniumRemoteControlClientExpectations,prefix="SeleniumRemoteControlClient"))
+    suite.addTests(unittest.makeSuite(InMemoryBrowserExpectations,prefix="InMemoryBrowser"))
+    suite.addTests(unittest.makeSuite(BackendRegistryExpectations,prefix="BackendRegistry"))
+    suite.addTests(unittest.makeSuite(LocatorOptimizerExpectations,prefix="LocatorOptimizer"))
+    suite.addTests(unittest.makeSuite(InstrumentationExpectations,prefix="Instrumentation"))
+    suite.addTests(unittest.makeSuite(TimeAttributionProfilerExpectations,prefix="TimeAttributionProfiler"))
+    suite.addTests(unittest.makeSuite(CassetteExpectations,prefix="Cassette"))
+    suite.addTests(unittest.makeSuite(AdaptiveTimeoutsExpectations,prefix="AdaptiveTimeouts"))
+    suite.addTests(unittest.makeSuite(PrefetchedPagesExpectations,prefix="PrefetchedPages"))
+    suite.addTests(unittest.makeSuite(SortKeysExpectations,prefix="SortKeys"))
+    suite.addTests(unittest.makeSuite(NetworkTrackerExpectations,prefix="NetworkTracker"))
+    suite.addTests(unittest.makeSuite(AsyncSeleniumDrivenUserExpectations,prefix="AsyncSeleniumDrivenUser"))
+    return suite
+
+
+if __name__ == '__main__':
+    parser = OptionParser()
+    parser.add_option("-p", "--processes", type="int", default=1, help="number of worker processes, each driving its own browser")
+    parser.add_option("-d", "--durations", default="expectationsDurations.json", help="file where test durations are kept to balance the workers")
+    parser.add_option("--profile", metavar="REPORT", help="attribute the time of every test to python, wire, browser and waits, and write the worst offenders to REPORT")
+    parser.add_option("-t", "--timeouts", metavar="HISTORY", help="derive the timeouts of waitsForPageToLoad and waitsForAjax from the wait times kept in HISTORY, and add this run's waits to it")
+    options, arguments = parser.parse_args()
+
+    if options.timeouts:
+        SharedSeleniumExecutionContext.defaultAdaptiveTimeouts = AdaptiveTimeouts(options.timeouts)
+
+    if options.profile:
+        profiler = TimeAttributionProfiler()
+        ProfilingTestRunner(profiler, verbosity=2).run(buildSuite())
+        profiler.writeReport(options.profile)
+        print(profiler.report(limit=10))
+    elif options.processes > 1:
+        ShardedTestRunner(options.processes, options.durations, verbosity=2).run(buildSuite())
+    else:
+        unittest.TextTestRunner(verbosity=2).run(buildSuite())
+
+    if options.timeouts:
+        SharedSeleniumExecutionContext.defaultAdaptiveTimeouts.save()
@@ -0,0 +1,118 @@
+from LoquaciousSnake.InMemoryBrowser import InMemoryBrowser, InMemoryBrowserException
+from LoquaciousSnake.helpers.LocatorEngine import LocatorSyntaxException
+from expectations.testWebsite.Locators import Locators
+try:
+    from mock import Mock
+except ImportError:
+    from unittest.mock import Mock
+import os
+import unittest
+
+
+class InMemoryBrowserExpectations(unittest.TestCase):
+
+    def setUp(self):
+        self.testFileName = "file://" + os.path.dirname(os.path.abspath(__file__)) + "/testWebsite/seleniumTestPage.html"
+        self.browser = InMemoryBrowser('localhost', 4444, '*firefox', 'http://localhost:6666')
+        self.browser.start()
+        self.browser.open(self.testFileName)
+
+    def InMemoryBrowserShouldFindTheElementsOfTheTestPageWithTheirLocators(self):
+        for locator in [Locators.CHECKBOX, Locators.INPUT_TEXT, Locators.SPAN, Locators.SELECT, Locators.GOOGLE_LINK,
+                        Locators.PROTOTYPE_LINK, Locators.JQUERY_LINK, Locators.LIST_ITEM1, Locators.LIST_ITEM2, Locators.LIST_ITEM3]:
+            self.assertTrue(self.browser.is_element_present(locator), locator + " should be present")
+
+    def InMemoryBrowserShouldNotFindElementsThatAreNotOnThePage(self):
+        self.assertFalse(self.browser.is_element_present("unknown locator"))
+        self.assertFalse(self.browser.is_element_present('//*[@id="Main"]'))
+
+    def InMemoryBrowserShouldSupportPositionalAndFunctionPredicatesInXPath(self):
+        self.assertEquals("item2", self.browser.get_text("//ul/li[2]"))
+        self.assertEquals("item3", self.browser.get_text("//li[last()]"))
+        self.assertEquals("Google", self.browser.get_text("//a[contains(@href, 'google') and @id]"))
+        self.assertEquals("3", self.browser.get_xpath_count("//select/option"))
+
+    def InMemoryBrowserShouldSupportCssSelectorsWithCombinators(self):
+        self.assertEquals("item1", self.browser.get_text("css=ul > li"))
+        self.assertEquals("item3", self.browser.get_text("css=body li:last-child"))
+        self.assertEquals("Google", self.browser.get_text("css=a[href^='http']"))
+
+    def InMemoryBrowserShouldRaiseAnExceptionForLocatorsItCannotEvaluate(self):
+        self.assertRaises(LocatorSyntaxException, self.browser.is_element_present, "//li/following-sibling::li")
+        self.assertRaises(LocatorSyntaxException, self.browser.is_element_present, "dom=document.forms[0]")
+
+    def InMemoryBrowserShouldNormalizeTheWhitespaceOfTexts(self):
+        self.assertEquals("Text", self.browser.get_text(Locators.SPAN))
+
+    def InMemoryBrowserShouldToggleACheckboxWhenClickingOnIt(self):
+        self.browser.click(Locators.CHECKBOX)
+        self.assertTrue(self.browser.is_checked(Locators.CHECKBOX))
+        self.browser.click(Locators.CHECKBOX)
+        self.assertFalse(self.browser.is_checked(Locators.CHECKBOX))
+
+    def InMemoryBrowserShouldSelectOptionsByLabelValueOrIndex(self):
+        self.assertEquals(Locators.OPTION1, self.browser.get_selected_label(Locators.SELECT))
+        self.browser.select(Locators.SELECT, Locators.OPTION3)
+        self.assertEquals(Locators.OPTION3, self.browser.get_selected_label(Locators.SELECT))
+        self.browser.select(Locators.SELECT, "index=1")
+        self.assertEquals("Option 2", self.browser.get_selected_label(Locators.SELECT))
+        self.browser.select(Locators.SELECT, "value=Option 1")
+        self.assertEquals(Locators.OPTION1, self.browser.get_selected_label(Locators.SELECT))
+
+    def InMemoryBrowserShouldRaiseAnExceptionWhenSelectingAnOptionThatDoesNotExist(self):
+        self.assertRaises(InMemoryBrowserException, self.browser.select, Locators.SELECT, "Option 4")
+
+    def InMemoryBrowserShouldKeepTheValueTypedInAField(self):
+        self.browser.type(Locators.INPUT_TEXT, "This rocks!")
+        self.assertEquals("This rocks!", self.browser.get_value(Locators.INPUT_TEXT))
+
+    def InMemoryBrowserShouldOnlyConsiderSiblingsAsOrdered(self):
+        self.assertTrue(self.browser.is_ordered(Locators.LIST_ITEM1, Locators.LIST_ITEM3))
+        self.assertFalse(self.browser.is_ordered(Locators.LIST_ITEM3, Locators.LIST_ITEM1))
+        self.assertFalse(self.browser.is_ordered(Locators.SPAN, Locators.LIST_ITEM1))
+
+    def InMemoryBrowserShouldFailToWaitForAPageItCannotLoad(self):
+        self.browser.click(Locators.GOOGLE_LINK)
+        self.assertRaises(InMemoryBrowserException, self.browser.wait_for_page_to_load, 1)
+        self.assertEquals(self.testFileName, self.browser.get_location())
+
+    def InMemoryBrowserShouldFollowLinksToPagesItServes(self):
+        self.browser.servesPage("http://www.google.ca", "<html><head><title>Google</title></head><body></body></html>")
+        self.browser.click(Locators.GOOGLE_LINK)
+        self.browser.wait_for_page_to_load(1)
+        self.assertEquals("Google", self.browser.get_title())
+
+    def InMemoryBrowserShouldGiveBackTheSourceOfTheCurrentPage(self):
+        self.browser.check(Locators.CHECKBOX)
+        source = self.browser.get_html_source()
+        self.assertTrue('id="test_span"' in source)
+        self.assertTrue('checked="checked"' in source)
+
+    def InMemoryBrowserShouldReadTheRowsOfATableInTheOrderOfItsSections(self):
+        self.browser.servesPage("http://table", "<html><body><table id='t'><tfoot><tr><td>foot</td></tr></tfoot><tr><td>direct</td></tr>"
+                                "<tbody><tr><td>body</td></tr></tbody><thead><tr><th>head</th></tr></thead></table>"
+                                "<select id='s'><option>first</option><optgroup label='group'><option>grouped</option></optgroup></select></body></html>")
+        self.browser.open("http://table")
+        self.assertEquals([["head"], ["direct"], ["body"], ["foot"]], self.browser.tableRowsOf("id=t", 0, None)["rows"])
+        self.assertEquals({"total": 2, "rows": [["first"], ["grouped"]]}, self.browser.tableRowsOf("id=s", 0, None))
+
+    def InMemoryBrowserShouldOnlyReadTheCellsOfTheRequestedRows(self):
+        rows = "".join(["<tr><td>" + str(row) + "</td></tr>" for row in range(25)])
+        self.browser.servesPage("http://table", "<html><body><table id='t'>" + rows + "</table></body></html>")
+        self.browser.open("http://table")
+        self.browser.itemsOf = Mock(wraps=self.browser.itemsOf)
+        self.browser.cellsOf = Mock(wraps=self.browser.cellsOf)
+
+        chunks = [self.browser.tableRowsOf("id=t", start, 10)["rows"] for start in (0, 10, 20)]
+
+        self.assertEquals([[str(row)] for row in range(25)], chunks[0] + chunks[1] + chunks[2])
+        self.assertEquals(1, self.browser.itemsOf.call_count)
+        self.assertEquals(25, self.browser.cellsOf.call_count)
+
+    def InMemoryBrowserShouldRefuseToRunScripts(self):
+        self.assertRaises(InMemoryBrowserException, self.browser.get_eval, "1 + 1")
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(InMemoryBrowserExpectations, prefix="InMemoryBrowser")
+    unittest.TextTestRunner(verbosity=2).run(suite)
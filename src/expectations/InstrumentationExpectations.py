@@ -0,0 +1,58 @@
+from LoquaciousSnake.helpers.Instrumentation import Instrumentation, LatencyHistogram
+from LoquaciousSnake.InMemoryBrowser import InMemoryBrowser
+from LoquaciousSnake.SharedSeleniumExecutionContext import SharedSeleniumExecutionContext
+from LoquaciousSnake.SeleniumDrivenUser import SeleniumDrivenUser
+from expectations.testWebsite.Locators import Locators
+import os
+import unittest
+
+
+class InstrumentationExpectations(unittest.TestCase):
+
+    def setUp(self):
+        self.testFileName = "file://" + os.path.dirname(os.path.abspath(__file__)) + "/testWebsite/seleniumTestPage.html"
+        self.executionContext = SharedSeleniumExecutionContext('localhost', 4444, '*firefox', 'http://localhost:6666', backend="in-memory")
+        self.user = SeleniumDrivenUser(self.executionContext)
+        self.user.goesTo(self.testFileName)
+        self.recorded = []
+
+    def records(self, command, locator, latency, step):
+        self.recorded.append((command, locator, step))
+
+    def InstrumentationHistogramShouldReportPercentilesWithinItsBucketPrecision(self):
+        histogram = LatencyHistogram()
+        for milliseconds in range(1, 101):
+            histogram.record(milliseconds / 1000.0)
+
+        for percent in (50, 95, 99):
+            self.assertTrue(percent / 1000.0 <= histogram.percentile(percent) <= percent / 1000.0 * LatencyHistogram.bucketRatio)
+        self.assertEquals(0.1, histogram.percentile(100))
+
+    def InstrumentationShouldRecordEveryBackendCommandWithItsLocatorAndCallingStep(self):
+        self.executionContext.enableInstrumentation()
+        self.executionContext.instrumentation.addHook(self.records)
+
+        self.user.clicks(Locators.CHECKBOX).shouldSee(Locators.SPAN).withText("Text")
+
+        self.assertEquals([("is_element_present", Locators.CHECKBOX, "clicks"), ("click", Locators.CHECKBOX, "clicks"),
+                           ("is_element_present", Locators.SPAN, "shouldSee"), ("checksPresenceOfLocator", Locators.SPAN, "shouldSee"),
+                           ("checksAPreviouslyVisitedLocator", None, "withText"), ("get_text", Locators.SPAN, "withText")], self.recorded)
+        self.assertEquals(set(["is_element_present", "click", "get_text", "checksPresenceOfLocator", "checksAPreviouslyVisitedLocator"]), set(self.executionContext.instrumentation.commandPercentiles().keys()))
+        self.assertEquals(set([Locators.CHECKBOX, Locators.SPAN]), set(self.executionContext.instrumentation.locatorPercentiles().keys()))
+        self.assertTrue("is_element_present" in self.executionContext.instrumentation.report())
+
+    def InstrumentationShouldStopRecordingOnceDisabled(self):
+        instrumentation = Instrumentation()
+        instrumentation.addHook(self.records)
+        self.executionContext.enableInstrumentation(instrumentation)
+        self.executionContext.disableInstrumentation()
+
+        self.user.shouldSee(Locators.SPAN)
+
+        self.assertEquals([], self.recorded)
+        self.assertTrue(isinstance(self.executionContext.seleniumInstance, InMemoryBrowser))
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(InstrumentationExpectations, prefix="Instrumentation")
+    unittest.TextTestRunner(verbosity=2).run(suite)
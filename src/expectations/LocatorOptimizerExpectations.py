@@ -0,0 +1,58 @@
+from LoquaciousSnake.helpers.LocatorOptimizer import LocatorOptimizer
+from LoquaciousSnake.InMemoryBrowser import InMemoryBrowser
+from LoquaciousSnake.SharedSeleniumExecutionContext import SharedSeleniumExecutionContext
+from LoquaciousSnake.SeleniumDrivenUser import SeleniumDrivenUser
+from expectations.testWebsite.Locators import Locators
+try:
+    from mock import Mock
+except ImportError:
+    from unittest.mock import Mock
+import os
+import unittest
+
+
+class LocatorOptimizerExpectations(unittest.TestCase):
+
+    def setUp(self):
+        self.testFileName = "file://" + os.path.dirname(os.path.abspath(__file__)) + "/testWebsite/seleniumTestPage.html"
+        self.optimizer = LocatorOptimizer()
+
+    def LocatorOptimizerShouldRewriteIdAndNameKeyedXPathsIntoNativeStrategies(self):
+        self.assertEquals("id=Main", self.optimizer.optimize("//*[@id='Main']"))
+        self.assertEquals("name=test_checkbox", self.optimizer.optimize('xpath=//*[@name="test_checkbox"]'))
+
+    def LocatorOptimizerShouldKeepTheTagOfTheXPathWhenStrict(self):
+        self.assertEquals("css=input#test_input_text", self.optimizer.optimize(Locators.INPUT_TEXT))
+        self.assertEquals('css=input[name="test_checkbox"]', self.optimizer.optimize(Locators.CHECKBOX))
+        self.assertEquals("id=test_input_text", LocatorOptimizer(strict=False).optimize(Locators.INPUT_TEXT))
+
+    def LocatorOptimizerShouldRewriteSimpleXPathsIntoCssSelectors(self):
+        self.assertEquals('css=div#content > a[href="/"][rel="home"] span', self.optimizer.optimize("//div[@id='content']/a[@href='/' and @rel='home']//span"))
+
+    def LocatorOptimizerShouldLeaveComplexOrNonXPathLocatorsAlone(self):
+        for locator in ["//ul/li[2]", "//a[contains(@href, 'google')]", "//span[text()='Text']", "/html/body", Locators.LIST_ITEM1, "test_checkbox", "//a[@title='say \"hi\"']"]:
+            self.assertEquals(locator, self.optimizer.optimize(locator))
+
+    def LocatorOptimizerShouldFindTheSameElementsOnTheTestPageOnceOptimized(self):
+        browser = InMemoryBrowser('localhost', 4444, '*firefox', 'http://localhost:6666')
+        browser.start()
+        browser.open(self.testFileName)
+        for locator in [Locators.CHECKBOX, Locators.INPUT_TEXT, Locators.SPAN, Locators.SELECT, Locators.GOOGLE_LINK, Locators.PROTOTYPE_LINK, Locators.JQUERY_LINK]:
+            self.assertEquals(browser.elementFor(locator), browser.elementFor(self.optimizer.optimize(locator)))
+
+    def LocatorOptimizerShouldBeAppliedByTheContextOnceEnabled(self):
+        executionContext = SharedSeleniumExecutionContext('localhost', 4444, '*firefox', 'http://localhost:6666', backend="in-memory")
+        user = SeleniumDrivenUser(executionContext)
+        user.goesTo(self.testFileName)
+        executionContext.enableLocatorOptimization()
+        executionContext.seleniumInstance.is_element_present = Mock(return_value=True)
+
+        user.fillsOut(Locators.INPUT_TEXT).withThis("optimized").shouldSee(Locators.INPUT_TEXT)
+
+        self.assertEquals(("css=input#test_input_text",), executionContext.seleniumInstance.is_element_present.call_args[0])
+        self.assertEquals("optimized", executionContext.seleniumInstance.get_value("id=test_input_text"))
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(LocatorOptimizerExpectations, prefix="LocatorOptimizer")
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,39 @@
+from LoquaciousSnake.helpers.JavascriptHelper import JavascriptHelper
+from expectations.testWebsite.Node import nodeCommand, runsInNode
+import unittest
+
+fakeSeleniumCore = "function newWindow() { var XMLHttpRequest = function() { this.readyState = 0; this.listeners = {}; };" \
+                 + " XMLHttpRequest.prototype.addEventListener = function(type, listener) { (this.listeners[type] = this.listeners[type] || []).push(listener); };" \
+                 + " XMLHttpRequest.prototype.send = function() { this.readyState = 1; };" \
+                 + " XMLHttpRequest.prototype.finish = function() { this.readyState = 4; (this.listeners['loadend'] || []).forEach(function(listener) { listener(); }); };" \
+                 + " return { XMLHttpRequest: XMLHttpRequest }; }" \
+                 + " var current = newWindow();" \
+                 + " var selenium = { browserbot: { _modifyWindow: function(win) { }, getCurrentWindow: function() { return current; } } };" \
+                 + " function navigates() { current = newWindow(); selenium.browserbot._modifyWindow(current); }" \
+                 + " function sendsRequest() { var request = new current.XMLHttpRequest(); request.send(); return request; }" \
+                 + " function isIdle() { return eval(" + JavascriptHelper.ToJavascriptString(JavascriptHelper.GetNetworkIdleCondition(0)) + "); }"
+
+
+def idleStatesOf(scenario):
+    return runsInNode(fakeSeleniumCore + " var states = [];" + scenario + " console.log(JSON.stringify(states));")
+
+
+class NetworkTrackerExpectations(unittest.TestCase):
+
+    @unittest.skipIf(nodeCommand is None, "node is not installed, the network tracker cannot be checked")
+    def NetworkTrackerShouldCountARequestAlreadyInFlightWhenTheWaitStarts(self):
+        scenario = " eval(" + JavascriptHelper.ToJavascriptString(JavascriptHelper.GetNetworkTrackerScript()) + ");" \
+                 + " navigates(); var request = sendsRequest();" \
+                 + " states.push(isIdle()); request.finish(); states.push(isIdle());"
+        self.assertEquals([False, True], idleStatesOf(scenario))
+
+    @unittest.skipIf(nodeCommand is None, "node is not installed, the network tracker cannot be checked")
+    def NetworkTrackerShouldNotReportIdleBeforeTheIdleTimeWhenInstalledByTheWait(self):
+        scenario = " states.push(eval(" + JavascriptHelper.ToJavascriptString(JavascriptHelper.GetNetworkIdleCondition(60000)) + "));" \
+                 + " navigates(); sendsRequest(); states.push(isIdle());"
+        self.assertEquals([False, False], idleStatesOf(scenario))
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(NetworkTrackerExpectations, prefix="NetworkTracker")
+    unittest.TextTestRunner(verbosity=2).run(suite)
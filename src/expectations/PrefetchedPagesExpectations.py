@@ -0,0 +1,96 @@
+from LoquaciousSnake.SharedSeleniumExecutionContext import SharedSeleniumExecutionContext
+from LoquaciousSnake.SeleniumDrivenUser import SeleniumDrivenUser
+from LoquaciousSnake.SeleniumDrivenUserActions import SeleniumDrivenUserActionsException
+from LoquaciousSnake.PrefetchedPages import PrefetchedPages
+from LoquaciousSnake.helpers.Decorators import LocatorNotFoundException
+try:
+    from mock import Mock
+except ImportError:
+    from unittest.mock import Mock
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+
+class PrefetchedPagesExpectations(unittest.TestCase):
+
+    RESULTS = "//table[@id='results']"
+    NEXT_PAGE = "link=Next"
+
+    def setUp(self):
+        self.listingDirectory = tempfile.mkdtemp()
+        for page in range(1, 7):
+            rows = "".join(["<tr><td>item " + str(page * 10 + row) + "</td></tr>" for row in range(3)])
+            nextPage = ""
+            if page < 4:
+                nextPage = "<a href='page" + str(page + 1) + ".html'>Next</a>"
+            if page == 5:
+                nextPage = "<a href='page6.html' class='pager disabled'>Next</a>"
+            listingFile = open(os.path.join(self.listingDirectory, "page" + str(page) + ".html"), "w")
+            listingFile.write("<html><body><table id='results'>" + rows + "</table>" + nextPage + "</body></html>")
+            listingFile.close()
+        self.executionContext = SharedSeleniumExecutionContext('localhost', 4444, '*firefox', 'http://localhost:6666', backend="in-memory")
+        self.bob = SeleniumDrivenUser(self.executionContext)
+        self.bob.goesTo("file://" + os.path.join(self.listingDirectory, "page1.html"))
+
+    def tearDown(self):
+        self.executionContext.destroy()
+        shutil.rmtree(self.listingDirectory)
+
+    def itemsOf(self, page):
+        return [["item " + str(page * 10 + row)] for row in range(3)]
+
+    def PrefetchedPagesShouldYieldTheRowsOfEveryPageOfTheListing(self):
+        pages = list(self.bob.readsPages(self.RESULTS, self.NEXT_PAGE, prefetch=2))
+        self.assertEquals([self.itemsOf(page) for page in range(1, 5)], pages)
+        self.assertEquals("file://" + os.path.join(self.listingDirectory, "page1.html"), self.executionContext.seleniumInstance.get_location())
+
+    def PrefetchedPagesShouldStopAfterTheRequestedNumberOfPages(self):
+        pages = list(self.bob.readsPages(self.RESULTS, self.NEXT_PAGE, maxPages=2))
+        self.assertEquals([self.itemsOf(1), self.itemsOf(2)], pages)
+
+    def PrefetchedPagesShouldStopPrefetchingWhenClosed(self):
+        pages = self.bob.readsPages(self.RESULTS, self.NEXT_PAGE)
+        with pages:
+            self.assertEquals(self.itemsOf(1), next(pages))
+        self.assertFalse(pages.prefetcher.is_alive())
+        self.assertFalse(pages.companion.seleniumExecutionContext.isInitialized)
+        self.assertRaises(StopIteration, next, pages)
+
+    def PrefetchedPagesShouldRaiseTheErrorsOfThePrefetchingSession(self):
+        pages = self.bob.readsPages("//table[@id='missing']", self.NEXT_PAGE)
+        self.assertRaises(LocatorNotFoundException, next, pages)
+        self.assertFalse(pages.prefetcher.is_alive())
+
+    def PrefetchedPagesShouldStopAtANextPageLinkThatIsDisabled(self):
+        self.bob.goesTo("file://" + os.path.join(self.listingDirectory, "page5.html"))
+        pages = list(self.bob.readsPages(self.RESULTS, self.NEXT_PAGE))
+        self.assertEquals([self.itemsOf(5)], pages)
+
+    def PrefetchedPagesShouldGiveUpOnACompanionThatHangs(self):
+        hangs = threading.Event()
+        companion = Mock()
+        companion.goesTo = Mock(side_effect=lambda url: hangs.wait())
+        pages = PrefetchedPages(companion, "http://listing", self.RESULTS, self.NEXT_PAGE, timeout=100)
+        try:
+            self.assertRaises(SeleniumDrivenUserActionsException, next, pages)
+        finally:
+            hangs.set()
+        pages.prefetcher.join()
+
+    def PrefetchedPagesShouldCopyTheCookiesOfTheUserToTheCompanion(self):
+        companion = Mock()
+        companion.reads = Mock(return_value=self.itemsOf(1))
+        companion.seleniumExecutionContext.isDisabled = Mock(return_value=False)
+        companion.clicks = Mock(side_effect=LocatorNotFoundException("link=Next"))
+        pages = list(PrefetchedPages(companion, "http://listing", self.RESULTS, self.NEXT_PAGE, timeout=5000, cookies="session=42; theme=dark"))
+        self.assertEquals([self.itemsOf(1)], pages)
+        companion.seleniumExecutionContext.addsCookies.assert_called_with("session=42; theme=dark")
+        self.assertEquals(2, companion.goesTo.call_count)
+
+    def PrefetchedPagesShouldCreateEveryCopiedCookieInTheCompanion(self):
+        self.executionContext.seleniumInstance.create_cookie = Mock()
+        self.executionContext.addsCookies("session=42; theme=dark")
+        self.assertEquals([("session=42", "path=/"), ("theme=dark", "path=/")], [call[0] for call in self.executionContext.seleniumInstance.create_cookie.call_args_list])
@@ -1,12 +1,16 @@
 from LoquaciousSnake.SeleniumDrivenUserActions import SeleniumDrivenUserActions,\
     SeleniumDrivenUserActionsException
 from LoquaciousSnake.SharedSeleniumExecutionContext import SharedSeleniumExecutionContext
+from LoquaciousSnake.BrowserBackend import BrowserBackendException
 from expectations.testWebsite.Locators import Locators
-from mock import Mock
+try:
+    from mock import Mock
+except ImportError:
+    from unittest.mock import Mock
 from LoquaciousSnake.helpers.Decorators import LocatorNotFoundException
 from LoquaciousSnake.SeleniumDrivenUserExpectations import SeleniumDrivenUserExpectations
 from LoquaciousSnake.helpers.JavascriptHelper import JavascriptHelper
-from selenium import selenium
+from selenium.selenium import selenium
 import os
 import unittest
 
@@ -18,7 +22,7 @@ class SeleniumDrivenUserActionsExpectations(unittest.TestCase):
         self.port    = 4444
         self.browserStartCommand = '*firefox'
         self.url     = 'http://localhost:6666'
-        self.seleniumExecutionContext = SharedSeleniumExecutionContext(self.host, self.port, self.browserStartCommand, self.url)
+        self.seleniumExecutionContext = SharedSeleniumExecutionContext(self.host, self.port, self.browserStartCommand, self.url, backend="in-memory")
         self.seleniumExecutionContext.initialize()   
         self.locator='//*[@id="Main"]'
         self.action = SeleniumDrivenUserActions(self.seleniumExecutionContext)
@@ -50,17 +54,28 @@ class SeleniumDrivenUserActionsExpectations(unittest.TestCase):
         self.action.clicks(Locators.CHECKBOX)
         self.assertTrue(self.seleniumExecutionContext.seleniumInstance.is_checked(Locators.CHECKBOX))
     
+    def SeleniumDrivenUserActionsShouldAdvanceThePageGenerationWhenClicking(self):
+        pageGeneration = self.seleniumExecutionContext.pageGeneration
+        self.action.clicks(Locators.CHECKBOX)
+        self.assertTrue(self.seleniumExecutionContext.pageGeneration > pageGeneration)
+
+    def SeleniumDrivenUserActionsShouldNotLeaveStaleReadsInTheCacheAfterAnAction(self):
+        self.seleniumExecutionContext.enableReadCache()
+        self.expectation.shouldSee(Locators.CHECKBOX).unchecked()
+        self.action.checks(Locators.CHECKBOX)
+        self.expectation.shouldSee(Locators.CHECKBOX).checked()
+        self.seleniumExecutionContext.disableReadCache()
+
     def SeleniumDrivenUserActionsShouldUpdateLastVisitedLocationWhenCalledWithFillsOut(self):
-        self.seleniumExecutionContext.setLastVisitedLocation = Mock()
         self.action.fillsOut(self.locator)        
-        self.assertTrue(self.seleniumExecutionContext.setLastVisitedLocation.called)
+        self.assertEquals(self.locator, self.action.chainState.lastVisitedLocation)
         
     def SeleniumDrivenUserActionsShouldThrowExceptionWhenWithThisIsCalledAndNoPreviousLocationWasSelected(self):
         
         try:
             self.action.withThis("Text")
             self.fail("withThis should fail when no location was previously selected")
-        except (LocatorNotFoundException, ), e:
+        except (LocatorNotFoundException, ) as e:
             pass
         
     def SeleniumDrivenUserActionsShouldFillOutTextBoxProperlyWhenItIsTheSelectedLocation(self):
@@ -96,7 +111,7 @@ class SeleniumDrivenUserActionsExpectations(unittest.TestCase):
     def SeleniumDrivenUserActionsShouldUpdateOptionBeingHandledWhenCalledWithSelects(self):
         myChoice = "hello"
         self.action.selects(myChoice)
-        self.assertEquals(self.seleniumExecutionContext.optionBeingHandled, myChoice)
+        self.assertEquals(self.action.chainState.optionBeingHandled, myChoice)
         
     def SeleniumDrivenUserActionsShouldReturnChainingElementwhenCalledWithSelects(self):
         myChoice = "hello"
@@ -138,7 +153,7 @@ class SeleniumDrivenUserActionsExpectations(unittest.TestCase):
     def SeleniumDrivenUserActionsShouldUpdateItemToDragInContextWhenAskedToDrag(self):
         itemToDrag = Locators.SPAN
         self.action.drag(itemToDrag)
-        self.assertTrue(self.seleniumExecutionContext.itemToDrag is itemToDrag)
+        self.assertTrue(self.action.chainState.itemToDrag is itemToDrag)
     
     def SeleniumDrivenUserActionsShouldThrowExceptionWhenDragIsCalledOnANonExistingItem(self):
         itemToDrag = "fakeItem"
@@ -155,6 +170,63 @@ class SeleniumDrivenUserActionsExpectations(unittest.TestCase):
         except SeleniumDrivenUserActionsException:
             pass
    
+    def SeleniumDrivenUserActionsShouldCheckPresenceAndClickInASingleScriptWhenTheBrowserRunsScripts(self):
+        self.seleniumExecutionContext.supportsScripts = Mock(return_value=True)
+        self.seleniumExecutionContext.seleniumInstance.get_eval = Mock(return_value="missing")
+        self.seleniumExecutionContext.seleniumInstance.is_element_present = Mock()
+
+        self.assertRaises(LocatorNotFoundException, self.action.clicks, "//div[@id='missing']")
+        self.assertEquals(1, self.seleniumExecutionContext.seleniumInstance.get_eval.call_count)
+        self.assertFalse(self.seleniumExecutionContext.seleniumInstance.is_element_present.called)
+
+    def SeleniumDrivenUserActionsShouldReportAMissingOptionFromTheSingleScriptSelectingIt(self):
+        self.seleniumExecutionContext.supportsScripts = Mock(return_value=True)
+        self.seleniumExecutionContext.seleniumInstance.get_eval = Mock(return_value="noOption")
+
+        self.assertRaises(SeleniumDrivenUserActionsException, self.action.selects("Option 4").comingFrom, Locators.SELECT)
+        self.assertEquals(1, self.seleniumExecutionContext.seleniumInstance.get_eval.call_count)
+
+    def SeleniumDrivenUserActionsShouldFillTextSelectAndCheckboxFieldsWhenAskedToFillOutAForm(self):
+        self.action.fillsOutForm([(Locators.INPUT_TEXT, "filled"), (Locators.SELECT, Locators.OPTION3), (Locators.CHECKBOX, True)])
+
+        self.assertEquals("filled", self.seleniumExecutionContext.seleniumInstance.get_value(Locators.INPUT_TEXT))
+        self.assertEquals(Locators.OPTION3, self.seleniumExecutionContext.seleniumInstance.get_selected_label(Locators.SELECT))
+        self.assertTrue(self.seleniumExecutionContext.seleniumInstance.is_checked(Locators.CHECKBOX))
+
+    def SeleniumDrivenUserActionsShouldReportEveryMissingFieldAndFillNothingWhenAFormHasMissingFields(self):
+        try:
+            self.action.fillsOutForm({Locators.INPUT_TEXT: "filled", "//input[@id='first']": "a", "//input[@id='second']": "b"})
+            self.fail("Missing fields should have been reported")
+        except LocatorNotFoundException as e:
+            self.assertTrue("//input[@id='first']" in str(e) and "//input[@id='second']" in str(e))
+        self.assertEquals("", self.seleniumExecutionContext.seleniumInstance.get_value(Locators.INPUT_TEXT))
+
+    def SeleniumDrivenUserActionsShouldFillAFormInASingleScriptWhenTheBrowserRunsScripts(self):
+        self.seleniumExecutionContext.supportsScripts = Mock(return_value=True)
+        self.seleniumExecutionContext.seleniumInstance.get_eval = Mock(return_value="noOption:" + Locators.SELECT)
+
+        self.assertRaises(SeleniumDrivenUserActionsException, self.action.fillsOutForm, [(Locators.INPUT_TEXT, "filled"), (Locators.SELECT, "Option 4")])
+        self.assertEquals(1, self.seleniumExecutionContext.seleniumInstance.get_eval.call_count)
+
+    def SeleniumDrivenUserActionsShouldReadAListAsRowsOfOneCell(self):
+        self.assertEquals([["item1"], ["item2"], ["item3"]], self.action.reads("//ul"))
+        self.assertRaises(LocatorNotFoundException, self.action.reads, "//table[@id='missing']")
+
+    def SeleniumDrivenUserActionsShouldStreamTheRowsOfALargeTableInBoundedChunks(self):
+        rows = "".join(["<tr><td>" + str(row) + "</td><td>row " + str(row) + "</td></tr>" for row in range(25)])
+        self.seleniumExecutionContext.seleniumInstance.servesPage("http://results", "<html><body><table id='results'><thead><tr><th>#</th><th>Name</th></tr></thead><tbody>" + rows + "</tbody></table></body></html>")
+        self.action.goesTo("http://results")
+        originalTableRowsOf = self.seleniumExecutionContext.tableRowsOf
+        self.seleniumExecutionContext.tableRowsOf = Mock(side_effect=originalTableRowsOf)
+
+        streamedRows = self.action.reads("//table[@id='results']", chunkSize=10)
+        self.assertEquals(["#", "Name"], next(streamedRows))
+        self.assertEquals(1, self.seleniumExecutionContext.tableRowsOf.call_count)
+
+        self.assertEquals([[str(row), "row " + str(row)] for row in range(25)], list(streamedRows))
+        self.assertEquals(3, self.seleniumExecutionContext.tableRowsOf.call_count)
+        self.assertEquals(("//table[@id='results']", 20, 10), self.seleniumExecutionContext.tableRowsOf.call_args[0])
+
     def SeleniumDrivenUserActionsShouldThrowAnExceptionWhenAskedToWaitForAjaxWithANonSupportedLibrary(self):
         try:
             self.action.waitsForAjax("JSlicious")
@@ -167,7 +239,9 @@ class SeleniumDrivenUserActionsExpectations(unittest.TestCase):
         mockedWaitForCondition = Mock()
         selenium.wait_for_condition = mockedWaitForCondition
         JavascriptHelper.GetjQueryWaitForAjaxCondition = mockedWaitForAjaxCondition
-        self.action.clicks(Locators.JQUERY_LINK).andThen().waitsForAjax("jQuery")
+        self.action.clicks(Locators.JQUERY_LINK)
+        self.seleniumExecutionContext.supportsScripts = Mock(return_value=True)
+        self.action.waitsForAjax("jQuery")
         self.assertTrue(mockedWaitForAjaxCondition.called)
         
     def SeleniumDrivenUserActionsShouldHaveWaitForAjaxShouldGetThePrototypeConditionWhenPrototypeIsUsed(self):
@@ -175,5 +249,34 @@ class SeleniumDrivenUserActionsExpectations(unittest.TestCase):
         mockedWaitForCondition = Mock()
         selenium.wait_for_condition = mockedWaitForCondition
         JavascriptHelper.GetPrototypeWaitForAjaxCondition = mockedWaitForAjaxCondition
-        self.action.clicks(Locators.PROTOTYPE_LINK).andThen().waitsForAjax("Prototype")
+        self.action.clicks(Locators.PROTOTYPE_LINK)
+        self.seleniumExecutionContext.supportsScripts = Mock(return_value=True)
+        self.action.waitsForAjax("Prototype")
         self.assertTrue(mockedWaitForAjaxCondition.called)
+
+    def SeleniumDrivenUserActionsShouldWaitForTheNetworkToBeIdleForTheRequestedTime(self):
+        self.action.clicks(Locators.JQUERY_LINK)
+        self.seleniumExecutionContext.supportsScripts = Mock(return_value=True)
+        self.seleniumExecutionContext.seleniumInstance.wait_for_condition = Mock()
+        self.action.waitsForAjax("Network", 10000, idleTime=250)
+        condition, timeout = self.seleniumExecutionContext.seleniumInstance.wait_for_condition.call_args[0]
+        self.assertEquals(JavascriptHelper.GetNetworkIdleCondition(250), condition)
+        self.assertEquals(10000, timeout)
+
+    def SeleniumDrivenUserActionsShouldRefuseToWaitForAjaxOnABackendThatDoesNotRunScripts(self):
+        self.assertRaises(BrowserBackendException, self.action.waitsForAjax, "Network")
+
+    def SeleniumDrivenUserActionsShouldInstallTheNetworkTrackerOnEveryPageLoadWhenTrackingTheNetwork(self):
+        self.seleniumExecutionContext.supportsScripts = Mock(return_value=True)
+        self.seleniumExecutionContext.seleniumInstance.get_eval = Mock(return_value="tracked")
+        self.seleniumExecutionContext.enableNetworkTracking()
+        self.action.goesTo(self.testFileName).waitsForPageToLoad(1)
+        self.assertEquals(3, self.seleniumExecutionContext.seleniumInstance.get_eval.call_count)
+        self.assertTrue("loquaciousNetwork" in self.seleniumExecutionContext.seleniumInstance.get_eval.call_args[0][0])
+
+    def SeleniumDrivenUserActionsShouldHookTheNetworkTrackerIntoEveryNewWindowAsSoonAsTrackingIsEnabled(self):
+        self.seleniumExecutionContext.supportsScripts = Mock(return_value=True)
+        self.seleniumExecutionContext.seleniumInstance.get_eval = Mock(return_value="tracked")
+        self.seleniumExecutionContext.enableNetworkTracking()
+        self.assertEquals(1, self.seleniumExecutionContext.seleniumInstance.get_eval.call_count)
+        self.assertTrue("bot._modifyWindow = function(win)" in self.seleniumExecutionContext.seleniumInstance.get_eval.call_args[0][0])
@@ -1,5 +1,9 @@
-from mock import Mock
-from LoquaciousSnake.SeleniumDrivenUser import SeleniumDrivenUser
+try:
+    from mock import Mock
+except ImportError:
+    from unittest.mock import Mock
+from LoquaciousSnake.SeleniumDrivenUser import SeleniumDrivenUser,\
+    UnknownMethodException
 from LoquaciousSnake.SeleniumDrivenUserActions import SeleniumDrivenUserActions
 from LoquaciousSnake.SeleniumDrivenUserExpectations import SeleniumDrivenUserExpectations
 import unittest
@@ -43,8 +47,22 @@ class SeleniumDriverUserExpectations(unittest.TestCase):
             bob = SeleniumDrivenUser(self.mockedContext)
             bob.unknownMethodCall()
             self.fail("unknownMethodCall should of raised an exception")
-        except Exception, instance:
+        except Exception as instance:
             pass
+
+    def SeleniumDrivenUserShouldRaiseUnknownMethodExceptionForAnUnknownMethodWithoutLookingItUpOnItself(self):
+        bob = SeleniumDrivenUser(self.mockedContext)
+        self.assertRaises(UnknownMethodException, getattr, bob, "unknownMethodCall")
+        self.assertFalse(hasattr(bob, "__unknownSpecialMethod__"))
+
+    def SeleniumDrivenUserShouldNotStartTheBrowserWhenItIsCreated(self):
+        SeleniumDrivenUser(self.mockedContext)
+        self.assertFalse(self.mockedContext.initialize.called)
+
+    def SeleniumDrivenUserShouldBindActionsAndExpectationsWhenItIsCreated(self):
+        bob = SeleniumDrivenUser(self.mockedContext)
+        self.assertEquals(bob.actions.clicks, bob.__dict__["clicks"])
+        self.assertEquals(bob.expectations.shouldSee, bob.__dict__["shouldSee"])
           
     
 if __name__ == "__main__":
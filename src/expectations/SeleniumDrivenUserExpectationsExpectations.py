@@ -3,7 +3,10 @@ from LoquaciousSnake.SeleniumDrivenUserExpectations import SeleniumDrivenUserExp
     SeleniumDrivenUserExpectationsException
 from LoquaciousSnake.SeleniumDrivenUserActions import SeleniumDrivenUserActions
 from expectations.testWebsite.Locators import Locators
-from mock import Mock
+try:
+    from mock import Mock
+except ImportError:
+    from unittest.mock import Mock
 from LoquaciousSnake.helpers.Decorators import LocatorNotFoundException,\
     OptionNotFoundException
 import os
@@ -18,7 +21,7 @@ class SeleniumDrivenUserExpectationsExpectations(unittest.TestCase):
         self.port    = 4444
         self.browserStartCommand = '*firefox'
         self.url     = 'http://localhost:6666'
-        self.seleniumExecutionContext = SharedSeleniumExecutionContext(self.host, self.port, self.browserStartCommand, self.url)
+        self.seleniumExecutionContext = SharedSeleniumExecutionContext(self.host, self.port, self.browserStartCommand, self.url, backend="in-memory")
         self.seleniumExecutionContext.initialize()
         self.action = SeleniumDrivenUserActions(self.seleniumExecutionContext)
         self.action.goesTo( self.testFileName)
@@ -41,13 +44,10 @@ class SeleniumDrivenUserExpectationsExpectations(unittest.TestCase):
         self.expectation.shouldBeOnPage(self.testFileName)
         
     def SeleniumDrivenUserExpectationsShouldSeeShouldUpdateTheLastVisitedLocation(self):
-        self.seleniumExecutionContext.setLastVisitedLocation = Mock()
         self.expectation.shouldSee(Locators.INPUT_TEXT)        
-        self.assertTrue(self.seleniumExecutionContext.setLastVisitedLocation.called)
+        self.assertEquals(Locators.INPUT_TEXT, self.expectation.chainState.lastVisitedLocation)
     
     def SeleniumDrivenUserExpectationsShouldSeeShouldThrowAnExceptionWhenLocatorDoesNotExistOnPage(self):
-        self.seleniumExecutionContext.setLastVisitedLocation = Mock()
-
         try:
             self.expectation.shouldSee("locator that does not exist")  
             self.fail("Should see should raise exception when locator does not exist")
@@ -55,14 +55,158 @@ class SeleniumDrivenUserExpectationsExpectations(unittest.TestCase):
             pass
             
     def SeleniumDrivenUserExpectationsShouldNotSeeShouldRaiseExceptionWhenelementIsPresent(self):    
-        self.seleniumExecutionContext.setLastVisitedLocation = Mock()
-        
         try:
             self.expectation.shouldNotSee(Locators.INPUT_TEXT)  
             self.fail("shouldNotSee should raise exception when locator exists")
         except SeleniumDrivenUserExpectationsException:
             pass
         
+
+    def SeleniumDrivenUserExpectationsShouldSeeAllShouldListEveryMissingLocator(self):
+        try:
+            self.expectation.shouldSeeAll([Locators.INPUT_TEXT, "//div[@id='first']", Locators.SPAN, "//div[@id='second']"])
+            self.fail("shouldSeeAll should raise exception when locators are missing")
+        except SeleniumDrivenUserExpectationsException as e:
+            self.assertEquals("//div[@id='first'], //div[@id='second'] could not be found on the current page.", str(e))
+
+    def SeleniumDrivenUserExpectationsShouldNotSeeAnyShouldListEveryLocatorFound(self):
+        try:
+            self.expectation.shouldNotSeeAny([Locators.INPUT_TEXT, "//div[@id='first']", Locators.SPAN])
+            self.fail("shouldNotSeeAny should raise exception when locators are present")
+        except SeleniumDrivenUserExpectationsException as e:
+            self.assertEquals(Locators.INPUT_TEXT + ", " + Locators.SPAN + " was found on the current page.", str(e))
+
+    def SeleniumDrivenUserExpectationsShouldSeeAllShouldCheckEveryLocatorInASingleScriptWhenTheBrowserRunsScripts(self):
+        self.seleniumExecutionContext.supportsScripts = Mock(return_value=True)
+        self.seleniumExecutionContext.seleniumInstance.get_eval = Mock(return_value="111")
+        self.seleniumExecutionContext.seleniumInstance.is_element_present = Mock()
+
+        self.expectation.shouldSeeAll([Locators.INPUT_TEXT, Locators.SPAN, Locators.SELECT]).shouldNotSeeAny([])
+
+        self.assertEquals(1, self.seleniumExecutionContext.seleniumInstance.get_eval.call_count)
+        self.assertFalse(self.seleniumExecutionContext.seleniumInstance.is_element_present.called)
+
+    def SeleniumDrivenUserExpectationsShouldSeeInOrderShouldAcceptLocatorsInDocumentOrder(self):
+        self.expectation.shouldSeeInOrder([Locators.INPUT_TEXT, Locators.LIST_ITEM1, Locators.LIST_ITEM2, Locators.LIST_ITEM3])
+        self.assertEquals(Locators.LIST_ITEM3, self.expectation.chainState.lastVisitedLocation)
+
+    def SeleniumDrivenUserExpectationsShouldSeeInOrderShouldReportTheFirstLocatorOutOfOrder(self):
+        try:
+            self.expectation.shouldSeeInOrder([Locators.LIST_ITEM1, Locators.LIST_ITEM3, Locators.LIST_ITEM2])
+            self.fail("shouldSeeInOrder should raise exception when the locators are not in document order")
+        except SeleniumDrivenUserExpectationsException as e:
+            self.assertEquals("Expected this locator : " + Locators.LIST_ITEM2 + " to follow this locator : " + Locators.LIST_ITEM3 + " but it did not", str(e))
+        self.assertRaises(LocatorNotFoundException, self.expectation.shouldSeeInOrder, [Locators.LIST_ITEM1, "//div[@id='missing']"])
+
+    def SeleniumDrivenUserExpectationsShouldSeeInOrderShouldNotLeaveASnapshotForTheFollowingReads(self):
+        self.expectation.shouldSeeInOrder([Locators.LIST_ITEM1, Locators.LIST_ITEM2])
+        self.assertTrue(self.seleniumExecutionContext.snapshot is None)
+        self.seleniumExecutionContext.seleniumInstance.check(Locators.CHECKBOX)
+        self.expectation.shouldSee(Locators.CHECKBOX).checked()
+
+    def SeleniumDrivenUserExpectationsShouldSeeInOrderShouldCheckEveryLocatorInASingleScriptWhenTheBrowserRunsScripts(self):
+        self.seleniumExecutionContext.supportsScripts = Mock(return_value=True)
+        self.seleniumExecutionContext.seleniumInstance.get_eval = Mock(return_value='["ok"]')
+        self.seleniumExecutionContext.seleniumInstance.is_ordered = Mock()
+
+        self.expectation.shouldSeeInOrder([Locators.LIST_ITEM1, Locators.LIST_ITEM2, Locators.LIST_ITEM3])
+
+        self.assertEquals(1, self.seleniumExecutionContext.seleniumInstance.get_eval.call_count)
+        self.assertFalse(self.seleniumExecutionContext.seleniumInstance.is_ordered.called)
+
+    def SeleniumDrivenUserExpectationsShouldSeeSortedShouldReportTheFirstPairOutOfOrder(self):
+        self.expectation.shouldSeeSorted("//ul/li")
+        try:
+            self.expectation.shouldSeeSorted("//ul/li", descending=True)
+            self.fail("shouldSeeSorted should raise exception when the elements are not sorted")
+        except SeleniumDrivenUserExpectationsException as e:
+            self.assertEquals("Items matching //ul/li are not sorted by text in descending order : item 1 (item1) comes before item 2 (item2)", str(e))
+
+    def SeleniumDrivenUserExpectationsShouldSeeSortedShouldRejectElementsThatCannotBeSortedByTheRequestedKey(self):
+        try:
+            self.expectation.shouldSeeSorted("css=ul > li", by="date")
+            self.fail("shouldSeeSorted should raise exception when a text is not a date")
+        except SeleniumDrivenUserExpectationsException as e:
+            self.assertEquals("Item 1 matching css=ul > li : item1 is not a date", str(e))
+        self.assertRaises(SeleniumDrivenUserExpectationsException, self.expectation.shouldSeeSorted, "//ul/li", by="colour")
+        self.assertRaises(LocatorNotFoundException, self.expectation.shouldSeeSorted, "//ol/li")
+
+    def servesResultsTable(self):
+        self.seleniumExecutionContext.seleniumInstance.servesPage("http://results", "<html><body><table id='results'>"
+            + "<tr><th>Name</th><th>Price</th></tr><tr><td>Apple</td><td>1.00</td></tr><tr><td>Pear</td><td>2.50</td></tr></table></body></html>")
+        self.action.goesTo("http://results")
+
+    def SeleniumDrivenUserExpectationsShouldSeeTableShouldAcceptATableWithTheExpectedRows(self):
+        self.servesResultsTable()
+        self.expectation.shouldSeeTable("//table[@id='results']", [("Name", "Price"), ("Apple", "1.00"), ("Pear", "2.50")])
+        self.assertEquals("//table[@id='results']", self.expectation.chainState.lastVisitedLocation)
+
+    def SeleniumDrivenUserExpectationsShouldSeeTableShouldOnlyReportTheCellsThatDiffer(self):
+        self.servesResultsTable()
+        try:
+            self.expectation.shouldSeeTable("//table[@id='results']", [["Name", "Price"], ["Apple", "1.25", "In stock"]])
+            self.fail("shouldSeeTable should raise exception when the table differs from the expected rows")
+        except SeleniumDrivenUserExpectationsException as e:
+            self.assertEquals("Table //table[@id='results'] did not match the expected rows : row 2 column 2 expected \"1.25\" but found \"1.00\", "
+                              + "row 2 column 3 expected \"In stock\" but found no cell, 2 rows were expected but 3 were found", str(e))
+        self.assertRaises(LocatorNotFoundException, self.expectation.shouldSeeTable, "//table[@id='missing']", [])
+
+    def SeleniumDrivenUserExpectationsShouldSeeTableShouldCompareTheRowsInASingleScriptWhenTheBrowserRunsScripts(self):
+        self.seleniumExecutionContext.supportsScripts = Mock(return_value=True)
+        self.seleniumExecutionContext.seleniumInstance.get_eval = Mock(return_value='{"total": 1, "count": 0, "differences": []}')
+
+        self.expectation.shouldSeeTable("//table[@id='results']", [["Apple", "1.00"]])
+
+        self.assertEquals(1, self.seleniumExecutionContext.seleniumInstance.get_eval.call_count)
+
+    def SeleniumDrivenUserExpectationsShouldWaitInTheBrowserInsteadOfReadingWhenAutoWaitIsEnabled(self):
+        self.seleniumExecutionContext.supportsScripts = Mock(return_value=True)
+        self.seleniumExecutionContext.enableAutoWait(5000)
+        seleniumInstance = self.seleniumExecutionContext.seleniumInstance
+        seleniumInstance.wait_for_condition = Mock()
+        seleniumInstance.is_element_present = Mock()
+        seleniumInstance.get_text = Mock()
+        seleniumInstance.is_checked = Mock()
+
+        self.expectation.shouldSee(Locators.SPAN).withText("Text").shouldSee(Locators.CHECKBOX).unchecked().shouldNotSee("//div[@id='missing']")
+
+        self.assertEquals(5, seleniumInstance.wait_for_condition.call_count)
+        self.assertEquals(5000, seleniumInstance.wait_for_condition.call_args[0][1])
+        for read in (seleniumInstance.is_element_present, seleniumInstance.get_text, seleniumInstance.is_checked):
+            self.assertFalse(read.called)
+
+    def SeleniumDrivenUserExpectationsShouldReportTheCurrentStateWhenAnAutoWaitTimesOut(self):
+        self.seleniumExecutionContext.supportsScripts = Mock(return_value=True)
+        self.seleniumExecutionContext.enableAutoWait(5000)
+        self.seleniumExecutionContext.seleniumInstance.wait_for_condition = Mock(side_effect=Exception("Timed out after 5000ms"))
+
+        try:
+            self.expectation.shouldSee(Locators.SPAN).withText("Other text")
+            self.fail("withText should raise exception when the text never appears")
+        except SeleniumDrivenUserExpectationsException as e:
+            self.assertEquals("Expected text : Other text did not match current text : Text", str(e))
+
+    def SeleniumDrivenUserExpectationsShouldAnswerReadsFromTheSnapshotWithoutQueryingTheBrowser(self):
+        self.action.fillsOut(Locators.INPUT_TEXT).withThis("snapshot").clicks(Locators.CHECKBOX).takesSnapshot()
+        seleniumInstance = self.seleniumExecutionContext.seleniumInstance
+        seleniumInstance.is_element_present = Mock()
+        seleniumInstance.get_value = Mock()
+        seleniumInstance.is_checked = Mock()
+        seleniumInstance.get_selected_label = Mock()
+        seleniumInstance.is_ordered = Mock()
+
+        self.expectation.shouldSee(Locators.INPUT_TEXT).withValue("snapshot").shouldSee(Locators.CHECKBOX).checked()
+        self.expectation.shouldSee(Locators.SELECT).withOption(Locators.OPTION1).selected()
+        self.expectation.shouldSee(Locators.LIST_ITEM1).followedBy(Locators.LIST_ITEM2).shouldNotSee("//div[@id='missing']")
+
+        for read in (seleniumInstance.is_element_present, seleniumInstance.get_value, seleniumInstance.is_checked, seleniumInstance.get_selected_label, seleniumInstance.is_ordered):
+            self.assertFalse(read.called)
+
+    def SeleniumDrivenUserExpectationsShouldDropTheSnapshotOnTheNextMutatingAction(self):
+        self.action.takesSnapshot().fillsOut(Locators.INPUT_TEXT).withThis("after snapshot")
+
+        self.assertTrue(self.seleniumExecutionContext.snapshot is None)
+        self.expectation.shouldSee(Locators.INPUT_TEXT).withValue("after snapshot")
         
     def SeleniumDrivenUserExpectationsShouldRaiseExceptionWhenLocatorIsNotFoundWhenWithValueIsCalled(self):
         try:
@@ -149,7 +293,7 @@ class SeleniumDrivenUserExpectationsExpectations(unittest.TestCase):
         
     def SeleniumDrivenUserExpectationsShouldUpdateOptionBeingHandled(self):
         self.expectation.shouldSee(Locators.SELECT).withOption(Locators.OPTION3)
-        self.assertEquals(self.seleniumExecutionContext.optionBeingHandled,Locators.OPTION3)
+        self.assertEquals(self.expectation.chainState.optionBeingHandled,Locators.OPTION3)
   
     def SeleniumDrivenUserExpectationsShouldRaiseExceptionWhenSelectedIsCalledWithNoVisitedLocation(self):
         try:
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+from LoquaciousSnake.SeleniumRemoteControlClient import SeleniumRemoteControlClient,\
+    SeleniumRemoteControlException, StaleConnectionException, parseStringArray
+from LoquaciousSnake.SharedSeleniumExecutionContext import SharedSeleniumExecutionContext
+from expectations.testWebsite.StandInRemoteControlServer import StandInRemoteControlServer
+try:
+    from mock import Mock
+except ImportError:
+    from unittest.mock import Mock
+import unittest
+
+
+class SeleniumRemoteControlClientExpectations(unittest.TestCase):
+
+    def setUp(self):
+        self.server = StandInRemoteControlServer().startsInBackground()
+        self.client = SeleniumRemoteControlClient("127.0.0.1", self.server.port, "*firefox", "http://localhost:6666")
+        self.client.start()
+
+    def tearDown(self):
+        self.client.disconnect()
+        self.server.stops()
+
+    def SeleniumRemoteControlClientShouldKeepTheSessionIdentifierItWasGiven(self):
+        self.assertEquals("standInSession", self.client.sessionId)
+
+    def SeleniumRemoteControlClientShouldSendAllCommandsOverASingleConnection(self):
+        for index in range(20):
+            self.client.click("//a[@id='link%d']" % index)
+        self.assertEquals(1, self.server.connections)
+        self.assertEquals(21, len(self.server.commands))
+
+    def SeleniumRemoteControlClientShouldSendTheCommandArgumentsInOrder(self):
+        self.client.type("//input[@id='name']", u"Zoë & co")
+        self.assertEquals(("type", ["//input[@id='name']", u"Zoë & co"]), self.server.commands[-1])
+
+    def SeleniumRemoteControlClientShouldReconnectWhenTheServerDroppedTheConnection(self):
+        self.server.dropsConnectionsAfterResponse = True
+        self.client.click("//a")
+        self.client.click("//a")
+        self.client.click("//a")
+        self.assertEquals(4, len(self.server.commands))
+        self.assertEquals(3, self.server.connections)
+
+    def SeleniumRemoteControlClientShouldNotSendACommandThatChangesThePageAgainWhenItsResponseIsLost(self):
+        self.server.unansweredCommands = 1
+        self.assertRaises(StaleConnectionException, self.client.click, "//a")
+        self.assertEquals(["getNewBrowserSession", "click"], [verb for verb, args in self.server.commands])
+
+    def SeleniumRemoteControlClientShouldSendAReadOnlyCommandAgainWhenItsResponseIsLost(self):
+        self.server.unansweredCommands = 1
+        self.assertEquals("first", self.client.get_text("first"))
+        self.assertEquals(["getNewBrowserSession", "getText", "getText"], [verb for verb, args in self.server.commands])
+        self.assertEquals(2, self.server.connections)
+
+    def SeleniumRemoteControlClientShouldRaiseAnExceptionWhenTheServerReportsAnError(self):
+        self.server.responses["click"] = "ERROR: Element //a not found"
+        try:
+            self.client.click("//a")
+            self.fail("click should raise exception when the server reports an error")
+        except SeleniumRemoteControlException:
+            pass
+
+    def SeleniumRemoteControlClientShouldConvertBooleanResults(self):
+        self.server.responses["isChecked"] = "OK,false"
+        self.assertTrue(self.client.is_element_present("//a"))
+        self.assertFalse(self.client.is_checked("//input"))
+
+    def SeleniumRemoteControlClientShouldPipelineReadOnlyCommands(self):
+        responses = self.client.pipelines([("getText", ["first"]), ("getValue", ["second"]), ("isElementPresent", ["third"])])
+        self.assertEquals(["OK,first", "OK,second", "OK,true"], responses)
+        self.assertEquals(["getText", "getValue", "isElementPresent"], [verb for verb, args in self.server.commands[1:]])
+
+    def SeleniumRemoteControlClientShouldPipelineThePresenceChecksOfAContext(self):
+        executionContext = SharedSeleniumExecutionContext("127.0.0.1", self.server.port, "*firefox", "http://localhost:6666", backend="keep-alive-rc", private=True)
+        executionContext.initialize()
+        executionContext.seleniumInstance.sends = Mock(wraps=executionContext.seleniumInstance.sends)
+
+        self.assertEquals([True, True, True], executionContext.arePresent(["//a", "//span", "//input"]))
+        self.assertEquals(1, executionContext.seleniumInstance.sends.call_count)
+        self.assertEquals(["isElementPresent"] * 3, [verb for verb, args in self.server.commands[-3:]])
+        executionContext.destroy()
+
+    def SeleniumRemoteControlClientShouldSendCommandsThatChangeThePageOneByOne(self):
+        self.server.responses["click"] = "ERROR: Element first not found"
+        try:
+            self.client.pipelines([("click", ["first"]), ("click", ["second"])])
+            self.fail("pipelines should stop at the first failing command")
+        except SeleniumRemoteControlException:
+            pass
+        self.assertEquals(2, len(self.server.commands))
+
+    def SeleniumRemoteControlClientShouldSplitStringArraysOnUnescapedCommas(self):
+        self.assertEquals(["Option 1", "Option, 2", "Option \\3"], parseStringArray("Option 1,Option\\, 2,Option \\\\3"))
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(SeleniumRemoteControlClientExpectations, prefix="SeleniumRemoteControlClient")
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,137 @@
+from LoquaciousSnake.SeleniumSessionPool import SeleniumSessionPool, SeleniumSessionPoolException
+from LoquaciousSnake.SharedSeleniumExecutionContext import SharedSeleniumExecutionContext
+try:
+    from mock import Mock
+except ImportError:
+    from unittest.mock import Mock
+from selenium.selenium import selenium
+import unittest
+
+
+class SeleniumSessionPoolExpectations(unittest.TestCase):
+
+    def setUp(self):
+        self.host    = 'localhost'
+        self.port    = 4444
+        self.browserStartCommand = '*firefox'
+        self.url     = 'http://www.google.com/'
+        self.originalSeleniumStart = selenium.start
+        self.originalSeleniumStop = selenium.stop
+        self.originalSeleniumOpen = selenium.open
+        self.originalSeleniumDeleteAllVisibleCookies = selenium.delete_all_visible_cookies
+        self.mockedStart = Mock()
+        self.mockedStop = Mock()
+        self.mockedOpen = Mock()
+        self.mockedDeleteAllVisibleCookies = Mock()
+        selenium.start = self.mockedStart
+        selenium.stop = self.mockedStop
+        selenium.open = self.mockedOpen
+        selenium.delete_all_visible_cookies = self.mockedDeleteAllVisibleCookies
+
+    def tearDown(self):
+        selenium.start = self.originalSeleniumStart
+        selenium.stop = self.originalSeleniumStop
+        selenium.open = self.originalSeleniumOpen
+        selenium.delete_all_visible_cookies = self.originalSeleniumDeleteAllVisibleCookies
+
+    def createPool(self, **kwargs):
+        return SeleniumSessionPool(self.host, self.port, self.browserStartCommand, self.url, **kwargs)
+
+    def SeleniumSessionPoolShouldStartAsManySessionsAsItsSizeWhenWarmedUp(self):
+        pool = self.createPool(size=3)
+        pool.warmUp()
+        pool.warmUp()
+        self.assertEquals(3, self.mockedStart.call_count)
+
+    def SeleniumSessionPoolShouldHandOutAWarmSessionWithoutStartingANewOne(self):
+        pool = self.createPool(size=1)
+        pool.warmUp()
+        pool.checkOut()
+        self.assertEquals(1, self.mockedStart.call_count)
+
+    def SeleniumSessionPoolShouldReuseASessionThatWasCheckedBackIn(self):
+        pool = self.createPool(size=1)
+        seleniumInstance = pool.checkOut()
+        pool.checkIn(seleniumInstance)
+        self.assertTrue(pool.checkOut() is seleniumInstance)
+        self.assertEquals(1, self.mockedStart.call_count)
+        self.assertFalse(self.mockedStop.called)
+
+    def SeleniumSessionPoolShouldResetTheBrowserStateWhenASessionIsCheckedBackIn(self):
+        pool = self.createPool(size=1)
+        pool.checkIn(pool.checkOut())
+        self.assertTrue(self.mockedDeleteAllVisibleCookies.called)
+        self.assertEqual(self.mockedOpen.call_args, (("about:blank",), {}))
+
+    def SeleniumSessionPoolShouldStopASessionThatFailsToReset(self):
+        pool = self.createPool(size=1)
+        self.mockedDeleteAllVisibleCookies.side_effect = Exception("Browser crashed")
+        seleniumInstance = pool.checkOut()
+        pool.checkIn(seleniumInstance)
+        self.assertEquals(1, self.mockedStop.call_count)
+        self.assertFalse(pool.checkOut() is seleniumInstance)
+
+    def SeleniumSessionPoolShouldStopASessionOnceItReachedItsMaximumNumberOfUses(self):
+        pool = self.createPool(size=1, maxUsesPerSession=2)
+        pool.checkIn(pool.checkOut())
+        self.assertFalse(self.mockedStop.called)
+        pool.checkIn(pool.checkOut())
+        self.assertEquals(1, self.mockedStop.call_count)
+
+    def SeleniumSessionPoolShouldStopASessionThatStayedIdleForTooLong(self):
+        pool = self.createPool(size=1, maxIdleSeconds=0)
+        seleniumInstance = pool.checkOut()
+        pool.checkIn(seleniumInstance)
+        self.assertFalse(pool.checkOut() is seleniumInstance)
+        self.assertEquals(1, self.mockedStop.call_count)
+        self.assertEquals(2, self.mockedStart.call_count)
+
+    def SeleniumSessionPoolShouldNotHandOutMoreSessionsThanItsSize(self):
+        pool = self.createPool(size=1, checkOutTimeout=0.01)
+        pool.checkOut()
+        try:
+            pool.checkOut()
+            self.fail("checkOut should raise exception when every session is already checked out")
+        except SeleniumSessionPoolException:
+            pass
+
+    def SeleniumSessionPoolShouldRefuseInstancesItDidNotHandOut(self):
+        pool = self.createPool(size=1)
+        try:
+            pool.checkIn(selenium(self.host, self.port, self.browserStartCommand, self.url))
+            self.fail("checkIn should raise exception when the instance does not come from the pool")
+        except SeleniumSessionPoolException:
+            pass
+
+    def SeleniumSessionPoolShouldStopIdleSessionsWhenShutDown(self):
+        pool = self.createPool(size=2)
+        pool.warmUp()
+        pool.shutdown()
+        self.assertEquals(2, self.mockedStop.call_count)
+
+    def SeleniumSessionPoolShouldLendASessionToAContextWhileItIsInitialized(self):
+        pool = self.createPool(size=1)
+        executionContext = SharedSeleniumExecutionContext.fromSessionPool(pool)
+        self.assertTrue(executionContext.seleniumInstance is None)
+
+        executionContext.initialize()
+        seleniumInstance = executionContext.seleniumInstance
+        self.assertFalse(seleniumInstance is None)
+
+        executionContext.destroy()
+        self.assertTrue(executionContext.seleniumInstance is None)
+        self.assertFalse(self.mockedStop.called)
+        self.assertTrue(pool.checkOut() is seleniumInstance)
+
+    def SeleniumSessionPoolShouldGiveEachContextItsOwnSession(self):
+        pool = self.createPool(size=2)
+        firstContext = SharedSeleniumExecutionContext.fromSessionPool(pool)
+        secondContext = SharedSeleniumExecutionContext.fromSessionPool(pool)
+        firstContext.initialize()
+        secondContext.initialize()
+        self.assertFalse(firstContext.seleniumInstance is secondContext.seleniumInstance)
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(SeleniumSessionPoolExpectations, prefix="SeleniumSessionPool")
+    unittest.TextTestRunner(verbosity=2).run(suite)
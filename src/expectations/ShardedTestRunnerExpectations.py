@@ -0,0 +1,151 @@
+from LoquaciousSnake.AdaptiveTimeouts import AdaptiveTimeouts
+from LoquaciousSnake.BackendRegistry import BackendRegistry
+from LoquaciousSnake.BrowserBackend import BrowserBackend
+from LoquaciousSnake.SharedSeleniumExecutionContext import SharedSeleniumExecutionContext
+from LoquaciousSnake.ShardedTestRunner import ShardedTestRunner, TestDurations, shard, runShard
+try:
+    from mock import Mock
+except ImportError:
+    from unittest.mock import Mock
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+
+class SampleExpectations(unittest.TestCase):
+
+    def SampleShouldPass(self):
+        pass
+
+    def SampleShouldAlsoPass(self):
+        pass
+
+    def SampleShouldFail(self):
+        self.fail("Sample failure")
+
+    def SampleShouldRaise(self):
+        raise ValueError("Sample error")
+
+
+class UnreachableServer(BrowserBackend):
+
+    def __init__(self, host, port, browserStartCommand, url):
+        pass
+
+    def start(self):
+        pass
+
+    def stop(self):
+        raise IOError("Connection refused")
+
+
+class UnreachableServerSampleExpectations(unittest.TestCase):
+
+    def SampleShouldStartASharedInstanceThatCannotBeStopped(self):
+        SharedSeleniumExecutionContext('localhost', 4444, '*firefox', 'http://localhost:6666', backend="unreachable-server").initialize()
+
+
+class WaitingSampleExpectations(unittest.TestCase):
+
+    def SampleShouldWaitForAPage(self):
+        SharedSeleniumExecutionContext.defaultAdaptiveTimeouts.record("waitsForPageToLoad http://sample", 1500)
+
+    def SampleShouldWaitForAnotherPage(self):
+        SharedSeleniumExecutionContext.defaultAdaptiveTimeouts.record("waitsForPageToLoad http://sample", 2500)
+
+
+class ShardedTestRunnerExpectations(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.durationsPath = os.path.join(self.directory, "durations.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def durationsOf(self, durationsById):
+        durations = TestDurations(None)
+        durations.durations = durationsById
+        return durations
+
+    def ShardedTestRunnerShouldSpreadTestsAcrossShardsLongestFirst(self):
+        durations = self.durationsOf({"a": 8.0, "b": 5.0, "c": 4.0, "d": 3.0, "e": 1.0})
+        shards = shard(["e", "d", "c", "b", "a"], durations, 2)
+        self.assertEquals([["a", "d"], ["b", "c", "e"]], shards)
+
+    def ShardedTestRunnerShouldNotCreateEmptyShards(self):
+        shards = shard(["a", "b"], self.durationsOf({}), 4)
+        self.assertEquals(2, len(shards))
+
+    def ShardedTestRunnerShouldUseTheAverageDurationForTestsThatNeverRan(self):
+        durations = TestDurations(self.durationsPath)
+        durations.record("a", 2.0)
+        durations.record("b", 4.0)
+        durations.save()
+        self.assertEquals(3.0, TestDurations(self.durationsPath).durationOf("c"))
+
+    def ShardedTestRunnerShouldMergeTheResultsOfEveryWorker(self):
+        suite = unittest.makeSuite(SampleExpectations, prefix="Sample")
+        stream = StringIO()
+        result = ShardedTestRunner(2, self.durationsPath, stream).run(suite)
+
+        self.assertEquals(4, result.testsRun)
+        self.assertEquals(1, len(result.failures))
+        self.assertEquals(1, len(result.errors))
+        self.assertFalse(result.wasSuccessful())
+        self.assertTrue("Sample failure" in result.failures[0][1])
+        self.assertTrue("FAILED (failures=1, errors=1)" in stream.getvalue())
+
+    def ShardedTestRunnerShouldKeepTheOutcomesOfAShardWhoseSharedInstanceCannotBeStopped(self):
+        BackendRegistry.register("unreachable-server", UnreachableServer, capabilities=())
+        originalStderr = sys.stderr
+        sys.stderr = StringIO()
+        try:
+            outcomes = runShard([__name__ + ".UnreachableServerSampleExpectations.SampleShouldStartASharedInstanceThatCannotBeStopped",
+                                 __name__ + ".SampleExpectations.SampleShouldPass"])
+            warning = sys.stderr.getvalue()
+        finally:
+            sys.stderr = originalStderr
+            BackendRegistry.unregister("unreachable-server")
+        self.assertEquals(["ok", "ok"], [outcome.status for outcome in outcomes])
+        self.assertTrue("Connection refused" in warning)
+        self.assertTrue(SharedSeleniumExecutionContext.seleniumInstance is None)
+
+    def ShardedTestRunnerShouldNotStopTheSharedInstanceItInheritedFromTheParentProcess(self):
+        inheritedInstance = Mock()
+        SharedSeleniumExecutionContext.seleniumInstance = inheritedInstance
+        SharedSeleniumExecutionContext.backendName = "selenium-rc"
+        SharedSeleniumExecutionContext.isInitialized = True
+        try:
+            runShard([__name__ + ".SampleExpectations.SampleShouldPass"])
+        finally:
+            SharedSeleniumExecutionContext.forgetSharedInstance()
+        self.assertFalse(inheritedInstance.stop.called)
+
+    def ShardedTestRunnerShouldRememberTheDurationOfEveryTestForTheNextRun(self):
+        suite = unittest.makeSuite(SampleExpectations, prefix="Sample")
+        ShardedTestRunner(2, self.durationsPath, StringIO()).run(suite)
+        self.assertEquals(4, len(TestDurations(self.durationsPath).durations))
+
+    def ShardedTestRunnerShouldGatherTheWaitsRecordedByEveryWorker(self):
+        timeoutsPath = os.path.join(self.directory, "timeouts.json")
+        SharedSeleniumExecutionContext.defaultAdaptiveTimeouts = AdaptiveTimeouts(timeoutsPath)
+        try:
+            suite = unittest.makeSuite(WaitingSampleExpectations, prefix="Sample")
+            ShardedTestRunner(2, self.durationsPath, StringIO()).run(suite)
+            SharedSeleniumExecutionContext.defaultAdaptiveTimeouts.save()
+        finally:
+            SharedSeleniumExecutionContext.defaultAdaptiveTimeouts = None
+        self.assertEquals([1500, 2500], AdaptiveTimeouts(timeoutsPath).samplesFor("waitsForPageToLoad http://sample"))
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(ShardedTestRunnerExpectations, prefix="ShardedTestRunner")
+    unittest.TextTestRunner(verbosity=2).run(suite)
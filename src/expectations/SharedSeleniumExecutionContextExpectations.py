@@ -1,7 +1,12 @@
 from LoquaciousSnake.SharedSeleniumExecutionContext import SharedSeleniumExecutionContext
+from LoquaciousSnake.SeleniumRemoteControlClient import SeleniumRemoteControlClient
+from LoquaciousSnake.InMemoryBrowser import InMemoryBrowser
 import unittest
-from mock import Mock
-from selenium import selenium
+try:
+    from mock import Mock
+except ImportError:
+    from unittest.mock import Mock
+from selenium.selenium import selenium
 
 class SharedSeleniumExecutionContextExpectations(unittest.TestCase):
        
@@ -18,6 +23,7 @@ class SharedSeleniumExecutionContextExpectations(unittest.TestCase):
         selenium.__init__ = self.originalSeleniumInit  
         selenium.start = self.originalSeleniumStart  
         selenium.stop = self.originalSeleniumStop  
+        SharedSeleniumExecutionContext.forgetSharedInstance()
        
     def SharedSeleniumExecutionContextShouldRevertAllValuesWhenResetAllIsCalled(self):
         SharedSeleniumExecutionContext.port = 666
@@ -37,6 +43,23 @@ class SharedSeleniumExecutionContextExpectations(unittest.TestCase):
         self.assertEqual(mockedConstructor.call_args,((self.host, self.port, self.browserStartCommand, self.url),{}), "Selenium called with incorrect arguments")
         
         
+    def SharedSeleniumExecutionContextShouldOwnAKeepAliveClientWhenAskedTo(self):
+        SharedSeleniumExecutionContext.resetAll()
+        executionContext = SharedSeleniumExecutionContext(self.host, self.port, self.browserStartCommand, self.url, backend="keep-alive-rc")
+        
+        self.assertTrue(isinstance(executionContext.seleniumInstance, SeleniumRemoteControlClient))
+        self.assertEquals((self.host, self.port, self.url), (executionContext.seleniumInstance.host, executionContext.seleniumInstance.port, executionContext.seleniumInstance.browserURL))
+        SharedSeleniumExecutionContext.resetAll()
+        
+    def SharedSeleniumExecutionContextShouldGiveEachInMemoryContextItsOwnBrowser(self):
+        SharedSeleniumExecutionContext.resetAll()
+        firstContext = SharedSeleniumExecutionContext(self.host, self.port, self.browserStartCommand, self.url, backend="in-memory")
+        secondContext = SharedSeleniumExecutionContext(self.host, self.port, self.browserStartCommand, self.url, backend="in-memory")
+        
+        self.assertTrue(isinstance(firstContext.seleniumInstance, InMemoryBrowser))
+        self.assertFalse(firstContext.seleniumInstance is secondContext.seleniumInstance)
+        self.assertTrue(SharedSeleniumExecutionContext.seleniumInstance is None)
+        
     def SharedSeleniumExecutionContextShouldStartSeleniumOnlyOnceWhenAskedToInitializeTwice(self):
         mockedStart = Mock()
         selenium.start = mockedStart
@@ -81,6 +104,92 @@ class SharedSeleniumExecutionContextExpectations(unittest.TestCase):
         
         self.assertEquals(2, mockedStart.call_count )
     
+
+    def SharedSeleniumExecutionContextShouldNotCacheReadsByDefault(self):
+        SharedSeleniumExecutionContext.resetAll()
+        executionContext = SharedSeleniumExecutionContext(self.host, self.port, self.browserStartCommand, self.url)
+        executionContext.seleniumInstance.get_text = Mock(return_value="Text")
+
+        executionContext.getText("//span")
+        executionContext.getText("//span")
+
+        self.assertEquals(2, executionContext.seleniumInstance.get_text.call_count)
+
+    def SharedSeleniumExecutionContextShouldQueryTheBrowserOnlyOnceForRepeatedReadsWhenReadCacheIsEnabled(self):
+        SharedSeleniumExecutionContext.resetAll()
+        executionContext = SharedSeleniumExecutionContext(self.host, self.port, self.browserStartCommand, self.url)
+        executionContext.seleniumInstance.is_element_present = Mock(return_value=True)
+        executionContext.enableReadCache()
+
+        executionContext.isElementPresent("//span")
+        executionContext.isElementPresent("//span")
+        executionContext.isElementPresent("//input")
+
+        self.assertEquals(2, executionContext.seleniumInstance.is_element_present.call_count)
+
+    def SharedSeleniumExecutionContextShouldQueryTheBrowserAgainOnceThePageGenerationAdvanced(self):
+        SharedSeleniumExecutionContext.resetAll()
+        executionContext = SharedSeleniumExecutionContext(self.host, self.port, self.browserStartCommand, self.url)
+        executionContext.seleniumInstance.get_value = Mock(return_value="value")
+        executionContext.enableReadCache()
+
+        executionContext.getValue("//input")
+        executionContext.advancePageGeneration()
+        executionContext.getValue("//input")
+
+        self.assertEquals(2, executionContext.seleniumInstance.get_value.call_count)
+
+    def SharedSeleniumExecutionContextShouldDropCachedReadsWhenTheDomMutationCounterChanges(self):
+        SharedSeleniumExecutionContext.resetAll()
+        executionContext = SharedSeleniumExecutionContext(self.host, self.port, self.browserStartCommand, self.url)
+        executionContext.seleniumInstance.is_checked = Mock(return_value=False)
+        executionContext.seleniumInstance.get_eval = Mock(side_effect=["page:0", "page:0", "page:3"])
+        executionContext.enableReadCache(trackDomMutations=True)
+
+        for step in range(3):
+            executionContext.startsStep()
+            executionContext.isChecked("//input")
+
+        self.assertEquals(2, executionContext.seleniumInstance.is_checked.call_count)
+
+    def SharedSeleniumExecutionContextShouldCheckTheDomMutationCounterOncePerStep(self):
+        SharedSeleniumExecutionContext.resetAll()
+        executionContext = SharedSeleniumExecutionContext(self.host, self.port, self.browserStartCommand, self.url)
+        executionContext.seleniumInstance.is_element_present = Mock(return_value=True)
+        executionContext.seleniumInstance.get_text = Mock(return_value="text")
+        executionContext.seleniumInstance.get_eval = Mock(return_value="page:0")
+        executionContext.enableReadCache(trackDomMutations=True)
+        backendCalls = lambda: executionContext.seleniumInstance.is_element_present.call_count + executionContext.seleniumInstance.get_text.call_count + executionContext.seleniumInstance.get_eval.call_count
+
+        for step in range(3):
+            executionContext.startsStep()
+            for read in range(5):
+                executionContext.isElementPresent("//span")
+                executionContext.getText("//span")
+
+        self.assertEquals(1 + 2 + 1 + 1, backendCalls())
+        self.assertEquals(3, executionContext.seleniumInstance.get_eval.call_count)
+
+    def SharedSeleniumExecutionContextShouldInstallTheGuardedCommandHelperOnlyWhenTheRunnerLacksIt(self):
+        SharedSeleniumExecutionContext.resetAll()
+        executionContext = SharedSeleniumExecutionContext(self.host, self.port, self.browserStartCommand, self.url)
+        executionContext.seleniumInstance.get_eval = Mock(side_effect=["uninstalled", "installed", "ok", "ok"])
+
+        self.assertEquals("ok", executionContext.performsGuardedCommand("//input", "click", "//input"))
+        self.assertEquals("ok", executionContext.performsGuardedCommand("//input", "check", "//input"))
+
+        self.assertEquals(4, executionContext.seleniumInstance.get_eval.call_count)
+        self.assertTrue("doCheck" in executionContext.seleniumInstance.get_eval.call_args[0][0])
+
+    def SharedSeleniumExecutionContextShouldTakeItsSnapshotInASingleScriptWhenTheBrowserRunsScripts(self):
+        SharedSeleniumExecutionContext.resetAll()
+        executionContext = SharedSeleniumExecutionContext(self.host, self.port, self.browserStartCommand, self.url)
+        executionContext.seleniumInstance.get_eval = Mock(return_value="<html><body><input id='name' value='typed'></body></html>")
+
+        executionContext.takesSnapshot()
+
+        self.assertEquals((True, "typed", False), (executionContext.isElementPresent("id=name"), executionContext.getValue("//input[@id='name']"), executionContext.isElementPresent("css=span")))
+        self.assertEquals(1, executionContext.seleniumInstance.get_eval.call_count)
         
 if __name__ == "__main__":
     suite = unittest.makeSuite(SharedSeleniumExecutionContextExpectations, prefix="SharedSeleniumExecutionContext")
@@ -0,0 +1,55 @@
+from LoquaciousSnake.InMemoryBrowser import InMemoryBrowser
+from LoquaciousSnake.helpers.JavascriptHelper import JavascriptHelper
+from LoquaciousSnake.helpers.SortKeys import sortKeys
+from expectations.testWebsite.Node import nodeCommand, runsInNode
+import unittest
+
+sortKeyCases = [("number", "1,000", 1000.0), ("number", "$5", 5.0), ("number", "-3.5", -3.5), ("number", "12 %", 12.0),
+                ("number", "1e3", 1000.0), ("number", "+.5", 0.5), ("number", "5-3", None), ("number", "abc", None), ("number", "", None),
+                ("date", "2023-01-05", 20230105000000), ("date", "2023-01-05 10:30", 20230105103000), ("date", "2023-01-05T10:30:15", 20230105103015),
+                ("date", "2023/01/05", 20230105000000), ("date", "01/05/2023", 20230105000000), ("date", "5 Jan 2023", 20230105000000),
+                ("date", "5 January 2023", 20230105000000), ("date", "Jan 5, 2023", 20230105000000), ("date", "Sept. 5 2023", 20230905000000),
+                ("date", "2023-13-01", None), ("date", "5 Foo 2023", None), ("date", "Someday", None), ("date", "Tue Jan 05 2023", None),
+                ("text", "Banana", "Banana")]
+
+sortedTexts = {"number": ["-3.5", "$5", "12 %", "1,000", "2,500.75"],
+               "date": ["Jan 5, 2023", "2023-01-06", "01/07/2023", "8 January 2023", "2023/01/09"]}
+
+
+def keysFromTheBrowserScript(cases):
+    script = "var keys = " + JavascriptHelper.GetSortKeysObject() + "; var cases = " + JavascriptHelper.ToJavascriptString(cases) + ";" \
+           + " console.log(JSON.stringify(cases.map(function(c) { var key = keys[c[0]](c[1]); return typeof key == 'number' && isNaN(key) ? null : key; })));"
+    return runsInNode(script)
+
+
+class SortKeysExpectations(unittest.TestCase):
+
+    def sortedOrderInMemoryOf(self, sortKey, texts):
+        browser = InMemoryBrowser(None, None, None, None)
+        browser.servesPage("http://sorted", "<html><body><ul>" + "".join(["<li>" + text + "</li>" for text in texts]) + "</ul></body></html>")
+        browser.open("http://sorted")
+        return browser.sortedOrderOf("//ul/li", sortKey, False)
+
+    def SortKeysShouldParseTheSharedCasesInMemory(self):
+        self.assertEquals([expected for sortKey, text, expected in sortKeyCases], [sortKeys[sortKey](text) for sortKey, text, expected in sortKeyCases])
+
+    def SortKeysShouldSortTheSharedListsInMemory(self):
+        for sortKey in sortedTexts:
+            self.assertEquals(["ok"], self.sortedOrderInMemoryOf(sortKey, sortedTexts[sortKey]))
+            self.assertEquals("unsorted", self.sortedOrderInMemoryOf(sortKey, list(reversed(sortedTexts[sortKey])))[0])
+
+    @unittest.skipIf(nodeCommand is None, "node is not installed, the sort keys of the browser script cannot be checked")
+    def SortKeysShouldParseTheSharedCasesInTheBrowserScript(self):
+        self.assertEquals([expected for sortKey, text, expected in sortKeyCases], keysFromTheBrowserScript([[sortKey, text] for sortKey, text, expected in sortKeyCases]))
+
+    @unittest.skipIf(nodeCommand is None, "node is not installed, the sort keys of the browser script cannot be checked")
+    def SortKeysShouldSortTheSharedListsInTheBrowserScript(self):
+        for sortKey in sortedTexts:
+            keys = keysFromTheBrowserScript([[sortKey, text] for text in sortedTexts[sortKey]])
+            self.assertEquals(sorted(keys), keys)
+            self.assertEquals(len(set(keys)), len(keys))
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(SortKeysExpectations, prefix="SortKeys")
+    unittest.TextTestRunner(verbosity=2).run(suite)
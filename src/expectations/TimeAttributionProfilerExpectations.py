@@ -0,0 +1,64 @@
+from LoquaciousSnake.TimeAttributionProfiler import TimeAttributionProfiler, ProfilingTestRunner
+from LoquaciousSnake.SharedSeleniumExecutionContext import SharedSeleniumExecutionContext
+from LoquaciousSnake.SeleniumDrivenUser import SeleniumDrivenUser
+from expectations.testWebsite.Locators import Locators
+import os
+import unittest
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+
+class TickingClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 0.001
+        return self.now
+
+
+class ProfiledScenario(unittest.TestCase):
+
+    def ProfiledScenarioVisitsAndChecksAPage(self):
+        user = SeleniumDrivenUser(SharedSeleniumExecutionContext('localhost', 4444, '*firefox', 'http://localhost:6666', backend="in-memory"))
+        user.goesTo("file://" + os.path.dirname(os.path.abspath(__file__)) + "/testWebsite/seleniumTestPage.html")
+        user.waitsForPageToLoad().shouldSee(Locators.SPAN).withText("Text")
+
+    def ProfiledScenarioDoesNothing(self):
+        pass
+
+
+class TimeAttributionProfilerExpectations(unittest.TestCase):
+
+    def setUp(self):
+        self.profiler = TimeAttributionProfiler(TickingClock())
+        suite = unittest.makeSuite(ProfiledScenario, prefix="ProfiledScenario")
+        self.result = ProfilingTestRunner(self.profiler, stream=StringIO()).run(suite)
+
+    def TimeAttributionProfilerShouldSplitTheTimeOfEveryTestIntoItsBuckets(self):
+        self.assertTrue(self.result.wasSuccessful())
+        attributions = dict([(attribution.testId.split(".")[-1], attribution) for attribution in self.profiler.attributions])
+        visit = attributions["ProfiledScenarioVisitsAndChecksAPage"]
+
+        self.assertEquals((4, 0.004, 0.001), (visit.numberOfCommands, round(visit.commandTime, 6), round(visit.waitingTime, 6)))
+        self.assertEquals(0.001, round(self.profiler.roundTripLatency, 6))
+        self.assertEquals(round(visit.wallTime, 6), round(visit.pythonTime() + visit.wireTime(0.001) + visit.browserTime(0.001) + visit.waitingTime, 6))
+        self.assertEquals((0, 0.0), (attributions["ProfiledScenarioDoesNothing"].numberOfCommands, attributions["ProfiledScenarioDoesNothing"].commandTime))
+
+    def TimeAttributionProfilerShouldReportTheWorstOffendersFirst(self):
+        report = self.profiler.report(limit=1).splitlines()
+
+        self.assertEquals(3, len(report))
+        self.assertTrue("ProfiledScenarioVisitsAndChecksAPage" in report[1])
+
+    def TimeAttributionProfilerShouldStopInstrumentingNewContextsOnceTheRunIsOver(self):
+        self.assertTrue(SharedSeleniumExecutionContext.defaultInstrumentation is None)
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(TimeAttributionProfilerExpectations, prefix="TimeAttributionProfiler")
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,14 @@
+try:
+    from shutil import which
+except ImportError:
+    from distutils.spawn import find_executable as which
+import json
+import subprocess
+
+nodeCommand = which("node") or which("nodejs")
+
+
+def runsInNode(script):
+    node = subprocess.Popen([nodeCommand, "-e", script], stdout=subprocess.PIPE)
+    output = node.communicate()[0]
+    return json.loads(output.decode("utf-8"))
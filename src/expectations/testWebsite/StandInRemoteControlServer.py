@@ -0,0 +1,125 @@
+import threading
+import time
+
+try:
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+    from SocketServer import ThreadingMixIn
+    from urlparse import parse_qs
+except ImportError:
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+    from socketserver import ThreadingMixIn
+    from urllib.parse import parse_qs
+
+try:
+    text = unicode
+except NameError:
+    text = str
+
+
+def asText(value):
+    if isinstance(value, text):
+        return value
+    return value.decode("utf-8")
+
+
+class StandInRemoteControlRequestHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        self.server.accepted()
+
+    def do_POST(self):
+        dropsConnection = self.server.dropsConnectionsAfterResponse
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if not isinstance(body, str):
+            body = body.decode("ascii")
+        arguments = dict([(asText(name), [asText(value) for value in values])
+                          for name, values in parse_qs(body, keep_blank_values=True).items()])
+        verb = arguments["cmd"][0]
+        args = []
+        while str(len(args) + 1) in arguments:
+            args.append(arguments[str(len(args) + 1)][0])
+        self.server.received(verb, args)
+        if self.server.dropsConnectionBeforeResponse():
+            self.close_connection = 1
+            return
+
+        if verb in self.server.delays:
+            time.sleep(self.server.delays[verb])
+        response = self.server.responseFor(verb, args).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(response)))
+        if dropsConnection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(response)
+        self.wfile.flush()
+        if dropsConnection:
+            self.close_connection = 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInRemoteControlServer(ThreadingMixIn, HTTPServer):
+
+    daemon_threads = True
+
+    def __init__(self, port=0):
+        HTTPServer.__init__(self, ("127.0.0.1", port), StandInRemoteControlRequestHandler)
+        self.port = self.server_address[1]
+        self.commands = []
+        self.connections = 0
+        self.responses = {"getNewBrowserSession": "OK,standInSession"}
+        self.dropsConnectionsAfterResponse = False
+        self.unansweredCommands = 0
+        self.delays = {}
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def accepted(self):
+        self.lock.acquire()
+        try:
+            self.connections += 1
+        finally:
+            self.lock.release()
+
+    def received(self, verb, args):
+        self.lock.acquire()
+        try:
+            self.commands.append((verb, args))
+        finally:
+            self.lock.release()
+
+    def dropsConnectionBeforeResponse(self):
+        self.lock.acquire()
+        try:
+            if self.unansweredCommands > 0:
+                self.unansweredCommands -= 1
+                return True
+            return False
+        finally:
+            self.lock.release()
+
+    def responseFor(self, verb, args):
+        if verb in self.responses:
+            return self.responses[verb]
+        if verb.startswith("is"):
+            return "OK,true"
+        if verb.startswith("get"):
+            return "OK," + ",".join(args)
+        return "OK"
+
+    def startsInBackground(self):
+        self.thread = threading.Thread(target=self.serve_forever, args=(0.05,))
+        self.thread.daemon = True
+        self.thread.start()
+        return self
+
+    def stops(self):
+        self.shutdown()
+        self.server_close()